@@ -0,0 +1,124 @@
+"""
+Benchmark RequestCoalescer: request /chat tunggal vs micro-batching
+
+Menjalankan --concurrency pemanggil asyncio bersamaan, masing-masing
+mengirim pertanyaan berurutan seperti handler /chat di server: cache
+jawaban dicek langsung lewat respond_cached, sisanya masuk coalescer dan
+dijawab lewat respond_batch(cache_checked=True).
+
+Dua engine dibandingkan: "KNN saja" (cascade hanya tier knn, semua
+request lewat transform + query KNN) dan "cascade default" (pattern
+training dijawab tier exact di executor tanpa transform + query KNN).
+Cache stemming dipanaskan lebih dulu supaya semua skenario setara.
+
+Jalankan: python benchmarks/bench_coalescer.py [--concurrency 32] [--requests 4000]
+"""
+import sys
+import os
+import argparse
+import asyncio
+import io
+import contextlib
+import json
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import INTENTS_FILE
+from models.chat_engine import ChatEngine
+from serving.coalescer import RequestCoalescer
+from serving.http_server import answer_messages
+
+
+def percentile(sorted_values, pct):
+    index = max(0, min(len(sorted_values) - 1, int(round(pct / 100 * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+async def run_scenario(engine, messages, n_requests, concurrency, workers, max_wait_ms):
+    """Kembalikan (latencies, durasi, stats coalescer atau None)"""
+    loop = asyncio.get_running_loop()
+    executor = ThreadPoolExecutor(max_workers=workers)
+
+    async def run_batch(batch):
+        return await loop.run_in_executor(executor, answer_messages, engine, batch, True)
+
+    coalescer = None
+    if max_wait_ms is not None:
+        coalescer = RequestCoalescer(run_batch, max_wait=max_wait_ms / 1000, max_batch_size=64)
+
+    jobs = list(range(n_requests))
+    latencies = []
+
+    async def caller():
+        while jobs:
+            jobs.pop()
+            message = random.choice(messages)
+            start = time.perf_counter()
+            if engine.respond_cached(message) is None:
+                if coalescer is not None:
+                    await coalescer.submit(message)
+                else:
+                    await run_batch([message])
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*[caller() for _ in range(concurrency)])
+    duration = time.perf_counter() - start
+    executor.shutdown()
+
+    latencies.sort()
+    return latencies, duration, coalescer.stats() if coalescer is not None else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--requests', type=int, default=4000)
+    parser.add_argument('--workers', type=int, default=4, help='Thread inference')
+    args = parser.parse_args()
+
+    random.seed(42)
+    with open(INTENTS_FILE, 'r', encoding='utf-8') as f:
+        intents = json.load(f)['intents']
+    messages = [pattern for intent in intents for pattern in intent['patterns']]
+
+    engines = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        engines.append(('KNN saja', ChatEngine(cascade_tiers=('knn',))))
+        engines.append(('cascade default', ChatEngine()))
+        for _, engine in engines:
+            engine.load().warmup()
+            # Panaskan cache stemming supaya semua skenario setara
+            engine.classify_batch(messages)
+
+    print("\n" + "="*60)
+    print(f"BENCHMARK COALESCER ({args.concurrency} pemanggil, {args.requests} request)")
+    print("="*60)
+
+    for engine_name, engine in engines:
+        print(f"\n{engine_name}")
+        print(f"{'Skenario':<24} {'req/s':>8} {'p50':>9} {'p99':>9} {'batch rata2':>12}")
+
+        for name, max_wait_ms in [('tanpa coalescer', None), ('coalesce 1 ms', 1),
+                                  ('coalesce 2 ms', 2), ('coalesce 5 ms', 5)]:
+            latencies, duration, stats = asyncio.run(run_scenario(
+                engine, messages, args.requests, args.concurrency, args.workers, max_wait_ms
+            ))
+            if stats is None:
+                mean_batch = "-"
+            elif stats['batches']:
+                mean_batch = f"{stats['mean_batch_size']:.1f}"
+            else:
+                mean_batch = "0 batch"
+            print(f"{name:<24} {len(latencies) / duration:8.1f}"
+                  f" {percentile(latencies, 50) * 1e3:6.2f} ms"
+                  f" {percentile(latencies, 99) * 1e3:6.2f} ms {mean_batch:>12}")
+
+    print("\n" + "="*60 + "\n")
+
+
+if __name__ == "__main__":
+    main()
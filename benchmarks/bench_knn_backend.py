@@ -0,0 +1,89 @@
+"""
+Benchmark backend KNNClassifier: 'sklearn' vs 'dense'
+
+Jalankan: python benchmarks/bench_knn_backend.py
+"""
+import sys
+import os
+import json
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from config import INTENTS_FILE, MODEL_FILE, VECTORIZER_FILE, LABEL_ENCODER_FILE, LATENT_FILE
+from models.preprocessor import TextPreprocessor
+from models.text_vectorizer import TextVectorizer
+from models.knn_classifier import KNNClassifier
+from models.latent_projector import LatentProjector
+
+
+def load_queries():
+    """Preprocess semua pattern di intents.json sebagai query benchmark"""
+    with open(INTENTS_FILE, 'r', encoding='utf-8') as f:
+        intents_data = json.load(f)
+
+    preprocessor = TextPreprocessor()
+    queries = []
+    for intent in intents_data['intents']:
+        for pattern in intent['patterns']:
+            lang = preprocessor.detect_language(pattern)
+            queries.append(preprocessor.preprocess(
+                pattern,
+                remove_stopwords=True,
+                apply_stemming=(lang == 'id'),
+                language=lang
+            ))
+    return queries
+
+
+def time_single_queries(knn, rows, repeat=3):
+    """Latency per query (satu baris per panggilan), dalam mikrodetik"""
+    latencies = []
+    for _ in range(repeat):
+        for row in rows:
+            start = time.perf_counter()
+            knn.predict_with_confidence(row)
+            latencies.append((time.perf_counter() - start) * 1e6)
+    return np.array(latencies)
+
+
+def main():
+    print("\n" + "="*60)
+    print("BENCHMARK KNN BACKEND")
+    print("="*60)
+
+    vectorizer = TextVectorizer().load(VECTORIZER_FILE)
+    X = vectorizer.transform(load_queries())
+    if os.path.exists(LATENT_FILE):
+        X = LatentProjector().load(LATENT_FILE).transform(X)
+    rows = [X[i] for i in range(X.shape[0])]
+    print(f"\nQueries: {X.shape[0]}  |  Features: {X.shape[1]}")
+
+    results = {}
+    for backend in ('sklearn', 'dense'):
+        knn = KNNClassifier(backend=backend).load(MODEL_FILE, LABEL_ENCODER_FILE)
+        knn.predict_with_confidence(rows[0])  # warmup
+
+        latencies = time_single_queries(knn, rows)
+
+        start = time.perf_counter()
+        predictions, confidences = knn.predict_with_confidence(X)
+        batch_time = time.perf_counter() - start
+
+        results[backend] = predictions
+        print(f"\n[{backend}]")
+        print(f"  single p50: {np.percentile(latencies, 50):8.1f} us")
+        print(f"  single p95: {np.percentile(latencies, 95):8.1f} us")
+        print(f"  single p99: {np.percentile(latencies, 99):8.1f} us")
+        print(f"  ops/sec:    {1e6 / latencies.mean():8.0f}")
+        print(f"  batch ({X.shape[0]} rows): {batch_time * 1e3:.2f} ms")
+
+    agreement = np.mean(results['sklearn'] == results['dense'])
+    print(f"\nPrediksi sama antar backend: {agreement:.2%}")
+    print("="*60 + "\n")
+
+
+if __name__ == "__main__":
+    main()
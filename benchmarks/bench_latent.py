@@ -0,0 +1,135 @@
+"""
+Benchmark KNN pada TF-IDF sparse vs vektor laten TruncatedSVD (LatentProjector)
+
+Pipeline sama dengan train.py: vectorizer dan projector di-fit pada semua
+pattern, lalu split train/test yang sama (TEST_SIZE, RANDOM_STATE,
+stratify). Per konfigurasi diukur accuracy (AccuracyCalculator), latency
+satu query (proyeksi + KNN, tanpa preprocessing dan TF-IDF) dan ukuran
+training matrix KNN.
+
+Jalankan: python benchmarks/bench_latent.py [--dims 64 128 256]
+"""
+import sys
+import os
+import argparse
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from sklearn.model_selection import train_test_split
+
+from config import (
+    INTENTS_FILE, VECTORIZER_MAX_FEATURES, STOP_WORDS, TEST_SIZE, RANDOM_STATE,
+    KNN_NEIGHBORS, KNN_METRIC, STEM_CACHE_FILE, STEM_CACHE_MAX_SIZE
+)
+from models.preprocessor import TextPreprocessor
+from models.text_vectorizer import TextVectorizer
+from models.latent_projector import LatentProjector
+from models.knn_classifier import KNNClassifier
+from utils.accuracy_calculator import AccuracyCalculator
+from train import load_intents, prepare_training_data, preprocess_pattern
+
+
+def load_dataset():
+    """Matrix TF-IDF semua pattern intents.json (preprocess seperti train.py)"""
+    X_raw, y = prepare_training_data(load_intents(INTENTS_FILE))
+
+    preprocessor = TextPreprocessor(stem_cache_size=STEM_CACHE_MAX_SIZE)
+    preprocessor.load_stem_cache(STEM_CACHE_FILE)
+    X_processed = [preprocess_pattern(preprocessor, text) for text in X_raw]
+
+    vectorizer = TextVectorizer(max_features=VECTORIZER_MAX_FEATURES, stop_words=STOP_WORDS)
+    return vectorizer.fit_transform(X_processed), y
+
+
+def time_queries(predict, rows, repeat=3):
+    """Latency predict(row) per query dalam mikrodetik"""
+    latencies = []
+    for _ in range(repeat):
+        for row in rows:
+            start = time.perf_counter()
+            predict(row)
+            latencies.append((time.perf_counter() - start) * 1e6)
+    return np.array(latencies)
+
+
+def evaluate(name, X, y, labels, backend, n_components=None):
+    projector = None
+    if n_components:
+        projector = LatentProjector(n_components=n_components, random_state=RANDOM_STATE)
+        X_features = projector.fit_transform(X)
+    else:
+        X_features = X
+
+    X_train, X_test, y_train, y_test = train_test_split(
+        X_features, y,
+        test_size=TEST_SIZE,
+        random_state=RANDOM_STATE,
+        stratify=y
+    )
+    knn = KNNClassifier(n_neighbors=KNN_NEIGHBORS, metric=KNN_METRIC, backend=backend)
+    knn.fit(X_train, y_train)
+    y_pred = knn.predict(X_test)
+    accuracy = AccuracyCalculator().calculate(y_test, y_pred, labels=labels)['accuracy']
+
+    # Query dimulai dari baris TF-IDF, proyeksi ikut diukur
+    _, X_test_tfidf = train_test_split(
+        X, test_size=TEST_SIZE, random_state=RANDOM_STATE, stratify=y
+    )
+    rows = [X_test_tfidf[i] for i in range(X_test_tfidf.shape[0])]
+    if projector is None:
+        predict = knn.predict_with_similarity
+    else:
+        def predict(row):
+            return knn.predict_with_similarity(projector.transform(row))
+    latencies = time_queries(predict, rows)
+
+    if knn._train_matrix is None:
+        knn._build_dense_index()
+
+    return {
+        'name': name,
+        'dims': X_features.shape[1],
+        'accuracy': accuracy,
+        'variance': projector.explained_variance_ratio if projector else 1.0,
+        'p50_us': float(np.percentile(latencies, 50)),
+        'p99_us': float(np.percentile(latencies, 99)),
+        'matrix_kb': knn._train_matrix.nbytes / 1024,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--dims', type=int, nargs='+', default=[32, 64, 128, 192, 256],
+                        help='n_components LatentProjector')
+    args = parser.parse_args()
+
+    print("\n" + "="*60)
+    print("BENCHMARK KNN: TF-IDF SPARSE vs LATENT SVD")
+    print("="*60)
+
+    X, y = load_dataset()
+    labels = sorted(set(y))
+    print(f"\nPattern: {X.shape[0]}  |  TF-IDF features: {X.shape[1]}  |  Tag: {len(labels)}\n")
+
+    results = [
+        evaluate('tfidf sklearn', X, y, labels, 'sklearn'),
+        evaluate('tfidf dense', X, y, labels, 'dense'),
+    ]
+    for n_components in args.dims:
+        results.append(evaluate(f'svd {n_components}', X, y, labels, 'dense', n_components))
+
+    print("\n" + "-"*60)
+    print(f"{'mode':<15}{'dims':>6}{'accuracy':>10}{'variance':>10}{'p50 us':>9}"
+          f"{'p99 us':>9}{'KNN KB':>9}")
+    for r in results:
+        print(f"{r['name']:<15}{r['dims']:>6}{r['accuracy']:>10.4f}{r['variance']:>10.3f}"
+              f"{r['p50_us']:>9.1f}{r['p99_us']:>9.1f}{r['matrix_kb']:>9.1f}")
+    print("(latency = proyeksi + KNN per query; variance = explained variance SVD)")
+    print("="*60 + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+Benchmark memory per worker process: pickle vs model bundle (mmap)
+
+Menjalankan N worker process bersamaan untuk setiap mode load. Setiap
+worker me-load ChatEngine, menjalankan vectorizer + KNN pada semua pattern
+intents (preprocessor tidak dipakai supaya yang terukur hanya model),
+lalu melaporkan RSS dan PSS dari /proc/self/smaps_rollup saat semua
+worker masih hidup. PSS membagi page yang dipakai bersama secara rata,
+sehingga total PSS = memory fisik yang benar-benar terpakai.
+
+Hanya Linux (butuh /proc/<pid>/smaps_rollup).
+
+Jalankan: python benchmarks/bench_memory.py [--workers 4]
+"""
+import sys
+import os
+import argparse
+import json
+import multiprocessing
+import queue
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import INTENTS_FILE
+
+# Nama mode -> kwargs ChatEngine
+MODES = {
+    'pickle joblib (copy per process)': {'use_bundle': False, 'mmap_mode': None},
+    'pickle joblib (mmap_mode=r)': {'use_bundle': False, 'mmap_mode': 'r'},
+    'bundle (copy per process)': {'use_bundle': True, 'mmap_mode': None},
+    'bundle (mmap)': {'use_bundle': True, 'mmap_mode': 'r'},
+}
+
+
+def read_memory():
+    """RSS, PSS dan private memory (KB) process ini"""
+    fields = {}
+    with open('/proc/self/smaps_rollup', 'r') as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == 'kB':
+                fields[parts[0].rstrip(':')] = int(parts[1])
+
+    return {
+        'rss': fields.get('Rss', 0),
+        'pss': fields.get('Pss', 0),
+        'private': fields.get('Private_Clean', 0) + fields.get('Private_Dirty', 0),
+    }
+
+
+def worker(engine_kwargs, texts, barrier, results):
+    """Load engine, jalankan inference, ukur memory saat semua worker hidup"""
+    import io
+    import contextlib
+    from models.chat_engine import ChatEngine
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        engine = ChatEngine(answer_cache_size=0, **engine_kwargs).load()
+
+    X = engine.vectorize(texts)
+    engine.knn.predict_with_confidence(X)
+
+    # Ukur setelah semua worker selesai inference (page shared sudah ter-map)
+    barrier.wait()
+    results.put(read_memory())
+    barrier.wait()
+
+
+def run_mode(engine_kwargs, texts, n_workers):
+    ctx = multiprocessing.get_context('spawn')
+    barrier = ctx.Barrier(n_workers)
+    results = ctx.Queue()
+
+    processes = [
+        ctx.Process(target=worker, args=(engine_kwargs, texts, barrier, results))
+        for _ in range(n_workers)
+    ]
+    for process in processes:
+        process.start()
+
+    measurements = []
+    while len(measurements) < n_workers:
+        try:
+            measurements.append(results.get(timeout=1))
+        except queue.Empty:
+            failed = [p for p in processes if p.exitcode not in (None, 0)]
+            if failed:
+                for process in processes:
+                    process.terminate()
+                raise RuntimeError(f"Worker gagal (exit code {failed[0].exitcode})")
+    for process in processes:
+        process.join()
+
+    return measurements
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--workers', type=int, default=4, help='Jumlah worker process')
+    args = parser.parse_args()
+
+    if not os.path.exists('/proc/self/smaps_rollup'):
+        print("ERROR: Benchmark ini butuh Linux (/proc/self/smaps_rollup)")
+        return 1
+
+    with open(INTENTS_FILE, 'r', encoding='utf-8') as f:
+        intents = json.load(f)['intents']
+    texts = [pattern for intent in intents for pattern in intent['patterns']]
+
+    print("\n" + "="*60)
+    print(f"BENCHMARK MEMORY ({args.workers} worker, {len(texts)} query)")
+    print("="*60 + "\n")
+    print(f"{'Mode':<34} {'RSS/worker':>11} {'Private/worker':>15} {'PSS total':>10}")
+
+    for name, engine_kwargs in MODES.items():
+        measurements = run_mode(engine_kwargs, texts, args.workers)
+        rss = sum(m['rss'] for m in measurements) / len(measurements)
+        private = sum(m['private'] for m in measurements) / len(measurements)
+        pss_total = sum(m['pss'] for m in measurements)
+        print(f"{name:<34} {rss / 1024:8.1f} MB {private / 1024:12.1f} MB"
+              f" {pss_total / 1024:7.1f} MB")
+
+    print("\n" + "="*60 + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
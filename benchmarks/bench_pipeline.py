@@ -0,0 +1,283 @@
+"""
+Benchmark end-to-end pipeline chat per tahap
+
+Mengukur setiap tahap inference secara terpisah (input tiap tahap =
+output tahap sebelumnya, sama seperti ChatEngine):
+
+    clean_text -> normalize_slang -> detect_language -> remove_stopwords
+    -> stem_text -> exact_match -> TextVectorizer.transform
+    -> KNNClassifier.predict_with_confidence -> response lookup
+
+ditambah end_to_end (ChatEngine.classify tanpa cache jawaban), atas
+semua pattern intents.json plus query sintetis (typo, slang, noise,
+kalimat panjang). Cache stemming dipanaskan dulu, jadi angka stem_text
+adalah kondisi steady-state. Hit ratio index exact-match (jika ada)
+ikut dilaporkan; end_to_end sudah memakai jalur cepat tersebut.
+Terakhir, semua query dijawab sekali lewat cascade (respond_batch) dan
+attempt/hit/durasi setiap tier ditampilkan.
+
+Hasil bisa disimpan sebagai baseline JSON dan dibandingkan di run
+berikutnya; exit code 1 jika ada tahap yang melambat melewati threshold.
+
+Jalankan:
+    python benchmarks/bench_pipeline.py --save benchmarks/baseline.json
+    python benchmarks/bench_pipeline.py --compare benchmarks/baseline.json
+"""
+import sys
+import os
+import argparse
+import contextlib
+import gc
+import io
+import json
+import platform
+import random
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import INTENTS_FILE
+from models.chat_engine import ChatEngine
+
+STAGES = (
+    'clean_text', 'normalize_slang', 'detect_language', 'remove_stopwords',
+    'stem_text', 'exact_match', 'vectorizer_transform', 'knn_predict', 'response_lookup', 'end_to_end',
+)
+
+NOISE = ["!!!", "??", " 😊", " www.unklab.ac.id", " @admin", " #info", " ...", " tolong"]
+
+
+def make_synthetic_queries(patterns, slang_words, count, seed=42):
+    """Query sintetis deterministik dari pattern: typo, slang, noise, gabungan"""
+    rng = random.Random(seed)
+    queries = []
+
+    for i in range(count):
+        text = rng.choice(patterns)
+        kind = i % 4
+
+        if kind == 0 and len(text) > 3:
+            # Typo: tukar dua huruf bersebelahan
+            pos = rng.randrange(len(text) - 1)
+            text = text[:pos] + text[pos + 1] + text[pos] + text[pos + 2:]
+        elif kind == 1 and slang_words:
+            text = f"{rng.choice(slang_words)} {text} {rng.choice(slang_words)}"
+        elif kind == 2:
+            text = text.upper() + rng.choice(NOISE)
+        else:
+            text = ' '.join(rng.sample(patterns, 3))
+
+        queries.append(text)
+
+    return queries
+
+
+def summarize(durations_ns):
+    """Statistik per tahap dalam mikrodetik"""
+    values = sorted(durations_ns)
+    n = len(values)
+
+    def pct(p):
+        return values[max(0, min(n - 1, int(round(p / 100 * n)) - 1))] / 1e3
+
+    total = sum(values)
+    return {
+        'calls': n,
+        'mean_us': total / n / 1e3,
+        'p50_us': pct(50),
+        'p95_us': pct(95),
+        'p99_us': pct(99),
+        'ops_per_sec': n / (total / 1e9) if total else 0.0,
+    }
+
+
+def time_calls(func, inputs, repeat):
+    """Jalankan func(*args) untuk setiap input, kembalikan durasi (ns) per call"""
+    durations = []
+    clock = time.perf_counter_ns
+    for _ in range(repeat):
+        for args in inputs:
+            start = clock()
+            func(*args)
+            durations.append(clock() - start)
+    return durations
+
+
+def run_benchmark(engine, queries, repeat):
+    """Ukur semua tahap, kembalikan dict stage -> statistik"""
+    pre = engine.preprocessor
+    knn = engine.knn
+
+    # Output referensi tiap tahap (sekaligus memanaskan cache stemming)
+    cleaned = [pre.clean_text(q) for q in queries]
+    normalized = [pre.normalize_slang(c) for c in cleaned]
+    languages = [pre.detect_language(n) for n in normalized]
+    no_stopwords = [pre.remove_stopwords(n, lang) for n, lang in zip(normalized, languages)]
+    stemmed = [
+        pre.stem_text(t, lang) if lang == 'id' else t
+        for t, lang in zip(no_stopwords, languages)
+    ]
+    # TF-IDF (+ proyeksi laten jika model di-train dengan LATENT_DIM)
+    vectors = [engine.vectorize([s]) for s in stemmed]
+    tags = [knn.predict_with_confidence(X)[0][0] for X in vectors]
+
+    inputs = {
+        'clean_text': (pre.clean_text, [(q,) for q in queries]),
+        'normalize_slang': (pre.normalize_slang, [(c,) for c in cleaned]),
+        'detect_language': (pre.detect_language, [(n,) for n in normalized]),
+        'remove_stopwords': (pre.remove_stopwords, list(zip(normalized, languages))),
+        'stem_text': (pre.stem_text, list(zip(no_stopwords, languages))),
+        'exact_match': (engine.exact_match.get if engine.exact_match is not None else None,
+                        [(s,) for s in stemmed]),
+        'vectorizer_transform': (engine.vectorize, [([s],) for s in stemmed]),
+        'knn_predict': (knn.predict_with_confidence, [(X,) for X in vectors]),
+        'response_lookup': (engine.get_response, list(zip(tags, languages))),
+        'end_to_end': (engine.classify, [(q,) for q in queries]),
+    }
+
+    results = {}
+    gc.disable()
+    try:
+        for stage in STAGES:
+            func, stage_inputs = inputs[stage]
+            if func is None:
+                continue
+            # Satu pass pemanasan per tahap (tidak diukur)
+            time_calls(func, stage_inputs[:50], 1)
+            results[stage] = summarize(time_calls(func, stage_inputs, repeat))
+    finally:
+        gc.enable()
+
+    return results
+
+
+def exact_match_ratio(engine, queries):
+    """Rasio query yang terjawab lewat index exact-match (None jika tidak ada index)"""
+    if engine.exact_match is None:
+        return None
+    table = engine.exact_match.table
+    hits = sum(engine.preprocess(q)[0] in table for q in queries)
+    return hits / len(queries) if queries else 0.0
+
+
+def print_results(results):
+    print(f"{'Tahap':<22} {'p50':>9} {'p95':>9} {'p99':>9} {'ops/s':>11}")
+    for stage, stats in results.items():
+        print(f"{stage:<22} {stats['p50_us']:6.1f} us {stats['p95_us']:6.1f} us"
+              f" {stats['p99_us']:6.1f} us {stats['ops_per_sec']:11.0f}")
+
+
+def print_tier_stats(engine, queries):
+    """Jawab semua query lewat cascade satu per satu, tampilkan statistik per tier"""
+    engine.cascade.reset()
+    for query in queries:
+        engine.respond_batch([query])
+
+    print(f"\n{'Tier':<12} {'attempt':>8} {'hit':>7} {'hit %':>7} {'p50':>10} {'p95':>10}")
+    for tier, stats in engine.tier_stats().items():
+        print(f"{tier:<12} {stats['attempts']:8d} {stats['hits']:7d} {stats['hit_rate']:7.1%}"
+              f" {stats['p50_ms'] * 1e3:7.1f} us {stats['p95_ms'] * 1e3:7.1f} us")
+
+
+def compare_results(results, baseline, threshold):
+    """
+    Bandingkan p50 dan p95 dengan baseline
+
+    Returns:
+        List nama tahap yang melambat lebih dari threshold (rasio)
+    """
+    regressions = []
+    print(f"\n{'Tahap':<22} {'p50 base':>10} {'p50 kini':>10} {'delta':>8} {'p95 delta':>10}")
+
+    for stage, stats in results.items():
+        base = baseline['stages'].get(stage)
+        if base is None:
+            print(f"{stage:<22} {'-':>10} {stats['p50_us']:7.1f} us  (baru)")
+            continue
+
+        p50_delta = stats['p50_us'] / base['p50_us'] - 1 if base['p50_us'] else 0.0
+        p95_delta = stats['p95_us'] / base['p95_us'] - 1 if base['p95_us'] else 0.0
+        regressed = p50_delta > threshold or p95_delta > threshold
+        if regressed:
+            regressions.append(stage)
+
+        print(f"{stage:<22} {base['p50_us']:7.1f} us {stats['p50_us']:7.1f} us"
+              f" {p50_delta:+7.1%} {p95_delta:+9.1%}" + ("  <-- REGRESI" if regressed else ""))
+
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=3, help='Pass per tahap')
+    parser.add_argument('--synthetic', type=int, default=500, help='Jumlah query sintetis')
+    parser.add_argument('--no-bundle', action='store_true',
+                        help='Pakai pickle joblib (bukan model bundle)')
+    parser.add_argument('--save', metavar='FILE', help='Simpan hasil sebagai baseline JSON')
+    parser.add_argument('--compare', metavar='FILE', help='Bandingkan dengan baseline JSON')
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help='Batas perlambatan p50/p95 sebelum dianggap regresi (0.25 = 25%%)')
+    args = parser.parse_args()
+
+    with open(INTENTS_FILE, 'r', encoding='utf-8') as f:
+        intents = json.load(f)['intents']
+    patterns = [pattern for intent in intents for pattern in intent['patterns']]
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        engine = ChatEngine(answer_cache_size=0, use_bundle=not args.no_bundle).load().warmup()
+
+    slang_words = sorted(engine.preprocessor.slang_dict)
+    queries = patterns + make_synthetic_queries(patterns, slang_words, args.synthetic)
+
+    print("\n" + "="*60)
+    print(f"BENCHMARK PIPELINE ({len(patterns)} pattern + {args.synthetic} sintetis, "
+          f"{args.repeat}x)")
+    print("="*60 + "\n")
+
+    results = run_benchmark(engine, queries, args.repeat)
+    print_results(results)
+
+    pattern_ratio = exact_match_ratio(engine, patterns)
+    if pattern_ratio is None:
+        print("\nExact-match: index tidak ada (jalankan: python train.py)")
+    else:
+        synthetic_ratio = exact_match_ratio(engine, queries[len(patterns):])
+        print(f"\nExact-match hit ratio: {pattern_ratio:.1%} pattern, "
+              f"{synthetic_ratio:.1%} sintetis")
+
+    print_tier_stats(engine, queries)
+
+    exit_code = 0
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare_results(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n❌ Regresi (> {args.threshold:.0%}): {', '.join(regressions)}")
+            exit_code = 1
+        else:
+            print(f"\n✓ Tidak ada regresi (threshold {args.threshold:.0%})")
+
+    if args.save:
+        report = {
+            'meta': {
+                'created': time.strftime('%Y-%m-%d %H:%M:%S'),
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'queries': len(queries),
+                'repeat': args.repeat,
+                'bundle': not args.no_bundle,
+            },
+            'stages': results,
+        }
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"\n💾 Baseline disimpan ke {args.save}")
+
+    print("\n" + "="*60 + "\n")
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
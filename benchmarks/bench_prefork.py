@@ -0,0 +1,70 @@
+"""
+Benchmark skala mode prefork: throughput vs jumlah worker process
+
+Untuk setiap jumlah worker, server.py --prefork N dijalankan sebagai
+subprocess lalu diuji dengan load test /chat yang sama (lihat
+load_test.py). Throughput idealnya naik linear sampai jumlah core CPU.
+
+Jalankan: python benchmarks/bench_prefork.py [--processes 1 2 4] [--requests 3000]
+"""
+import sys
+import os
+import argparse
+import asyncio
+import json
+import random
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from config import INTENTS_FILE, SERVER_HOST
+from load_test import run_load_test, wait_until_healthy, start_server_process, percentile
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--processes', type=int, nargs='+', default=[1, 2, 4])
+    parser.add_argument('--requests', type=int, default=3000)
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--port', type=int, default=8765)
+    args = parser.parse_args()
+
+    random.seed(42)
+    with open(INTENTS_FILE, 'r', encoding='utf-8') as f:
+        intents = json.load(f)['intents']
+    messages = [pattern for intent in intents for pattern in intent['patterns']]
+
+    print("\n" + "="*60)
+    print(f"BENCHMARK PREFORK ({os.cpu_count()} CPU, {args.concurrency} client)")
+    print("="*60 + "\n")
+    print(f"{'Worker':>6} {'req/s':>9} {'speedup':>8} {'p50':>9} {'p99':>9}")
+
+    baseline = None
+    for processes in args.processes:
+        server_args = argparse.Namespace(host=SERVER_HOST, port=args.port, executor='thread',
+                                         workers=1, prefork=processes)
+        server = start_server_process(server_args)
+        try:
+            asyncio.run(wait_until_healthy(SERVER_HOST, args.port, timeout=120))
+            # Warmup supaya cache stemming dan jawaban tiap worker terisi
+            asyncio.run(run_load_test(SERVER_HOST, args.port, len(messages) * processes * 4,
+                                      args.concurrency, messages, 1))
+            latencies, errors, duration = asyncio.run(run_load_test(
+                SERVER_HOST, args.port, args.requests, args.concurrency, messages, 1
+            ))
+        finally:
+            server.terminate()
+            server.wait()
+
+        latencies.sort()
+        throughput = len(latencies) / duration
+        baseline = baseline or throughput
+        print(f"{processes:>6} {throughput:9.1f} {throughput / baseline:7.2f}x"
+              f" {percentile(latencies, 50) * 1e3:6.2f} ms {percentile(latencies, 99) * 1e3:6.2f} ms"
+              + (f"  ({len(errors)} error)" if errors else ""))
+
+    print("\n" + "="*60 + "\n")
+
+
+if __name__ == "__main__":
+    main()
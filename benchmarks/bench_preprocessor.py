@@ -0,0 +1,120 @@
+"""
+Microbenchmark cleaning pipeline TextPreprocessor
+
+Membandingkan clean_text versi regex lama dan normalisasi slang naif
+(referensi di bawah) dengan pipeline terkompilasi + trie slang, sekaligus
+memastikan output byte-identical.
+
+Jalankan: python benchmarks/bench_preprocessor.py
+"""
+import sys
+import os
+import json
+import re
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import INTENTS_FILE
+from models.preprocessor import TextPreprocessor
+
+
+def legacy_clean_text(text):
+    """clean_text sebelum pipeline terkompilasi (referensi)"""
+    text = text.lower()
+    text = re.sub(r'http\S+|www\S+|https\S+', '', text, flags=re.MULTILINE)
+    text = re.sub(r'\S+@\S+', '', text)
+    text = re.sub(r'@\w+|#\w+', '', text)
+    text = re.sub(r'[^\w\s]', ' ', text)
+    return ' '.join(text.split())
+
+
+def legacy_normalize(text, slang_dict):
+    """
+    clean_text lama + normalisasi slang naif (referensi): di setiap posisi
+    coba semua panjang frasa dari yang terpanjang dengan join string
+    """
+    words = legacy_clean_text(text).split()
+    max_length = max((len(phrase.split()) for phrase in slang_dict), default=0)
+
+    normalized = []
+    i = 0
+    while i < len(words):
+        for n in range(min(max_length, len(words) - i), 0, -1):
+            phrase = ' '.join(words[i:i + n])
+            if phrase in slang_dict:
+                normalized.extend(slang_dict[phrase].split())
+                i += n
+                break
+        else:
+            normalized.append(words[i])
+            i += 1
+    return ' '.join(normalized)
+
+
+# Kasus sulit untuk cek byte-identical
+EDGE_CASES = [
+    "", "   ", "Halo!!!", "email: admin@unklab.ac.id ya", "foo@http://x bar",
+    "xhttp://a@b c", "cek www.unklab.ac.id/pendaftaran?x=1", "@admin #info halo",
+    "#", "@", "a@b@c", "tab\tdan\nbaris baru", "Saya sangat senang hari ini! 😊",
+    "Café & résumé — naïve", "under_score snake_case", "\x1c\x1d\x1e\x1f sep",
+    "biaya kuliah (S1) = Rp 10.000.000,-", "UN CLUB makasih gk ada",
+    "un un club club", "un", "kampus un club.",
+    "https://a.b https x", "pasal 49 ayat 2", "ＡＢＣ fullwidth",
+]
+
+
+def load_texts():
+    with open(INTENTS_FILE, 'r', encoding='utf-8') as f:
+        intents_data = json.load(f)
+
+    texts = []
+    for intent in intents_data['intents']:
+        texts.extend(intent['patterns'])
+        texts.extend(intent['responses'])
+    return texts + EDGE_CASES
+
+
+def time_per_call(func, texts, repeat=20):
+    """Rata-rata waktu per panggilan dalam mikrodetik"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for text in texts:
+            func(text)
+    return (time.perf_counter() - start) / (repeat * len(texts)) * 1e6
+
+
+def main():
+    print("\n" + "="*60)
+    print("BENCHMARK CLEANING PIPELINE")
+    print("="*60)
+
+    preprocessor = TextPreprocessor()
+    slang_dict = preprocessor.slang_dict
+    texts = load_texts()
+
+    mismatches = [
+        text for text in texts
+        if preprocessor.clean_text(text) != legacy_clean_text(text)
+        or preprocessor.normalize(text) != legacy_normalize(text, slang_dict)
+    ]
+    print(f"\nTexts: {len(texts)}  |  Output berbeda: {len(mismatches)}")
+    for text in mismatches[:10]:
+        print(f"  ✗ {text!r}")
+
+    legacy_clean = time_per_call(legacy_clean_text, texts)
+    compiled_clean = time_per_call(preprocessor.clean_text, texts)
+    legacy_norm = time_per_call(lambda t: legacy_normalize(t, slang_dict), texts)
+    compiled_norm = time_per_call(preprocessor.normalize, texts)
+
+    print(f"\nclean_text          legacy: {legacy_clean:7.2f} us  compiled: {compiled_clean:7.2f} us"
+          f"  ({legacy_clean / compiled_clean:.2f}x)")
+    print(f"clean + slang       legacy: {legacy_norm:7.2f} us  compiled: {compiled_norm:7.2f} us"
+          f"  ({legacy_norm / compiled_norm:.2f}x)")
+    print("="*60 + "\n")
+
+    return len(mismatches) == 0
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,87 @@
+"""
+Benchmark waktu startup (import + inisialisasi) preprocessor dan engine
+
+Setiap skenario dijalankan di process Python baru supaya cache import
+tidak ikut terhitung.
+
+Jalankan: python benchmarks/bench_startup.py [--runs 5]
+"""
+import sys
+import os
+import argparse
+import json
+import statistics
+import subprocess
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Kode yang dijalankan di child process; mencetak durasi (detik) sebagai JSON
+SCENARIOS = {
+    'import preprocessor + TextPreprocessor() (lazy)': """
+from models.preprocessor import TextPreprocessor
+TextPreprocessor()
+""",
+    'TextPreprocessor() + warmup() (eager, setara versi lama)': """
+from models.preprocessor import TextPreprocessor
+TextPreprocessor().warmup()
+""",
+    'ChatEngine(use_bundle=False).load() (3 pickle joblib)': """
+from models.chat_engine import ChatEngine
+ChatEngine(use_bundle=False).load()
+""",
+    'ChatEngine().load() (model bundle, mmap)': """
+from models.chat_engine import ChatEngine
+ChatEngine().load()
+""",
+    'ChatEngine().load() + jawaban pertama': """
+from models.chat_engine import ChatEngine
+ChatEngine().load().answer('berapa biaya kuliah')
+""",
+}
+
+CHILD_TEMPLATE = """
+import sys, time, json, io, contextlib
+start = time.perf_counter()
+sys.path.insert(0, {base_dir!r})
+with contextlib.redirect_stdout(io.StringIO()):
+{code}
+print(json.dumps(time.perf_counter() - start))
+"""
+
+
+def run_scenario(code, runs):
+    """Jalankan skenario beberapa kali, kembalikan list durasi (detik)"""
+    indented = '\n'.join('    ' + line for line in code.strip().splitlines())
+    child = CHILD_TEMPLATE.format(base_dir=BASE_DIR, code=indented)
+
+    durations = []
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, '-W', 'ignore', '-c', child],
+            capture_output=True, text=True, cwd=BASE_DIR
+        )
+        if result.returncode != 0:
+            raise RuntimeError(result.stderr)
+        durations.append(json.loads(result.stdout.strip().splitlines()[-1]))
+    return durations
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--runs', type=int, default=5, help='Jumlah run per skenario')
+    args = parser.parse_args()
+
+    print("\n" + "="*60)
+    print("BENCHMARK STARTUP")
+    print("="*60 + "\n")
+
+    for name, code in SCENARIOS.items():
+        durations = run_scenario(code, args.runs)
+        print(f"{name:<58} median {statistics.median(durations) * 1e3:8.1f} ms"
+              f"  (min {min(durations) * 1e3:.1f} ms)")
+
+    print("\n" + "="*60 + "\n")
+
+
+if __name__ == "__main__":
+    main()
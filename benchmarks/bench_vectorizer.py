@@ -0,0 +1,141 @@
+"""
+Benchmark mode TextVectorizer: 'vocabulary' vs 'hashing' (beberapa n_features)
+
+Semua mode memakai split train/test yang sama dengan train.py. Per mode
+diukur accuracy KNN pada data test, latency transform satu query (cache
+kata kosong / terisi), ukuran file vectorizer.pkl dan waktu load-nya.
+
+Jalankan: python benchmarks/bench_vectorizer.py [--features 1024 4096 16384]
+"""
+import sys
+import os
+import argparse
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from sklearn.model_selection import train_test_split
+
+from config import (
+    INTENTS_FILE, VECTORIZER_MAX_FEATURES, STOP_WORDS, TEST_SIZE, RANDOM_STATE,
+    KNN_NEIGHBORS, KNN_METRIC, STEM_CACHE_FILE, STEM_CACHE_MAX_SIZE
+)
+from models.preprocessor import TextPreprocessor
+from models.text_vectorizer import TextVectorizer
+from models.knn_classifier import KNNClassifier
+from utils.accuracy_calculator import AccuracyCalculator
+from train import load_intents, prepare_training_data, preprocess_pattern
+
+
+def load_dataset():
+    """Pattern intents.json yang sudah di-preprocess seperti di train.py"""
+    X_raw, y = prepare_training_data(load_intents(INTENTS_FILE))
+
+    preprocessor = TextPreprocessor(stem_cache_size=STEM_CACHE_MAX_SIZE)
+    preprocessor.load_stem_cache(STEM_CACHE_FILE)
+    return [preprocess_pattern(preprocessor, text) for text in X_raw], y
+
+
+def time_transform(vectorizer, queries, repeat=3):
+    """
+    Latency transform satu query dalam mikrodetik: pass pertama dengan cache
+    kata kosong (cold), pass berikutnya dengan cache terisi (warm)
+    """
+    vectorizer.word_cache.clear()
+    passes = []
+    for _ in range(repeat):
+        latencies = []
+        for query in queries:
+            start = time.perf_counter()
+            vectorizer.transform([query])
+            latencies.append((time.perf_counter() - start) * 1e6)
+        passes.append(latencies)
+    return np.array(passes[0]), np.array(passes[1:]).ravel()
+
+
+def measure_file(vectorizer):
+    """Ukuran pickle vectorizer (KB) dan waktu load-nya (ms)"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        filepath = os.path.join(tmp_dir, 'vectorizer.pkl')
+        vectorizer.save(filepath)
+        size_kb = os.path.getsize(filepath) / 1024
+
+        start = time.perf_counter()
+        TextVectorizer().load(filepath)
+        load_ms = (time.perf_counter() - start) * 1000
+    return size_kb, load_ms
+
+
+def evaluate(name, vectorizer, X_train, X_test, y_train, y_test, labels):
+    vectorizer.fit(X_train)
+    knn = KNNClassifier(n_neighbors=KNN_NEIGHBORS, metric=KNN_METRIC)
+    knn.fit(vectorizer.transform(X_train), y_train)
+
+    y_pred = knn.predict(vectorizer.transform(X_test))
+    accuracy = AccuracyCalculator().calculate(y_test, y_pred, labels=labels)['accuracy']
+
+    cold, warm = time_transform(vectorizer, X_test)
+    size_kb, load_ms = measure_file(vectorizer)
+    if vectorizer.mode == 'hashing':
+        n_features = vectorizer.params['n_features']
+    else:
+        n_features = len(vectorizer.vectorizer.vocabulary_)
+
+    return {
+        'name': name,
+        'features': n_features,
+        'accuracy': accuracy,
+        'cold_p50_us': float(np.percentile(cold, 50)),
+        'warm_p50_us': float(np.percentile(warm, 50)),
+        'warm_p99_us': float(np.percentile(warm, 99)),
+        'size_kb': size_kb,
+        'load_ms': load_ms,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--features', type=int, nargs='+',
+                        default=[1024, 2048, 4096, 8192, 16384],
+                        help='n_features untuk mode hashing')
+    args = parser.parse_args()
+
+    print("\n" + "="*60)
+    print("BENCHMARK VECTORIZER: VOCABULARY vs HASHING")
+    print("="*60)
+
+    X, y = load_dataset()
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y,
+        test_size=TEST_SIZE,
+        random_state=RANDOM_STATE,
+        stratify=y
+    )
+    labels = sorted(set(y))
+    print(f"\nTrain: {len(X_train)}  |  Test: {len(X_test)}  |  Tag: {len(labels)}\n")
+
+    candidates = [('vocabulary', TextVectorizer(max_features=VECTORIZER_MAX_FEATURES,
+                                                stop_words=STOP_WORDS))]
+    for n_features in args.features:
+        candidates.append((f'hashing {n_features}',
+                           TextVectorizer(mode='hashing', n_features=n_features)))
+
+    results = [evaluate(name, vectorizer, X_train, X_test, y_train, y_test, labels)
+               for name, vectorizer in candidates]
+
+    print("\n" + "-"*60)
+    print(f"{'mode':<15}{'features':>9}{'accuracy':>9}{'cold p50':>9}{'warm p50':>9}"
+          f"{'warm p99':>9}{'pkl KB':>8}{'load ms':>8}")
+    for r in results:
+        print(f"{r['name']:<15}{r['features']:>9}{r['accuracy']:>9.4f}{r['cold_p50_us']:>9.1f}"
+              f"{r['warm_p50_us']:>9.1f}{r['warm_p99_us']:>9.1f}{r['size_kb']:>8.1f}"
+              f"{r['load_ms']:>8.2f}")
+    print("(latency dalam mikrodetik per query)")
+    print("="*60 + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+"""
+Load test HTTP API (server.py): latency p50/p95/p99 dan requests per second
+
+Setiap client memakai satu koneksi keep-alive dan mengirim request
+berurutan; --concurrency client berjalan bersamaan. Pesan diambil acak
+dari pattern intents.json.
+
+Jalankan server dulu (python server.py), lalu:
+    python benchmarks/load_test.py --requests 2000 --concurrency 16
+atau biarkan script menjalankan server sendiri:
+    python benchmarks/load_test.py --start-server --executor thread --workers 4
+"""
+import sys
+import os
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import subprocess
+import time
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+from config import INTENTS_FILE, SERVER_HOST, SERVER_PORT
+
+
+class HTTPClient:
+    """Client HTTP/1.1 minimal dengan satu koneksi keep-alive"""
+
+    def __init__(self, host, port):
+        self.host = host
+        self.port = port
+        self.reader = None
+        self.writer = None
+
+    async def request(self, method, path, payload=None):
+        """Kirim request, kembalikan (status, body JSON)"""
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+
+        body = json.dumps(payload).encode('utf-8') if payload is not None else b''
+        head = (
+            f"{method} {path} HTTP/1.1\r\n"
+            f"Host: {self.host}:{self.port}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"\r\n"
+        )
+        self.writer.write(head.encode('latin-1') + body)
+        await self.writer.drain()
+
+        response_head = await self.reader.readuntil(b'\r\n\r\n')
+        lines = response_head.decode('latin-1').split('\r\n')
+        status = int(lines[0].split(' ')[1])
+        headers = {}
+        for line in lines[1:]:
+            name, _, value = line.partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+        data = await self.reader.readexactly(int(headers.get('content-length', 0)))
+        if headers.get('connection', '').lower() == 'close':
+            await self.close()
+
+        return status, json.loads(data.decode('utf-8')) if data else None
+
+    async def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except ConnectionError:
+                pass
+            self.writer = None
+
+
+def percentile(sorted_values, pct):
+    """Percentile (nearest-rank) dari list yang sudah terurut"""
+    if not sorted_values:
+        return 0.0
+    index = max(0, min(len(sorted_values) - 1, int(round(pct / 100 * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+async def run_client(host, port, jobs, messages, batch_size, latencies, errors):
+    client = HTTPClient(host, port)
+    try:
+        while jobs:
+            jobs.pop()
+            if batch_size > 1:
+                path, payload = '/chat/batch', {'messages': random.sample(messages, batch_size)}
+            else:
+                path, payload = '/chat', {'message': random.choice(messages)}
+
+            start = time.perf_counter()
+            try:
+                status, _ = await client.request('POST', path, payload)
+            except (ConnectionError, asyncio.IncompleteReadError) as e:
+                errors.append(str(e))
+                await client.close()
+                continue
+            latencies.append(time.perf_counter() - start)
+
+            if status != 200:
+                errors.append(f"HTTP {status}")
+    finally:
+        await client.close()
+
+
+async def run_load_test(host, port, n_requests, concurrency, messages, batch_size):
+    """Jalankan load test, kembalikan (latencies, errors, durasi total)"""
+    jobs = list(range(n_requests))
+    latencies = []
+    errors = []
+
+    start = time.perf_counter()
+    await asyncio.gather(*[
+        run_client(host, port, jobs, messages, batch_size, latencies, errors)
+        for _ in range(concurrency)
+    ])
+    return latencies, errors, time.perf_counter() - start
+
+
+async def wait_until_healthy(host, port, timeout):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        client = HTTPClient(host, port)
+        try:
+            status, _ = await client.request('GET', '/health')
+            if status == 200:
+                return
+        except OSError:
+            pass
+        finally:
+            await client.close()
+        await asyncio.sleep(0.2)
+    raise RuntimeError(f"Server tidak merespons dalam {timeout} detik")
+
+
+def start_server_process(args):
+    command = [
+        sys.executable, os.path.join(BASE_DIR, 'server.py'),
+        '--host', args.host, '--port', str(args.port),
+        '--executor', args.executor, '--workers', str(args.workers),
+        '--prefork', str(args.prefork),
+    ]
+    return subprocess.Popen(command, cwd=BASE_DIR,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default=SERVER_HOST)
+    parser.add_argument('--port', type=int, default=SERVER_PORT)
+    parser.add_argument('--requests', type=int, default=2000, help='Total request')
+    parser.add_argument('--concurrency', type=int, default=16, help='Jumlah client paralel')
+    parser.add_argument('--batch-size', type=int, default=1,
+                        help='Pesan per request (>1 memakai /chat/batch)')
+    parser.add_argument('--warmup', type=int, default=50, help='Request warmup (tidak diukur)')
+    parser.add_argument('--start-server', action='store_true',
+                        help='Jalankan server.py sebagai subprocess selama test')
+    parser.add_argument('--executor', default='thread', help='Untuk --start-server')
+    parser.add_argument('--workers', type=int, default=4, help='Untuk --start-server')
+    parser.add_argument('--prefork', type=int, default=0, help='Untuk --start-server')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    with open(INTENTS_FILE, 'r', encoding='utf-8') as f:
+        intents = json.load(f)['intents']
+    messages = [pattern for intent in intents for pattern in intent['patterns']]
+
+    server = start_server_process(args) if args.start_server else None
+    try:
+        asyncio.run(wait_until_healthy(args.host, args.port, timeout=120 if server else 5))
+
+        if args.warmup:
+            asyncio.run(run_load_test(args.host, args.port, args.warmup,
+                                      args.concurrency, messages, args.batch_size))
+
+        latencies, errors, duration = asyncio.run(run_load_test(
+            args.host, args.port, args.requests, args.concurrency, messages, args.batch_size
+        ))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    latencies.sort()
+    completed = len(latencies)
+
+    print("\n" + "="*60)
+    print(f"LOAD TEST http://{args.host}:{args.port} "
+          f"({'batch ' + str(args.batch_size) if args.batch_size > 1 else '/chat'})")
+    print("="*60 + "\n")
+    print(f"Requests     : {completed} selesai, {len(errors)} error")
+    print(f"Concurrency  : {args.concurrency}")
+    print(f"Durasi       : {duration:.2f} s")
+    print(f"Throughput   : {completed / duration:.1f} req/s"
+          + (f" ({completed * args.batch_size / duration:.1f} pesan/s)" if args.batch_size > 1 else ""))
+    if latencies:
+        print(f"Latency mean : {statistics.mean(latencies) * 1e3:.2f} ms")
+        for pct in (50, 95, 99):
+            print(f"Latency p{pct:<4}: {percentile(latencies, pct) * 1e3:.2f} ms")
+        print(f"Latency max  : {latencies[-1] * 1e3:.2f} ms")
+    if errors:
+        print(f"\nContoh error : {errors[0]}")
+    print("\n" + "="*60 + "\n")
+
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
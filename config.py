@@ -9,7 +9,7 @@ DATA_DIR = os.path.join(BASE_DIR, 'data')
 RAW_DATA_DIR = os.path.join(DATA_DIR, 'raw')
 PROCESSED_DATA_DIR = os.path.join(DATA_DIR, 'processed')
 MODELS_DIR = os.path.join(DATA_DIR, 'models')
-DOCS_DIR = os.path.join(BASE_DIR, 'docs')
+DOCS_DIR = os.path.join(BASE_DIR, 'Docs')
 STOP_WORDS = [
     # Kata Sambung Standar
     "yang", "di", "ke", "dari", "ini", "itu", "untuk", "pada",
@@ -30,17 +30,63 @@ STOP_WORDS = [
 ]
 # Files
 INTENTS_FILE = os.path.join(PROCESSED_DATA_DIR, 'intents.json')
+SLANG_FILE = os.path.join(PROCESSED_DATA_DIR, 'slang_dict.json')
 MODEL_FILE = os.path.join(MODELS_DIR, 'knn_model.pkl')
 VECTORIZER_FILE = os.path.join(MODELS_DIR, 'vectorizer.pkl')
+LATENT_FILE = os.path.join(MODELS_DIR, 'latent_projector.pkl')
 LABEL_ENCODER_FILE = os.path.join(MODELS_DIR, 'label_encoder.pkl')
+STEM_CACHE_FILE = os.path.join(MODELS_DIR, 'stem_cache.json')
+TRAIN_CACHE_DIR = os.path.join(MODELS_DIR, 'train_cache')
+EXACT_MATCH_FILE = os.path.join(MODELS_DIR, 'exact_match.json')
+MODEL_BUNDLE_DIR = os.path.join(MODELS_DIR, 'bundle')
 HANDBOOK_FILE = os.path.join(DOCS_DIR, 'buku_panduan.txt')
+HANDBOOK_TEXT_FILE = os.path.join(DOCS_DIR, 'buku_panduan_extracted.txt')  # hasil pdf_extractor
 
 # Model
 KNN_NEIGHBORS = 1
 KNN_METRIC = 'cosine'
+KNN_BACKEND = 'sklearn'  # 'sklearn' atau 'dense' (cosine via dot product float32)
 VECTORIZER_MAX_FEATURES = 2500
+VECTORIZER_MODE = 'vocabulary'  # 'vocabulary' atau 'hashing' (tanpa dict vocabulary, lihat bench_vectorizer.py)
+VECTORIZER_HASH_FEATURES = 8192  # Jumlah kolom hash untuk VECTORIZER_MODE = 'hashing'
+LATENT_DIM = 0  # >0 = KNN di ruang laten TruncatedSVD berdimensi ini (mis. 128-256), lihat bench_latent.py
 TEST_SIZE = 0.2
 RANDOM_STATE = 42
+TRAIN_JOBS = 0  # process preprocessing di train.py, 0 = semua core, 1 = serial
+BATCH_CHUNK_SIZE = 512  # Jumlah teks per chunk pada ChatEngine.classify_stream
+USE_MODEL_BUNDLE = True  # Load dari MODEL_BUNDLE_DIR (mmap, tanpa sklearn) jika tersedia
+USE_EXACT_MATCH = True  # Pertanyaan = pattern training (setelah preprocess) dijawab tanpa KNN
+INSTRUMENTATION_ENABLED = False  # Histogram durasi per tahap (ChatEngine.timing_stats, /metrics)
+MODEL_MMAP_MODE = 'r'  # 'r' = array model di-memory-map & dibagi antar worker, None = copy per process
+
+# Cache jawaban (key: hasil clean_text + normalize_slang)
+ANSWER_CACHE_MAX_SIZE = 1024  # 0 = nonaktif
+ANSWER_CACHE_TTL = 3600  # detik, None = tidak kedaluwarsa
+
+# Cache stemming Sastrawi per kata (in-memory LRU + tabel di STEM_CACHE_FILE)
+STEM_CACHE_MAX_SIZE = 50000
+STEM_CACHE_SAVE_EVERY = 500  # stem baru sebelum ChatEngine menulis STEM_CACHE_FILE, 0 = hanya saat close()
+
+# Cascade jawaban (ChatEngine.respond_batch): tier yang sukses menghentikan cascade
+CASCADE_TIERS = ('exact', 'cache', 'knn', 'handbook')  # [exact|cache]... knn [handbook]
+CASCADE_CONFIDENCE_THRESHOLD = 0.5  # probabilitas KNN di bawah ini -> cari di buku panduan
+CASCADE_MIN_SIMILARITY = 0.35  # cosine similarity pattern terdekat di bawah ini -> buku panduan
+HANDBOOK_MIN_KEYWORD_RATIO = 0.6  # bagian keyword pertanyaan yang harus ada di passage
+HANDBOOK_MAX_CHARS = 600
+
+# Server HTTP (server.py)
+SERVER_HOST = '127.0.0.1'
+SERVER_PORT = 8000
+SERVER_EXECUTOR = 'thread'  # 'thread' atau 'process'
+SERVER_WORKERS = 4
+SERVER_KEEP_ALIVE_TIMEOUT = 15  # detik idle sebelum koneksi keep-alive ditutup
+SERVER_MAX_BODY_SIZE = 1024 * 1024  # byte
+SERVER_MAX_BATCH_SIZE = 256  # pesan per request /chat/batch
+SERVER_COALESCE_MAX_WAIT_MS = 1  # jendela micro-batching request /chat, 0 = nonaktif
+SERVER_COALESCE_MAX_BATCH = 64
+SERVER_SHUTDOWN_TIMEOUT = 10  # detik menunggu request berjalan saat berhenti
+SERVER_PREFORK_PROCESSES = 0  # > 0 = mode prefork dengan N worker process (POSIX)
+SERVER_RELOAD_INTERVAL = 2  # detik antar pengecekan perubahan file model (prefork)
 
 # Voice
 STT_LANGUAGE_ID = 'id-ID'
@@ -1,14 +1,32 @@
 """
 Models package
 """
+import importlib
 
-# Import semua class agar bisa diakses langsung
-from .preprocessor import TextPreprocessor
-from .text_vectorizer import TextVectorizer
-from .knn_classifier import KNNClassifier
+# Semua class bisa diakses langsung (from models import X), tapi submodule
+# baru di-import saat class-nya dipakai. Dengan begitu import
+# models.preprocessor tidak ikut memuat scikit-learn.
+_EXPORTS = {
+    'TextPreprocessor': '.preprocessor',
+    'TextVectorizer': '.text_vectorizer',
+    'KNNClassifier': '.knn_classifier',
+    'ChatEngine': '.chat_engine',
+    'Instrumentation': '.instrumentation',
+    'LatentProjector': '.latent_projector',
+}
 
 __all__ = [
     'TextPreprocessor',
     'TextVectorizer',
-    'KNNClassifier'
-]
\ No newline at end of file
+    'KNNClassifier',
+    'ChatEngine',
+    'Instrumentation',
+    'LatentProjector'
+]
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        module = importlib.import_module(_EXPORTS[name], __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
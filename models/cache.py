@@ -0,0 +1,94 @@
+"""
+LRU Cache sederhana dengan TTL dan statistik hit/miss
+"""
+import threading
+import time
+from collections import OrderedDict
+
+
+class LRUCache:
+    """Cache LRU thread-safe dengan batas ukuran dan TTL opsional"""
+
+    def __init__(self, max_size=1024, ttl=None):
+        """
+        Initialize cache
+
+        Args:
+            max_size: Jumlah entry maksimal (entry terlama dibuang)
+            ttl: Umur entry dalam detik (None = tidak kedaluwarsa)
+        """
+        if max_size < 1:
+            raise ValueError("max_size minimal 1")
+
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        """Ambil value untuk key (dan tandai sebagai baru dipakai)"""
+        with self._lock:
+            entry = self._data.get(key)
+
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at is None or expires_at > time.monotonic():
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._data[key]
+
+            self.misses += 1
+            return default
+
+    def put(self, key, value):
+        """Simpan value untuk key"""
+        expires_at = None if self.ttl is None else time.monotonic() + self.ttl
+
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def items(self):
+        """Snapshot semua (key, value) yang belum kedaluwarsa, urut dari yang terlama"""
+        now = time.monotonic()
+        with self._lock:
+            return [
+                (key, value) for key, (value, expires_at) in self._data.items()
+                if expires_at is None or expires_at > now
+            ]
+
+    def clear(self):
+        """Hapus semua entry dan reset statistik"""
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    @property
+    def hit_rate(self):
+        """Rasio hit terhadap total lookup"""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self):
+        """Statistik cache dalam bentuk dictionary"""
+        return {
+            'size': len(self._data),
+            'max_size': self.max_size,
+            'ttl': self.ttl,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hit_rate,
+        }
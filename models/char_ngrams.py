@@ -0,0 +1,235 @@
+"""
+Char n-gram analyzer dan TF-IDF transform tanpa scikit-learn
+
+Dipakai TextVectorizer saat di-load dari model bundle, sehingga transform
+tidak membutuhkan objek TfidfVectorizer hasil unpickle.
+
+trie_ngram_counts() menghitung n-gram char_wb lewat prefix trie dari
+vocabulary: dari setiap posisi karakter, trie ditelusuri sampai tidak ada
+term vocabulary yang diawali prefix tersebut. N-gram yang pasti tidak ada
+di vocabulary tidak pernah dibuat sebagai string. Karena n-gram char_wb
+tidak melewati batas kata, hasil per kata bisa di-cache (word_cache).
+
+hashed_ngram_counts() adalah versi feature hashing (mode 'hashing'
+TextVectorizer): setiap n-gram dipetakan ke kolom crc32(n-gram) %
+n_features, tanpa vocabulary sama sekali.
+"""
+from zlib import crc32
+
+import numpy as np
+import scipy.sparse as sp
+
+
+def char_wb_ngrams(text, ngram_range):
+    """
+    N-gram karakter di dalam batas kata, identik dengan
+    TfidfVectorizer(analyzer='char_wb')
+    """
+    min_n, max_n = ngram_range
+    ngrams = []
+    append = ngrams.append
+
+    for word in text.split():
+        word = ' ' + word + ' '
+        word_len = len(word)
+        for n in range(min_n, max_n + 1):
+            offset = 0
+            append(word[offset:offset + n])
+            while offset + n < word_len:
+                offset += 1
+                append(word[offset:offset + n])
+            # Kata pendek (lebih pendek dari n) cukup dihitung sekali
+            if offset == 0:
+                break
+
+    return ngrams
+
+
+# Key node trie untuk index feature (karakter tunggal tidak pernah string kosong)
+TERM_KEY = ''
+
+
+def build_ngram_trie(vocabulary):
+    """
+    Prefix trie dari vocabulary
+
+    Args:
+        vocabulary: Iterable (term, feature_index)
+
+    Returns:
+        Dict bersarang {karakter: node}; node term menyimpan index feature
+        di key TERM_KEY
+    """
+    root = {}
+    for term, index in vocabulary:
+        node = root
+        for char in term:
+            child = node.get(char)
+            if child is None:
+                child = node[char] = {}
+            node = child
+        node[TERM_KEY] = int(index)
+    return root
+
+
+def word_ngram_counts(word, trie, ngram_range):
+    """
+    Hitungan {feature_index: count} n-gram char_wb satu kata yang ada di
+    vocabulary, identik dengan char_wb_ngrams() + lookup vocabulary
+    """
+    min_n, max_n = ngram_range
+    counts = {}
+    word = ' ' + word + ' '
+    word_len = len(word)
+
+    # Kata lebih pendek dari min_n dihitung utuh satu kali (seperti sklearn)
+    if word_len < min_n:
+        node = trie
+        for char in word:
+            node = node.get(char)
+            if node is None:
+                return counts
+        index = node.get(TERM_KEY)
+        if index is not None:
+            counts[index] = 1
+        return counts
+
+    for start in range(word_len):
+        node = trie
+        length = 0
+        for char in word[start:start + max_n]:
+            node = node.get(char)
+            if node is None:
+                break
+            length += 1
+            if length >= min_n:
+                index = node.get(TERM_KEY)
+                if index is not None:
+                    counts[index] = counts.get(index, 0) + 1
+
+    return counts
+
+
+def hashed_ngram_counts(word, ngram_range, n_features):
+    """
+    Hitungan {kolom: count} n-gram char_wb satu kata dengan feature hashing
+    (crc32 stabil antar process, tidak seperti hash() bawaan Python)
+    """
+    padded = (' ' + word + ' ').encode('utf-8')
+    if len(padded) != len(word) + 2:
+        # Ada karakter multi-byte: potong per karakter lalu encode per n-gram
+        grams = [gram.encode('utf-8') for gram in char_wb_ngrams(word, ngram_range)]
+    else:
+        # ASCII: potongan byte sama dengan potongan karakter, encode sekali saja
+        grams = []
+        padded_len = len(padded)
+        for n in range(ngram_range[0], ngram_range[1] + 1):
+            if n >= padded_len:
+                grams.append(padded)
+                break
+            grams.extend(padded[offset:offset + n] for offset in range(padded_len - n + 1))
+
+    counts = {}
+    for gram in grams:
+        index = crc32(gram) % n_features
+        counts[index] = counts.get(index, 0) + 1
+    return counts
+
+
+def sum_word_counts(text, count_word, word_cache=None, word_cache_size=50000):
+    """
+    Hitungan {feature_index: count} untuk satu dokumen dari hitungan per kata
+
+    Args:
+        text: Dokumen (sudah lowercase jika vectorizer memakai lowercase)
+        count_word: Fungsi kata -> dict hitungan (mis. word_ngram_counts)
+        word_cache: Dict kata -> hitungan per kata (diisi di sini), None = tanpa cache
+        word_cache_size: Jumlah kata maksimal; cache dikosongkan jika penuh
+    """
+    words = text.split()
+    if word_cache is None:
+        word_counts = [count_word(word) for word in words]
+    else:
+        word_counts = []
+        for word in words:
+            counts = word_cache.get(word)
+            if counts is None:
+                counts = count_word(word)
+                if len(word_cache) >= word_cache_size:
+                    word_cache.clear()
+                word_cache[word] = counts
+            word_counts.append(counts)
+
+    if len(word_counts) == 1:
+        return dict(word_counts[0])
+
+    total = {}
+    for counts in word_counts:
+        for index, count in counts.items():
+            total[index] = total.get(index, 0) + count
+    return total
+
+
+def trie_ngram_counts(text, trie, ngram_range, word_cache=None, word_cache_size=50000):
+    """Hitungan n-gram vocabulary satu dokumen lewat prefix trie (lihat sum_word_counts)"""
+    return sum_word_counts(
+        text, lambda word: word_ngram_counts(word, trie, ngram_range),
+        word_cache, word_cache_size
+    )
+
+
+def hashing_document_frequency(rows, n_features):
+    """Jumlah dokumen yang memakai setiap kolom hash"""
+    df = np.zeros(n_features, dtype=np.int64)
+    for row in rows:
+        df[np.fromiter(row, dtype=np.int64, count=len(row))] += 1
+    return df
+
+
+def tfidf_matrix(rows, idf, sublinear_tf=True, norm='l2'):
+    """
+    Susun matrix TF-IDF (CSR, float64) dari hitungan term per dokumen
+
+    Args:
+        rows: List dict {feature_index: count} per dokumen
+        idf: Array bobot idf per feature
+        sublinear_tf: Pakai 1 + log(tf)
+        norm: 'l2' atau None
+
+    Returns:
+        scipy.sparse.csr_matrix shape (len(rows), len(idf))
+    """
+    indptr = [0]
+    indices = []
+    counts = []
+
+    for row in rows:
+        for index in sorted(row):
+            indices.append(index)
+            counts.append(row[index])
+        indptr.append(len(indices))
+
+    indices = np.asarray(indices, dtype=np.int32)
+    indptr = np.asarray(indptr, dtype=np.int32)
+    data = np.asarray(counts, dtype=np.float64)
+
+    if sublinear_tf:
+        np.log(data, out=data)
+        data += 1.0
+
+    data *= idf[indices]
+
+    if norm == 'l2' and len(data) and len(rows) == 1:
+        # Satu dokumen (query chat): cukup satu dot product
+        length = np.sqrt(data @ data)
+        if length:
+            data /= length
+    elif norm == 'l2' and len(data):
+        row_ids = np.repeat(np.arange(len(rows)), np.diff(indptr))
+        norms = np.sqrt(np.bincount(row_ids, weights=data * data, minlength=len(rows)))
+        norms[norms == 0.0] = 1.0
+        data /= norms[row_ids]
+    elif norm not in ('l2', None):
+        raise ValueError(f"Norm tidak didukung: {norm}")
+
+    return sp.csr_matrix((data, indices, indptr), shape=(len(rows), len(idf)))
@@ -0,0 +1,681 @@
+"""
+Chat Engine - inference headless untuk UNKLAB Chatbot
+
+Memisahkan jalur pertanyaan -> jawaban dari GUI Tkinter, sehingga
+GUI, server, maupun worker process bisa memakai classifier yang sama
+tanpa perlu membuat window.
+"""
+import json
+import math
+import os
+import random
+import threading
+import time
+from itertools import islice
+
+from config import (
+    INTENTS_FILE, MODEL_FILE, VECTORIZER_FILE, LABEL_ENCODER_FILE,
+    KNN_BACKEND, BATCH_CHUNK_SIZE, ANSWER_CACHE_MAX_SIZE, ANSWER_CACHE_TTL,
+    STEM_CACHE_FILE, STEM_CACHE_MAX_SIZE, STEM_CACHE_SAVE_EVERY, MODEL_BUNDLE_DIR, USE_MODEL_BUNDLE,
+    MODEL_MMAP_MODE, INSTRUMENTATION_ENABLED, EXACT_MATCH_FILE, USE_EXACT_MATCH,
+    CASCADE_TIERS, CASCADE_CONFIDENCE_THRESHOLD, CASCADE_MIN_SIMILARITY,
+    HANDBOOK_TEXT_FILE, HANDBOOK_MIN_KEYWORD_RATIO, HANDBOOK_MAX_CHARS, LATENT_FILE
+)
+from pdf_extractor import load_knowledge_base, search_in_handbook
+from .cache import LRUCache
+from .exact_match import ExactMatchIndex
+from .instrumentation import Instrumentation, CascadeMetrics
+from .model_bundle import MANIFEST_FILE, load_bundle, bundle_is_current
+from .preprocessor import TextPreprocessor
+from .training_cache import file_sha1
+from .text_vectorizer import TextVectorizer
+from .knn_classifier import KNNClassifier
+from .latent_projector import LatentProjector
+
+
+FALLBACK_RESPONSES = {
+    'id': "Maaf, saya belum memahami pertanyaan Anda. Bisa coba dengan kata lain?",
+    'en': "Sorry, I don't quite understand. Could you rephrase?",
+}
+
+HANDBOOK_TAG = 'handbook'
+HANDBOOK_PREFIX = {
+    'id': "📖 Dari Buku Panduan UNKLAB:\n",
+    'en': "📖 From the UNKLAB handbook:\n",
+}
+
+# Tier sebelum KNN (urutan bebas) dan sesudah KNN
+LOOKUP_TIERS = ('exact', 'cache')
+FALLBACK_TIERS = ('handbook',)
+
+
+def validate_cascade_tiers(tiers):
+    """Cek urutan cascade: [exact|cache]... knn [handbook]"""
+    tiers = tuple(tiers)
+    if 'knn' not in tiers or len(set(tiers)) != len(tiers):
+        raise ValueError(f"Cascade harus berisi 'knn' tepat satu kali: {tiers}")
+
+    position = tiers.index('knn')
+    if not (set(tiers[:position]) <= set(LOOKUP_TIERS)
+            and set(tiers[position + 1:]) <= set(FALLBACK_TIERS)):
+        raise ValueError(
+            f"Urutan cascade tidak valid: {tiers} "
+            f"({'/'.join(LOOKUP_TIERS)} sebelum 'knn', {'/'.join(FALLBACK_TIERS)} sesudahnya)"
+        )
+    return tiers
+
+
+class ChatEngine:
+    """Engine inference: preprocessor + vectorizer + KNN + intents"""
+
+    def __init__(self, intents_file=INTENTS_FILE, model_file=MODEL_FILE,
+                 vectorizer_file=VECTORIZER_FILE,
+                 label_encoder_file=LABEL_ENCODER_FILE,
+                 knn_backend=KNN_BACKEND,
+                 answer_cache_size=ANSWER_CACHE_MAX_SIZE,
+                 answer_cache_ttl=ANSWER_CACHE_TTL,
+                 bundle_dir=MODEL_BUNDLE_DIR,
+                 use_bundle=USE_MODEL_BUNDLE,
+                 mmap_mode=MODEL_MMAP_MODE,
+                 instrumentation=INSTRUMENTATION_ENABLED,
+                 exact_match_file=EXACT_MATCH_FILE,
+                 use_exact_match=USE_EXACT_MATCH,
+                 cascade_tiers=CASCADE_TIERS,
+                 confidence_threshold=CASCADE_CONFIDENCE_THRESHOLD,
+                 min_similarity=CASCADE_MIN_SIMILARITY,
+                 handbook_file=HANDBOOK_TEXT_FILE,
+                 latent_file=LATENT_FILE,
+                 stem_cache_file=STEM_CACHE_FILE,
+                 stem_cache_save_every=STEM_CACHE_SAVE_EVERY):
+        """
+        Initialize engine (belum load model, panggil load())
+
+        Args:
+            intents_file: Path ke intents.json
+            model_file: Path ke model KNN
+            vectorizer_file: Path ke vectorizer
+            label_encoder_file: Path ke label encoder
+            knn_backend: Backend KNNClassifier ('sklearn' atau 'dense')
+            answer_cache_size: Ukuran cache LRU jawaban (0 = nonaktif)
+            answer_cache_ttl: Umur entry cache dalam detik (None = selamanya)
+            bundle_dir: Folder model bundle (lihat models/model_bundle.py)
+            use_bundle: Pakai model bundle jika ada dan tidak lebih lama
+                dari pickle (KNN otomatis memakai backend 'dense')
+            mmap_mode: 'r' supaya array model di-memory-map (satu salinan
+                fisik dipakai bersama semua worker process), None = copy
+            instrumentation: Catat durasi per tahap ke histogram
+                (lihat timing_stats()); False = tanpa overhead sama sekali
+            exact_match_file: Path index exact-match hasil train.py
+            use_exact_match: Jawab pertanyaan yang sama persis dengan
+                pattern training tanpa transform + KNN
+            cascade_tiers: Urutan tier jawaban, mis. ('exact', 'cache',
+                'knn', 'handbook'); tier yang sukses menghentikan cascade
+            confidence_threshold: Probabilitas KNN minimal sebelum
+                jawaban dicari di buku panduan
+            min_similarity: Cosine similarity pattern terdekat minimal
+                (dengan n_neighbors=1 probabilitas KNN selalu 1.0)
+            handbook_file: Text buku panduan hasil pdf_extractor
+            latent_file: LatentProjector hasil train.py (LATENT_DIM > 0);
+                dipakai jika ada, KNN lalu mencari di ruang laten
+            stem_cache_file: File cache stemming (dibaca saat load, ditulis
+                ulang setiap stem_cache_save_every stem baru dan saat close())
+            stem_cache_save_every: 0 = cache stemming hanya ditulis saat close()
+        """
+        self.intents_file = intents_file
+        self.model_file = model_file
+        self.vectorizer_file = vectorizer_file
+        self.label_encoder_file = label_encoder_file
+        self.knn_backend = knn_backend
+        self.bundle_dir = bundle_dir
+        self.use_bundle = use_bundle
+        self.mmap_mode = mmap_mode
+        self.exact_match_file = exact_match_file
+        self.use_exact_match = use_exact_match
+        self.cascade_tiers = validate_cascade_tiers(cascade_tiers)
+        self.confidence_threshold = confidence_threshold
+        self.min_similarity = min_similarity
+        self.handbook_file = handbook_file
+        self.latent_file = latent_file
+        self.stem_cache_file = stem_cache_file
+        self.stem_cache_save_every = stem_cache_save_every
+        self.cascade = CascadeMetrics()
+        self.instrumentation = Instrumentation() if instrumentation else None
+        self.answer_cache = (
+            LRUCache(answer_cache_size, answer_cache_ttl) if answer_cache_size else None
+        )
+
+        self.intents_data = None
+        self.responses_by_tag = {}
+        self.responses_by_index = ()
+        self.preprocessor = None
+        self.vectorizer = None
+        self.projector = None
+        self.knn = None
+        self.exact_match = None
+        self.handbook = None
+        self.lookup_tiers = ()
+        self.is_loaded = False
+        # Jumlah miss cache stemming (= stem baru) saat terakhir disimpan
+        self._stem_misses_saved = 0
+        self._stem_save_lock = threading.Lock()
+
+    def load(self):
+        """Load intents, vectorizer, model KNN dan preprocessor"""
+        with open(self.intents_file, 'r', encoding='utf-8') as f:
+            self.intents_data = json.load(f)
+
+        self._load_models()
+        self.exact_match = None
+        if self.use_exact_match and 'exact' in self.cascade_tiers:
+            self.exact_match = self._load_exact_match()
+
+        self.preprocessor = TextPreprocessor(stem_cache_size=STEM_CACHE_MAX_SIZE)
+        self.preprocessor.load_stem_cache(self.stem_cache_file)
+        self._stem_misses_saved = self.preprocessor.stem_cache.misses
+        self._build_response_index()
+        self._setup_cascade()
+
+        if self.instrumentation is not None:
+            self._instrument()
+        self.is_loaded = True
+
+        return self
+
+    def _load_models(self):
+        """Load vectorizer + KNN dari model bundle, fallback ke pickle"""
+        pickle_files = (self.model_file, self.vectorizer_file, self.label_encoder_file,
+                        self.latent_file)
+
+        if self.use_bundle:
+            if bundle_is_current(self.bundle_dir, pickle_files):
+                try:
+                    self.vectorizer, self.knn, self.projector = load_bundle(
+                        self.bundle_dir, self.mmap_mode
+                    )
+                    return
+                except (OSError, ValueError, KeyError) as e:
+                    print(f"Warning: Model bundle gagal di-load ({e}), memakai pickle")
+            elif os.path.exists(os.path.join(self.bundle_dir, MANIFEST_FILE)):
+                print("Warning: Model bundle tidak cocok dengan pickle, memakai pickle "
+                      "(jalankan: python -m models.model_bundle)")
+
+        self.vectorizer = TextVectorizer()
+        self.vectorizer.load(self.vectorizer_file, mmap_mode=self.mmap_mode)
+
+        self.knn = KNNClassifier(backend=self.knn_backend)
+        self.knn.load(self.model_file, self.label_encoder_file, mmap_mode=self.mmap_mode)
+
+        self.projector = None
+        if os.path.exists(self.latent_file):
+            projector = LatentProjector().load(self.latent_file, mmap_mode=self.mmap_mode)
+            # SHA-1 model berbeda: model sudah di-train ulang dan projector
+            # ini tidak cocok lagi
+            if projector.model_sha1 != file_sha1(self.model_file):
+                print("Warning: Latent projector bukan dari training model ini, tidak dipakai "
+                      "(jalankan: python train.py)")
+            else:
+                self.projector = projector
+
+    def _load_exact_match(self):
+        """Load index exact-match, None jika tidak ada atau bukan dari training model ini"""
+        if not os.path.exists(self.exact_match_file):
+            return None
+
+        try:
+            index = ExactMatchIndex.load(self.exact_match_file)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Warning: Exact-match index gagal di-load: {e}")
+            return None
+
+        # SHA-1 model berbeda: model sudah di-train ulang tanpa index baru
+        if index.model_sha1 != file_sha1(self.model_file):
+            print("Warning: Exact-match index bukan dari training model ini, tidak dipakai "
+                  "(jalankan: python train.py)")
+            return None
+        return index
+
+    def _setup_cascade(self):
+        """Tentukan tier yang benar-benar aktif dan load buku panduan"""
+        available = {
+            'exact': self.exact_match is not None,
+            'cache': self.answer_cache is not None,
+        }
+        position = self.cascade_tiers.index('knn')
+        self.lookup_tiers = tuple(
+            tier for tier in self.cascade_tiers[:position] if available[tier]
+        )
+
+        self.handbook = None
+        if 'handbook' in self.cascade_tiers:
+            self.handbook = load_knowledge_base(self.handbook_file)
+            if self.handbook is None:
+                raise FileNotFoundError(
+                    f"Buku panduan tidak ditemukan: {self.handbook_file}\n"
+                    f"Jalankan: python pdf_extractor.py, atau hapus 'handbook' dari CASCADE_TIERS"
+                )
+
+    def _instrument(self):
+        """Bungkus method setiap tahap dengan timer histogram"""
+        metrics = self.instrumentation
+        metrics.instrument(self.preprocessor, 'normalize')
+        metrics.instrument(self.preprocessor, 'detect_language')
+        metrics.instrument(self.preprocessor, 'preprocess')
+        metrics.instrument(self.vectorizer, 'transform', 'vectorizer_transform')
+        if self.projector is not None:
+            metrics.instrument(self.projector, 'transform', 'latent_projection')
+        metrics.instrument(self.knn, 'predict_with_similarity', 'knn_predict')
+        if self.exact_match is not None:
+            metrics.instrument(self.exact_match, 'get', 'exact_match')
+
+        # Total per batch; load() ulang tidak membungkus dua kali
+        if '_classify_batch' not in self.__dict__:
+            metrics.instrument(self, '_classify_batch', 'classify_batch')
+
+    def _build_response_index(self):
+        """
+        Compile intents sekali saat load menjadi index tag -> tuple responses
+        dan index label-encoder -> tuple responses, sehingga lookup per
+        pertanyaan O(1) tanpa scan intents
+        """
+        responses_by_tag = {}
+        for intent_data in self.intents_data['intents']:
+            # Tag duplikat: pakai intent pertama (sama seperti scan linear)
+            responses_by_tag.setdefault(intent_data['tag'], tuple(intent_data['responses']))
+
+        self.responses_by_tag = responses_by_tag
+        self.responses_by_index = tuple(
+            responses_by_tag.get(tag, ()) for tag in self.knn.classes_
+        )
+
+    def warmup(self):
+        """
+        Load resource lazy (stopwords, stemmer) dan jalankan satu prediksi,
+        supaya pertanyaan pertama tidak menanggung biaya inisialisasi
+        """
+        self._check_loaded()
+        self.preprocessor.warmup()
+        self.knn.predict_with_similarity(self.vectorize(['halo']))
+
+        # Prediksi warmup tidak ikut tercatat
+        if self.instrumentation is not None:
+            self.instrumentation.reset()
+        self.cascade.reset()
+        return self
+
+    def vectorize(self, processed_texts):
+        """Feature KNN untuk teks hasil preprocess: TF-IDF, lalu proyeksi laten jika ada"""
+        X = self.vectorizer.transform(processed_texts)
+        if self.projector is not None:
+            X = self.projector.transform(X)
+        return X
+
+    def _check_loaded(self):
+        if not self.is_loaded:
+            raise ValueError("Engine belum di-load! Jalankan load() terlebih dahulu.")
+
+    def preprocess(self, text):
+        """
+        Preprocess satu pertanyaan sama seperti saat training
+
+        Returns:
+            Tuple (processed_text, detected_language)
+        """
+        return self._preprocess_normalized(self.preprocessor.normalize(text))
+
+    def _preprocess_normalized(self, normalized):
+        """Lanjutan preprocess untuk text yang sudah di-normalize()"""
+        result = self.preprocessor.preprocess_for_model(normalized, normalized=True)
+        self._maybe_save_stem_cache()
+        return result
+
+    def _maybe_save_stem_cache(self):
+        """Tulis cache stemming jika sudah ada stem_cache_save_every stem baru"""
+        if not self.stem_cache_save_every:
+            return
+
+        new_stems = self.preprocessor.stem_cache.misses - self._stem_misses_saved
+        # new_stems < 0: statistik cache di-reset (stem_cache.clear())
+        if new_stems >= self.stem_cache_save_every or new_stems < 0:
+            self.save_stem_cache(wait=False)
+
+    def save_stem_cache(self, wait=True):
+        """
+        Tulis cache stemming ke stem_cache_file jika ada stem baru sejak
+        penyimpanan terakhir
+
+        Args:
+            wait: False = lewati jika thread lain sedang menyimpan
+        """
+        if not self._stem_save_lock.acquire(blocking=wait):
+            return
+
+        try:
+            misses = self.preprocessor.stem_cache.misses
+            if misses != self._stem_misses_saved:
+                self.preprocessor.save_stem_cache(self.stem_cache_file)
+                self._stem_misses_saved = misses
+        finally:
+            self._stem_save_lock.release()
+
+    def close(self):
+        """Simpan cache stemming; panggil saat GUI / server berhenti"""
+        if self.is_loaded:
+            self.save_stem_cache()
+
+    def classify(self, text):
+        """
+        Prediksi intent untuk satu pertanyaan
+
+        Returns:
+            Tuple (tag, confidence, detected_language)
+        """
+        return self.classify_batch([text])[0]
+
+    def classify_batch(self, texts):
+        """
+        Prediksi intent untuk banyak pertanyaan dengan satu transform
+        dan satu query KNN (pertanyaan yang ada di cache jawaban atau sama
+        persis dengan pattern training dilewati)
+
+        Returns:
+            List of (tag, confidence, detected_language)
+        """
+        return [result[:3] for result in self._classify_batch(texts)[0]]
+
+    def _lookup(self, normalized, cache_checked=False):
+        """
+        Jalankan tier lookup (exact / cache, sesuai urutan cascade) untuk
+        satu pertanyaan yang sudah di-normalize(); durasi dan hit setiap
+        tier dicatat di self.cascade. Durasi tier exact termasuk preprocess
+        (hasilnya dipakai ulang oleh KNN).
+
+        Args:
+            normalized: Hasil normalize()
+            cache_checked: True jika cache jawaban sudah dicek (miss) lewat
+                respond_cached(); tier cache dilewati, hasil tetap disimpan
+
+        Returns:
+            Tuple (result, processed, language, cache_missed); result None
+            jika tidak ada tier yang menjawab, processed None jika belum
+            di-preprocess
+        """
+        clock = time.perf_counter
+        processed = language = result = None
+        cache_missed = False
+
+        for tier in self.lookup_tiers:
+            if tier == 'cache' and cache_checked:
+                cache_missed = True
+                continue
+
+            start = clock()
+            if tier == 'cache':
+                result = self.answer_cache.get(normalized)
+                cache_missed = result is None
+            else:
+                if processed is None:
+                    processed, language = self._preprocess_normalized(normalized)
+                tag = self.exact_match.get(processed)
+                if tag is not None:
+                    result = (tag, 1.0, language, 1.0, None)
+            self.cascade.record_tier(tier, clock() - start, result is not None)
+            if result is not None:
+                if cache_missed:
+                    self.answer_cache.put(normalized, result)
+                break
+
+        return result, processed, language, cache_missed
+
+    def _classify_batch(self, texts, cache_checked=False, lookup=True):
+        """
+        Tier lookup per pertanyaan, lalu satu transform + query KNN untuk
+        sisanya. Hasil KNN disimpan di cache jawaban kecuali hasil yang
+        akan diteruskan ke buku panduan, sehingga cache hit selalu final.
+
+        Args:
+            texts: List teks mentah
+            cache_checked: True jika cache jawaban sudah dicek (miss) lewat
+                respond_cached()
+            lookup: False untuk langsung ke KNN tanpa tier lookup dan tanpa
+                menulis cache jawaban (classify_stream)
+
+        Returns:
+            Tuple (results, processed): results berisi (tag, confidence,
+            language, similarity, class_index) per pertanyaan (class_index
+            = index di knn.classes_, None untuk jawaban tier exact),
+            processed berisi hasil preprocess (None jika dijawab tier
+            lookup tanpa preprocess)
+        """
+        self._check_loaded()
+        clock = time.perf_counter
+
+        results = []
+        processed_texts = []
+        pending = []
+        for text in texts:
+            normalized = self.preprocessor.normalize(text)
+            if lookup:
+                result, processed, language, cache_missed = self._lookup(normalized, cache_checked)
+                if result is not None:
+                    results.append(result)
+                    processed_texts.append(processed)
+                    continue
+            else:
+                processed = None
+                cache_missed = False
+
+            if processed is None:
+                processed, language = self._preprocess_normalized(normalized)
+            pending.append((len(results), normalized, processed, language, cache_missed))
+            results.append(None)
+            processed_texts.append(processed)
+
+        if not pending:
+            return results, processed_texts
+
+        start = clock()
+        X = self.vectorize([item[2] for item in pending])
+        indices, confidences, similarities = self.knn.predict_with_similarity(X, return_index=True)
+        labels = self.knn.classes_
+
+        confident = 0
+        for (position, normalized, _, language, cache_missed), index, confidence, similarity in zip(
+                pending, indices, confidences, similarities):
+            result = (labels[index], float(confidence), language, float(similarity), int(index))
+            results[position] = result
+            uncertain = self._is_uncertain(result)
+            confident += not uncertain
+
+            if cache_missed and not (uncertain and self.handbook is not None):
+                self.answer_cache.put(normalized, result)
+
+        self.cascade.record_tier('knn', clock() - start, confident, len(pending))
+        return results, processed_texts
+
+    def _is_uncertain(self, result):
+        """True jika hasil KNN di bawah threshold cascade"""
+        _, confidence, _, similarity, _ = result
+        return confidence < self.confidence_threshold or similarity < self.min_similarity
+
+    def classify_stream(self, texts, chunk_size=BATCH_CHUNK_SIZE):
+        """
+        Klasifikasi iterable teks mentah (mis. file log) per chunk
+
+        Setiap chunk di-preprocess, di-transform dan di-query ke KNN
+        sekaligus; input dibaca secara lazy sehingga tidak perlu dimuat
+        seluruhnya ke memori. Tier lookup dilewati dan hasil tidak ditulis
+        ke cache jawaban, supaya replay log tidak mengusir entry cache
+        milik trafik live.
+
+        Args:
+            texts: Iterable teks mentah
+            chunk_size: Jumlah teks per batch transform/KNN
+
+        Yields:
+            Tuple (text, tag, confidence)
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size minimal 1")
+
+        iterator = iter(texts)
+        while True:
+            chunk = list(islice(iterator, chunk_size))
+            if not chunk:
+                return
+
+            results = self._classify_batch(chunk, lookup=False)[0]
+            for text, (tag, confidence, *_) in zip(chunk, results):
+                yield text, tag, confidence
+
+    def cache_stats(self):
+        """Statistik cache jawaban, cache stemming dan index exact-match (None jika nonaktif)"""
+        return {
+            'answer': self.answer_cache.stats() if self.answer_cache is not None else None,
+            'stem': self.preprocessor.stem_cache.stats(),
+            'exact': self.exact_match.stats() if self.exact_match is not None else None,
+        }
+
+    def tier_stats(self):
+        """Attempt, hit dan durasi (ms) setiap tier cascade"""
+        return self.cascade.stats()
+
+    def timing_stats(self):
+        """Durasi per tahap (ms) dari instrumentasi, None jika nonaktif"""
+        if self.instrumentation is None:
+            return None
+        return self.instrumentation.stats()
+
+    def get_response(self, tag, language='id'):
+        """Pilih satu response acak untuk tag, atau fallback jika tag tidak dikenal"""
+        responses = self.responses_by_tag.get(tag)
+
+        if responses:
+            return random.choice(responses)
+
+        return FALLBACK_RESPONSES.get(language, FALLBACK_RESPONSES['id'])
+
+    def get_response_by_index(self, index, language='id'):
+        """Sama seperti get_response, tapi dengan index kelas label encoder"""
+        responses = self.responses_by_index[index]
+
+        if responses:
+            return random.choice(responses)
+
+        return FALLBACK_RESPONSES.get(language, FALLBACK_RESPONSES['id'])
+
+    def _select_response(self, result):
+        """Response acak untuk hasil _classify_batch: hasil KNN lewat index class"""
+        tag, _, language, _, index = result
+        if index is not None:
+            return self.get_response_by_index(index, language)
+        return self.get_response(tag, language)
+
+    def _search_handbook(self, text, processed, language):
+        """
+        Tier handbook: passage buku panduan yang paling relevan, atau None
+
+        Args:
+            text: Pertanyaan mentah (dipakai jika hasil preprocess kosong)
+            processed: Hasil preprocess dari _classify_batch
+            language: Bahasa hasil deteksi
+        """
+        start = time.perf_counter()
+
+        query = processed or self.preprocessor.normalize(text)
+        min_score = max(1, math.ceil(len(query.split()) * HANDBOOK_MIN_KEYWORD_RATIO))
+        snippet = search_in_handbook(query, self.handbook, top_k=1, min_score=min_score)
+
+        self.cascade.record_tier('handbook', time.perf_counter() - start, snippet is not None)
+        if snippet is None:
+            return None
+
+        if len(snippet) > HANDBOOK_MAX_CHARS:
+            snippet = snippet[:HANDBOOK_MAX_CHARS].rsplit(' ', 1)[0] + '...'
+        return HANDBOOK_PREFIX.get(language, HANDBOOK_PREFIX['id']) + snippet
+
+    def respond_cached(self, text):
+        """
+        Jawab satu pertanyaan hanya dari cache jawaban (key hasil
+        normalize(), tanpa preprocess / stemming), sehingga bisa dijalankan
+        langsung di event loop server. Tier exact butuh preprocess penuh
+        dan tetap dijalankan di executor lewat respond_batch.
+
+        Returns:
+            Tuple (response, tag, confidence, language), atau None jika
+            harus dijawab lewat respond_batch([text], cache_checked=True)
+        """
+        self._check_loaded()
+        if 'cache' not in self.lookup_tiers:
+            return None
+
+        start = time.perf_counter()
+        # Cache hanya berisi hasil final (lihat _classify_batch)
+        result = self.answer_cache.get(self.preprocessor.normalize(text))
+        self.cascade.record_tier('cache', time.perf_counter() - start, result is not None)
+        if result is None:
+            return None
+
+        tag, confidence, language, _, _ = result
+        return self._select_response(result), tag, confidence, language
+
+    def respond_batch(self, texts, cache_checked=False):
+        """
+        Jawab banyak pertanyaan lewat cascade: tier lookup, KNN, lalu buku
+        panduan untuk hasil KNN yang kurang yakin (jika tidak ketemu,
+        jawaban KNN tetap dipakai)
+
+        Args:
+            texts: List teks mentah
+            cache_checked: True jika cache jawaban sudah dicek lewat
+                respond_cached() (tier cache dilewati)
+
+        Returns:
+            List of (response, tag, confidence, language), tag = 'handbook'
+            untuk jawaban dari buku panduan
+        """
+        results, processed_texts = self._classify_batch(texts, cache_checked)
+
+        responses = []
+        for text, result, processed in zip(texts, results, processed_texts):
+            tag, confidence, language, _, _ = result
+
+            if self.handbook is not None and self._is_uncertain(result):
+                snippet = self._search_handbook(text, processed, language)
+                if snippet is not None:
+                    responses.append((snippet, HANDBOOK_TAG, confidence, language))
+                    continue
+
+            responses.append((self._select_response(result), tag, confidence, language))
+
+        return responses
+
+    def answer(self, text):
+        """
+        Jawab satu pertanyaan
+
+        Returns:
+            Tuple (response, confidence)
+        """
+        return self.answer_batch([text])[0]
+
+    def answer_batch(self, texts):
+        """
+        Jawab banyak pertanyaan sekaligus
+
+        Returns:
+            List of (response, confidence), urutan sama dengan input
+        """
+        return [
+            (response, confidence)
+            for response, _, confidence, _ in self.respond_batch(texts)
+        ]
+
+
+# Test
+if __name__ == "__main__":
+    engine = ChatEngine().load()
+
+    for question in ["halo", "berapa biaya kuliah?", "where is the dormitory?"]:
+        response, confidence = engine.answer(question)
+        print(f"Q: {question}")
+        print(f"A: {response} ({confidence:.1%})\n")
@@ -0,0 +1,42 @@
+"""
+Import dependency dengan pesan install yang menyebut modul yang gagal
+
+scikit-learn hanya dibutuhkan untuk fit dan load pickle joblib, sehingga
+di-import lewat import_sklearn() saat dipakai; inference lewat model
+bundle cukup NumPy/SciPy.
+"""
+import importlib
+
+
+# Nama modul -> nama package pip jika berbeda
+PIP_PACKAGES = {
+    'sklearn': 'scikit-learn',
+}
+
+
+def report_missing(error):
+    """Cetak modul yang gagal di-import (dari ImportError) dan cara install-nya"""
+    module = (error.name or str(error)).split('.')[0]
+    print(f"ERROR: {module} tidak terinstall!")
+    print(f"Install: pip install {PIP_PACKAGES.get(module, module)}")
+
+
+def import_sklearn(module, *names):
+    """
+    Import atribut dari submodule scikit-learn hanya saat dibutuhkan
+
+    Args:
+        module: Submodule sklearn, mis. 'neighbors'
+        names: Nama class yang diambil dari submodule
+
+    Returns:
+        Satu class jika hanya satu nama, selain itu tuple
+    """
+    try:
+        sklearn_module = importlib.import_module(f'sklearn.{module}')
+    except ImportError as e:
+        report_missing(e)
+        raise
+
+    values = tuple(getattr(sklearn_module, name) for name in names)
+    return values[0] if len(values) == 1 else values
@@ -0,0 +1,112 @@
+"""
+Exact-match index - hasil preprocess pattern training -> tag
+
+Dibangun train.py dari semua pattern intents.json dan disimpan sebagai
+JSON di samping model. ChatEngine mengecek index ini sebelum
+TextVectorizer.transform dan query KNN: pertanyaan yang setelah
+preprocess sama persis dengan sebuah pattern langsung dijawab dengan
+confidence 1.0.
+
+Bentuk preprocess yang muncul di lebih dari satu tag tidak dimasukkan,
+keputusan untuk pertanyaan seperti itu tetap diserahkan ke KNN. File
+mencatat SHA-1 model KNN dari training yang sama supaya index dari
+training lama bisa dikenali.
+"""
+import json
+import os
+import threading
+
+
+EXACT_MATCH_VERSION = 1
+
+
+class ExactMatchIndex:
+    """Dict processed_text -> tag dengan statistik hit/miss"""
+
+    def __init__(self, table=None):
+        self.table = dict(table or {})
+        self.ambiguous = 0
+        self.model_sha1 = None
+        self.hits = 0
+        self.misses = 0
+        # Counter diubah dari beberapa thread executor server (seperti LRUCache)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def build(cls, processed_texts, labels):
+        """
+        Bangun index dari hasil preprocess pattern dan tag-nya
+
+        Args:
+            processed_texts: Pattern yang sudah di-preprocess (seperti saat training)
+            labels: Tag untuk setiap pattern
+        """
+        tags_by_text = {}
+        for text, tag in zip(processed_texts, labels):
+            if text:
+                tags_by_text.setdefault(text, set()).add(tag)
+
+        index = cls({
+            text: next(iter(tags)) for text, tags in tags_by_text.items() if len(tags) == 1
+        })
+        index.ambiguous = len(tags_by_text) - len(index.table)
+        return index
+
+    def get(self, processed_text):
+        """Tag untuk processed_text, None jika tidak ada pattern yang sama persis"""
+        tag = self.table.get(processed_text)
+        with self._lock:
+            if tag is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return tag
+
+    def __len__(self):
+        return len(self.table)
+
+    @property
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self):
+        return {
+            'size': len(self.table),
+            'ambiguous': self.ambiguous,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hit_rate,
+        }
+
+    def save(self, filepath, model_sha1=None):
+        """Simpan index; model_sha1 = SHA-1 file model KNN dari training yang sama"""
+        self.model_sha1 = model_sha1
+        data = {
+            'version': EXACT_MATCH_VERSION,
+            'ambiguous': self.ambiguous,
+            'model_sha1': model_sha1,
+            'patterns': self.table,
+        }
+        tmp_path = filepath + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, filepath)
+
+        print(f"Exact-match index disimpan ke {filepath} ({len(self.table)} pattern)")
+
+    @classmethod
+    def load(cls, filepath):
+        with open(filepath, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+
+        if data.get('version') != EXACT_MATCH_VERSION:
+            raise ValueError(
+                f"Versi exact-match index {data.get('version')} tidak didukung, "
+                f"jalankan ulang train.py"
+            )
+
+        index = cls(data['patterns'])
+        index.ambiguous = data.get('ambiguous', 0)
+        index.model_sha1 = data.get('model_sha1')
+        return index
@@ -0,0 +1,216 @@
+"""
+Instrumentasi timing per tahap pipeline inference (opt-in)
+
+Instrumentation membungkus method pada instance (mis.
+preprocessor.preprocess, vectorizer.transform, knn.predict_with_confidence)
+dengan timer yang mencatat durasi ke histogram per tahap. Jika tidak
+diaktifkan, tidak ada method yang dibungkus sehingga biaya runtime nol.
+
+Hasil bisa dibaca lewat stats() atau prometheus_text() (format text
+exposition Prometheus, dipakai endpoint /metrics di server).
+"""
+import functools
+import threading
+import time
+from bisect import bisect_left
+
+
+# Batas atas bucket histogram dalam detik (+Inf ditambahkan otomatis)
+DEFAULT_BUCKETS = (
+    0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005,
+    0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0,
+)
+
+
+class Histogram:
+    """Histogram durasi dengan bucket tetap (thread-safe)"""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds):
+        index = bisect_left(self.buckets, seconds)
+        with self._lock:
+            self.counts[index] += 1
+            self.count += 1
+            self.sum += seconds
+            if seconds > self.max:
+                self.max = seconds
+
+    def percentile(self, pct):
+        """Perkiraan percentile (interpolasi linear di dalam bucket)"""
+        with self._lock:
+            counts = list(self.counts)
+            total = self.count
+            maximum = self.max
+
+        if not total:
+            return 0.0
+
+        rank = pct / 100 * total
+        cumulative = 0
+        for index, count in enumerate(counts):
+            if count and cumulative + count >= rank:
+                lower = self.buckets[index - 1] if index > 0 else 0.0
+                upper = self.buckets[index] if index < len(self.buckets) else maximum
+                upper = min(upper, maximum)
+                return lower + (upper - lower) * (rank - cumulative) / count
+            cumulative += count
+        return maximum
+
+    def snapshot(self):
+        with self._lock:
+            return list(self.counts), self.count, self.sum, self.max
+
+    def reset(self):
+        with self._lock:
+            self.counts = [0] * (len(self.buckets) + 1)
+            self.count = 0
+            self.sum = 0.0
+            self.max = 0.0
+
+
+class Instrumentation:
+    """Registry histogram per tahap + helper untuk membungkus method"""
+
+    def __init__(self, metric_name='unklab_chatbot_stage_duration_seconds',
+                 label='stage', buckets=DEFAULT_BUCKETS):
+        """
+        Args:
+            metric_name: Nama metric pada output Prometheus
+            label: Nama label untuk membedakan tahap
+            buckets: Batas bucket histogram (detik)
+        """
+        self.metric_name = metric_name
+        self.label = label
+        self.bucket_bounds = tuple(buckets)
+        self.histograms = {}
+        self._lock = threading.Lock()
+
+    def histogram(self, stage):
+        histogram = self.histograms.get(stage)
+        if histogram is None:
+            with self._lock:
+                histogram = self.histograms.setdefault(stage, Histogram(self.bucket_bounds))
+        return histogram
+
+    def record(self, stage, seconds):
+        self.histogram(stage).observe(seconds)
+
+    def instrument(self, obj, method_name, stage=None):
+        """
+        Ganti obj.method_name dengan versi yang mencatat durasinya
+
+        Hanya mempengaruhi instance ini (atribut instance menimpa method
+        class), sehingga objek lain tidak ikut terbungkus.
+        """
+        method = getattr(obj, method_name)
+        histogram = self.histogram(stage or method_name)
+        clock = time.perf_counter
+
+        @functools.wraps(method)
+        def timed(*args, **kwargs):
+            start = clock()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                histogram.observe(clock() - start)
+
+        setattr(obj, method_name, timed)
+        return timed
+
+    def stats(self):
+        """Ringkasan per tahap: count, total/mean/p50/p95/p99/max dalam ms"""
+        summary = {}
+        for stage, histogram in sorted(self.histograms.items()):
+            _, count, total, maximum = histogram.snapshot()
+            summary[stage] = {
+                'count': count,
+                'total_ms': total * 1e3,
+                'mean_ms': total / count * 1e3 if count else 0.0,
+                'p50_ms': histogram.percentile(50) * 1e3,
+                'p95_ms': histogram.percentile(95) * 1e3,
+                'p99_ms': histogram.percentile(99) * 1e3,
+                'max_ms': maximum * 1e3,
+            }
+        return summary
+
+    def prometheus_text(self):
+        """Histogram dalam format text exposition Prometheus"""
+        name = self.metric_name
+        lines = [f"# TYPE {name} histogram"]
+
+        for stage, histogram in sorted(self.histograms.items()):
+            counts, count, total, _ = histogram.snapshot()
+            label = f'{self.label}="{stage}"'
+
+            cumulative = 0
+            for bound, bucket_count in zip(self.bucket_bounds, counts):
+                cumulative += bucket_count
+                lines.append(f'{name}_bucket{{{label},le="{bound}"}} {cumulative}')
+            lines.append(f'{name}_bucket{{{label},le="+Inf"}} {count}')
+            lines.append(f'{name}_sum{{{label}}} {total}')
+            lines.append(f'{name}_count{{{label}}} {count}')
+
+        return '\n'.join(lines) + '\n'
+
+    def reset(self):
+        for histogram in self.histograms.values():
+            histogram.reset()
+
+
+class CascadeMetrics(Instrumentation):
+    """Histogram durasi + counter attempt/hit per tier cascade jawaban"""
+
+    def __init__(self, metric_name='unklab_chatbot_tier_duration_seconds',
+                 label='tier', buckets=DEFAULT_BUCKETS):
+        super().__init__(metric_name, label, buckets)
+        self.attempts = {}
+        self.hits = {}
+
+    def record_tier(self, tier, seconds, hits, attempts=1):
+        """
+        Catat satu pemanggilan tier
+
+        Args:
+            tier: Nama tier
+            seconds: Durasi pemanggilan (satu observasi histogram)
+            hits: Jumlah pertanyaan yang terjawab di tier ini
+            attempts: Jumlah pertanyaan yang masuk ke tier ini
+        """
+        self.record(tier, seconds)
+        with self._lock:
+            self.attempts[tier] = self.attempts.get(tier, 0) + attempts
+            self.hits[tier] = self.hits.get(tier, 0) + hits
+
+    def stats(self):
+        summary = super().stats()
+        for tier, stats in summary.items():
+            attempts = self.attempts.get(tier, 0)
+            hits = self.hits.get(tier, 0)
+            stats.update({
+                'attempts': attempts,
+                'hits': hits,
+                'hit_rate': hits / attempts if attempts else 0.0,
+            })
+        return summary
+
+    def prometheus_text(self):
+        lines = []
+        for name, counts in (('attempts', self.attempts), ('hits', self.hits)):
+            metric = f"unklab_chatbot_tier_{name}_total"
+            lines.append(f"# TYPE {metric} counter")
+            for tier, count in sorted(counts.items()):
+                lines.append(f'{metric}{{{self.label}="{tier}"}} {count}')
+        return super().prometheus_text() + '\n'.join(lines) + '\n'
+
+    def reset(self):
+        super().reset()
+        with self._lock:
+            self.attempts.clear()
+            self.hits.clear()
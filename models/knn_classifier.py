@@ -1,75 +1,329 @@
 """
 KNN Classifier untuk Chatbot
 """
+from .dependencies import import_sklearn, report_missing
+
 try:
-    from sklearn.neighbors import KNeighborsClassifier
-    from sklearn.preprocessing import LabelEncoder
     import joblib
     import numpy as np
-except ImportError:
-    print("ERROR: Scikit-learn tidak terinstall!")
-    print("Install: pip install scikit-learn joblib numpy")
+    import scipy.sparse as sp
+except ImportError as e:
+    report_missing(e)
     raise
 
 
+BACKENDS = ('sklearn', 'dense')
+
+# Jarak cosine float32 di bawah nilai ini dianggap identik (jarak 0)
+DENSE_ZERO_DISTANCE = 1e-6
+
+
 class KNNClassifier:
     """K-Nearest Neighbors Classifier"""
     
-    def __init__(self, n_neighbors=1, metric='cosine'):
+    def __init__(self, n_neighbors=1, metric='cosine', backend='sklearn'):
         """
         Initialize KNN Classifier
         
         Args:
             n_neighbors: Jumlah neighbors untuk KNN
             metric: Distance metric ('cosine', 'euclidean', 'manhattan')
+            backend: 'sklearn' (KNeighborsClassifier) atau 'dense'
+                (matrix float32 ter-normalisasi L2 + dot product, hanya cosine)
         """
+        if backend not in BACKENDS:
+            raise ValueError(f"Backend tidak dikenal: {backend} (pilih dari {BACKENDS})")
+        if backend == 'dense' and metric != 'cosine':
+            raise ValueError("Backend 'dense' hanya mendukung metric 'cosine'")
+        
         self.n_neighbors = n_neighbors
         self.metric = metric
-        self.model = KNeighborsClassifier(
-            n_neighbors=n_neighbors,
-            metric=metric,
-            weights='distance'
-        )
-        self.label_encoder = LabelEncoder()
+        self.backend = backend
+        self.model = None
+        self.label_encoder = None
         self.is_fitted = False
+        
+        # State yang dipakai semua backend (diisi setelah fit/load)
+        self._train_matrix = None
+        self._neighbor_classes = None
+        self._class_labels = None
     
     def fit(self, X, y):
         """Train KNN model"""
+        KNeighborsClassifier = import_sklearn('neighbors', 'KNeighborsClassifier')
+        LabelEncoder = import_sklearn('preprocessing', 'LabelEncoder')
+        
         # Encode labels
+        self.label_encoder = LabelEncoder()
         y_encoded = self.label_encoder.fit_transform(y)
         
         # Train model
+        self.model = KNeighborsClassifier(
+            n_neighbors=self.n_neighbors,
+            metric=self.metric,
+            weights='distance'
+        )
         self.model.fit(X, y_encoded)
         self.is_fitted = True
         
+        self._sync_from_model()
         return self
     
-    def predict(self, X):
-        """Prediksi label untuk input"""
+    def _sync_from_model(self):
+        """Ambil state backend-agnostic dari model sklearn hasil fit/load"""
+        self.n_neighbors = self.model.n_neighbors
+        self.metric = self.model.metric
+        # Label (index class model) untuk setiap baris training
+        self._neighbor_classes = self.model._y
+        # Label asli untuk setiap index class model
+        self._class_labels = self.label_encoder.classes_[self.model.classes_]
+        
+        if self.backend == 'dense':
+            self._build_dense_index()
+    
+    @property
+    def classes_(self):
+        """Label asli untuk setiap index class (urutan kolom skor)"""
+        return self._class_labels
+    
+    def _build_dense_index(self):
+        """
+        Simpan training matrix sebagai array float32 contiguous dengan
+        baris ter-normalisasi L2 (norm dihitung sekali di sini).
+        
+        Matrix disimpan transposed (n_features, n_train) supaya query
+        sparse cukup satu perkalian CSR x dense yang contiguous.
+        """
+        if self.model.metric != 'cosine':
+            raise ValueError("Backend 'dense' hanya mendukung model dengan metric 'cosine'")
+        
+        X = self.model._fit_X
+        if sp.issparse(X):
+            X = X.toarray()
+        X = np.asarray(X, dtype=np.float32)
+        
+        norms = np.linalg.norm(X, axis=1, keepdims=True)
+        norms[norms == 0.0] = 1.0
+        self._train_matrix = np.ascontiguousarray((X / norms).T, dtype=np.float32)
+    
+    def _dense_kneighbors(self, X, n_neighbors):
+        """Cosine KNN: satu dot product + argpartition"""
+        if sp.issparse(X):
+            X = sp.csr_matrix(X)
+            n_queries = X.shape[0]
+            data = X.data.astype(np.float32)
+            row_ids = np.repeat(np.arange(n_queries), np.diff(X.indptr))
+            query_norms = np.sqrt(np.bincount(row_ids, weights=data * data, minlength=n_queries))
+            # Tetap float32 supaya scipy tidak meng-upcast training matrix
+            X = sp.csr_matrix((data, X.indices, X.indptr), shape=X.shape)
+        else:
+            X = np.asarray(X, dtype=np.float32)
+            query_norms = np.linalg.norm(X, axis=1)
+        query_norms[query_norms == 0.0] = 1.0
+        
+        similarities = X @ self._train_matrix
+        if sp.issparse(similarities):
+            # Training matrix CSR dari model bundle
+            similarities = similarities.toarray()
+        similarities = np.asarray(similarities, dtype=np.float64)
+        similarities /= query_norms[:, None]
+        
+        distances = 1.0 - similarities
+        np.clip(distances, 0.0, 2.0, out=distances)
+        distances[distances < DENSE_ZERO_DISTANCE] = 0.0
+        
+        n_train = distances.shape[1]
+        n_neighbors = min(n_neighbors, n_train)
+        if n_neighbors < n_train:
+            indices = np.argpartition(distances, n_neighbors - 1, axis=1)[:, :n_neighbors]
+        else:
+            indices = np.tile(np.arange(n_train), (distances.shape[0], 1))
+        
+        rows = np.arange(distances.shape[0])[:, None]
+        order = np.argsort(distances[rows, indices], axis=1)
+        indices = indices[rows, order]
+        
+        return distances[rows, indices], indices
+    
+    def _check_fitted(self):
         if not self.is_fitted:
             raise ValueError("Model belum di-train! Jalankan fit() terlebih dahulu.")
+    
+    def kneighbors(self, X, n_neighbors=None):
+        """
+        Cari neighbors terdekat (satu kali query)
+        
+        Returns:
+            Tuple (distances, indices), masing-masing shape (n_samples, k)
+        """
+        self._check_fitted()
+        
+        if n_neighbors is None:
+            n_neighbors = self.n_neighbors
+        
+        if self.backend == 'dense':
+            return self._dense_kneighbors(X, n_neighbors)
+        
+        return self.model.kneighbors(X, n_neighbors=n_neighbors)
+    
+    def _neighbor_scores(self, distances, indices):
+        """
+        Hitung skor per class dari hasil kneighbors, identik dengan
+        predict_proba sklearn untuk weights='distance'
+        """
+        # Bobot = 1 / jarak; jika ada jarak 0, hanya neighbor itu yang dihitung
+        with np.errstate(divide='ignore'):
+            weights = 1.0 / distances
+        inf_mask = np.isinf(weights)
+        inf_rows = np.any(inf_mask, axis=1)
+        weights[inf_rows] = inf_mask[inf_rows]
+        
+        # Label (index class model) dari setiap neighbor
+        neighbor_classes = self._neighbor_classes[indices]
         
-        y_pred_encoded = self.model.predict(X)
-        y_pred = self.label_encoder.inverse_transform(y_pred_encoded)
+        n_samples = distances.shape[0]
+        scores = np.zeros((n_samples, len(self._class_labels)))
+        rows = np.arange(n_samples)
+        for i in range(neighbor_classes.shape[1]):
+            scores[rows, neighbor_classes[:, i]] += weights[:, i]
         
-        return y_pred
+        normalizer = scores.sum(axis=1, keepdims=True)
+        normalizer[normalizer == 0.0] = 1.0
+        scores /= normalizer
+        
+        return scores
+    
+    def predict(self, X):
+        """Prediksi label untuk input"""
+        predictions, _ = self.predict_with_confidence(X)
+        return predictions
     
     def predict_proba(self, X):
         """Prediksi probabilitas untuk setiap class"""
-        if not self.is_fitted:
-            raise ValueError("Model belum di-train! Jalankan fit() terlebih dahulu.")
-        
-        return self.model.predict_proba(X)
+        distances, indices = self.kneighbors(X)
+        return self._neighbor_scores(distances, indices)
     
-    def predict_with_confidence(self, X):
-        """Prediksi dengan confidence score"""
-        predictions = self.predict(X)
-        probas = self.predict_proba(X)
+    def predict_with_confidence(self, X, top_k=None):
+        """
+        Prediksi dengan confidence score dari satu query neighbors
+        
+        Args:
+            X: Feature matrix
+            top_k: Jika diisi, kembalikan juga top-k intents beserta skornya
+        
+        Returns:
+            (predictions, confidences) atau
+            (predictions, confidences, top) dengan top berisi list
+            [(label, score), ...] per sample
+        """
+        distances, indices = self.kneighbors(X)
+        scores = self._neighbor_scores(distances, indices)
+        labels = self._class_labels
         
+        best = np.argmax(scores, axis=1)
+        predictions = labels[best]
         # Confidence = probabilitas maksimum
-        confidences = np.max(probas, axis=1)
+        confidences = scores[np.arange(len(best)), best]
+        
+        if top_k is None:
+            return predictions, confidences
+        
+        # Stable sort: skor sama diurutkan berdasarkan index class (konsisten dengan argmax)
+        order = np.argsort(-scores, axis=1, kind='stable')[:, :top_k]
+        top = [
+            [(labels[c], float(row[c])) for c in row_order]
+            for row, row_order in zip(scores, order)
+        ]
         
-        return predictions, confidences
+        return predictions, confidences, top
+    
+    def predict_with_similarity(self, X, return_index=False):
+        """
+        Seperti predict_with_confidence, ditambah cosine similarity neighbor
+        terdekat (1 - jarak). Dengan n_neighbors=1 confidence selalu 1.0,
+        similarity inilah yang menunjukkan seberapa mirip pertanyaan dengan
+        pattern training (metric selain cosine: similarity selalu 1.0).
+        
+        Args:
+            X: Feature matrix
+            return_index: Kembalikan index class (posisi di classes_)
+                alih-alih label
+        
+        Returns:
+            (predictions, confidences, similarities)
+        """
+        distances, indices = self.kneighbors(X)
+        scores = self._neighbor_scores(distances, indices)
+        
+        best = np.argmax(scores, axis=1)
+        confidences = scores[np.arange(len(best)), best]
+        
+        if self.metric == 'cosine':
+            similarities = 1.0 - distances[:, 0]
+        else:
+            similarities = np.ones(len(best))
+        
+        if return_index:
+            return best, confidences, similarities
+        return self._class_labels[best], confidences, similarities
+    
+    def to_arrays(self, feature_order=None):
+        """
+        Export state KNN (cosine) sebagai array NumPy untuk model bundle
+        
+        Training matrix (n_features, n_train, kolom ter-normalisasi L2)
+        disimpan sebagai CSR (train_data / train_indices / train_indptr):
+        TF-IDF char n-gram sangat sparse, versi dense float32 ~19x lebih
+        besar.
+        
+        Args:
+            feature_order: Urutan baru baris feature (mis. urutan
+                vocabulary terurut), None = urutan tetap
+        
+        Returns:
+            Tuple (arrays, params)
+        """
+        self._check_fitted()
+        
+        if self._train_matrix is None:
+            self._build_dense_index()
+        
+        train = sp.csr_matrix(self._train_matrix, dtype=np.float32)
+        if feature_order is not None:
+            train = train[feature_order]
+        train.sort_indices()
+        
+        arrays = {
+            'train_data': train.data,
+            'train_indices': train.indices.astype(np.int32),
+            'train_indptr': train.indptr.astype(np.int32),
+            'neighbor_classes': np.asarray(self._neighbor_classes, dtype=np.int32),
+            'class_labels': np.asarray(self._class_labels).astype(str),
+        }
+        params = {
+            'n_neighbors': int(self.n_neighbors),
+            'metric': self.metric,
+            'n_features': int(train.shape[0]),
+            'n_train': int(train.shape[1]),
+        }
+        return arrays, params
+    
+    @classmethod
+    def from_arrays(cls, arrays, params):
+        """
+        Buat KNNClassifier backend 'dense' dari hasil to_arrays() (tanpa
+        sklearn); array CSR dipakai langsung (tetap memory-mapped)
+        """
+        knn = cls(n_neighbors=params['n_neighbors'], metric=params['metric'], backend='dense')
+        knn._train_matrix = sp.csr_matrix(
+            (arrays['train_data'], arrays['train_indices'], arrays['train_indptr']),
+            shape=(params['n_features'], params['n_train']),
+            copy=False
+        )
+        knn._neighbor_classes = arrays['neighbor_classes']
+        knn._class_labels = arrays['class_labels']
+        knn.is_fitted = True
+        return knn
     
     def save(self, model_path, encoder_path):
         """Simpan model dan encoder"""
@@ -78,11 +332,24 @@ class KNNClassifier:
         print(f"Model disimpan ke {model_path}")
         print(f"Label encoder disimpan ke {encoder_path}")
     
-    def load(self, model_path, encoder_path):
-        """Load model dan encoder"""
-        self.model = joblib.load(model_path)
+    def load(self, model_path, encoder_path, mmap_mode=None):
+        """
+        Load model dan encoder
+        
+        Args:
+            model_path: Path pickle model KNN
+            encoder_path: Path pickle label encoder
+            mmap_mode: Diteruskan ke joblib.load (mis. 'r' untuk memory-map
+                training matrix di dalam pickle)
+        """
+        # Pickle berisi object scikit-learn
+        import_sklearn('neighbors', 'KNeighborsClassifier')
+        self.model = joblib.load(model_path, mmap_mode=mmap_mode)
         self.label_encoder = joblib.load(encoder_path)
         self.is_fitted = True
+        
+        self._sync_from_model()
+        
         print(f"Model loaded dari {model_path}")
         return self
 
@@ -104,4 +371,4 @@ if __name__ == "__main__":
     predictions, confidences = knn.predict_with_confidence(X_test)
     
     print("Predictions:", predictions[:5])
-    print("Confidences:", confidences[:5])
\ No newline at end of file
+    print("Confidences:", confidences[:5])
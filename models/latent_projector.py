@@ -0,0 +1,152 @@
+"""
+Latent projector - TruncatedSVD (LSA) dari matrix TF-IDF ke dense float32
+
+Opsional (LATENT_DIM di config). train.py mem-fit projector pada matrix
+TF-IDF semua pattern dan menyimpannya di samping vectorizer; KNN lalu
+di-train pada vektor laten sehingga pencarian neighbor menjadi satu
+perkalian matrix dense kecil (n_components x n_train) alih-alih ribuan
+kolom sparse.
+
+Fit butuh scikit-learn, transform cukup NumPy/SciPy:
+
+    X_latent = X_tfidf @ components   (components: n_features x n_components)
+"""
+from .dependencies import import_sklearn, report_missing
+
+try:
+    import joblib
+    import numpy as np
+except ImportError as e:
+    report_missing(e)
+    raise
+
+
+LATENT_FORMAT = 'unklab-latent-projector'
+
+
+class LatentProjector:
+    """Proyeksi TF-IDF sparse ke n_components dimensi dense (TruncatedSVD)"""
+
+    def __init__(self, n_components=128, random_state=42):
+        """
+        Args:
+            n_components: Jumlah dimensi laten (dibatasi n_features - 1 saat fit)
+            random_state: Seed randomized SVD
+        """
+        self.n_components = n_components
+        self.random_state = random_state
+        self.components = None
+        self.explained_variance_ratio = None
+        # SHA-1 model KNN yang di-train pada vektor laten projector ini
+        self.model_sha1 = None
+        self.is_fitted = False
+
+    def fit(self, X):
+        """Fit TruncatedSVD pada matrix TF-IDF (n_samples, n_features)"""
+        TruncatedSVD = import_sklearn('decomposition', 'TruncatedSVD')
+
+        n_components = min(self.n_components, X.shape[1] - 1, X.shape[0])
+        svd = TruncatedSVD(n_components=n_components, random_state=self.random_state)
+        svd.fit(X)
+
+        # Disimpan transposed (n_features, n_components): query CSR x dense contiguous
+        self.components = np.ascontiguousarray(svd.components_.T, dtype=np.float32)
+        self.explained_variance_ratio = float(svd.explained_variance_ratio_.sum())
+        self.n_components = n_components
+        self.is_fitted = True
+        return self
+
+    def transform(self, X):
+        """Proyeksikan matrix TF-IDF (sparse / dense) ke array float32 (n_samples, n_components)"""
+        if not self.is_fitted:
+            raise ValueError("Projector belum di-fit! Jalankan fit() terlebih dahulu.")
+
+        if hasattr(X, 'tocsr'):
+            X = X.tocsr()
+            if X.shape[0] == 1:
+                # Satu query: ambil baris components untuk n-gram yang ada saja,
+                # tanpa overhead perkalian sparse scipy
+                data = X.data.astype(np.float32)
+                return (data @ self.components[X.indices])[None, :]
+            # Tetap float32 supaya components tidak di-upcast
+            X = X.astype(np.float32) if X.dtype != np.float32 else X
+        else:
+            X = np.asarray(X, dtype=np.float32)
+        return np.asarray(X @ self.components, dtype=np.float32)
+
+    def fit_transform(self, X):
+        self.fit(X)
+        return self.transform(X)
+
+    def to_arrays(self):
+        """Export components untuk model bundle, baris mengikuti index feature vectorizer"""
+        if not self.is_fitted:
+            raise ValueError("Projector belum di-fit! Jalankan fit() terlebih dahulu.")
+
+        params = {
+            'n_components': int(self.n_components),
+            'explained_variance_ratio': self.explained_variance_ratio,
+        }
+        return {'latent_components': self.components}, params
+
+    @classmethod
+    def from_arrays(cls, arrays, params):
+        projector = cls(n_components=params['n_components'])
+        projector.components = arrays['latent_components']
+        projector.explained_variance_ratio = params.get('explained_variance_ratio')
+        projector.is_fitted = True
+        return projector
+
+    def save(self, filepath, model_sha1=None):
+        """
+        Simpan projector ke file
+
+        Args:
+            filepath: Path pickle joblib
+            model_sha1: SHA-1 file model KNN pasangannya (dicek ChatEngine)
+        """
+        self.model_sha1 = model_sha1
+        state = {
+            'format': LATENT_FORMAT,
+            'n_components': self.n_components,
+            'explained_variance_ratio': self.explained_variance_ratio,
+            'components': self.components,
+            'model_sha1': model_sha1,
+        }
+        joblib.dump(state, filepath)
+        print(f"Latent projector disimpan ke {filepath}")
+
+    def load(self, filepath, mmap_mode=None):
+        """
+        Load projector dari file
+
+        Args:
+            filepath: Path pickle joblib
+            mmap_mode: Diteruskan ke joblib.load (mis. 'r')
+        """
+        state = joblib.load(filepath, mmap_mode=mmap_mode)
+        if not isinstance(state, dict) or state.get('format') != LATENT_FORMAT:
+            raise ValueError(f"Bukan file latent projector: {filepath}")
+
+        self.n_components = state['n_components']
+        self.explained_variance_ratio = state['explained_variance_ratio']
+        self.components = state['components']
+        self.model_sha1 = state.get('model_sha1')
+        self.is_fitted = True
+        print(f"Latent projector loaded dari {filepath}")
+        return self
+
+
+# Test
+if __name__ == "__main__":
+    from scipy import sparse
+
+    X = sparse.random(50, 300, density=0.05, format='csr', random_state=0)
+    projector = LatentProjector(n_components=16)
+    X_latent = projector.fit_transform(X)
+
+    print("Latent shape:", X_latent.shape, X_latent.dtype)
+    print(f"Explained variance: {projector.explained_variance_ratio:.3f}")
+
+    restored = LatentProjector.from_arrays(*projector.to_arrays())
+    print("from_arrays sama:", np.array_equal(restored.transform(X), X_latent))
@@ -0,0 +1,185 @@
+"""
+Model bundle - vectorizer + KNN sebagai array NumPy (.npy) + manifest.json
+
+Pengganti tiga pickle joblib untuk inference. Array di-load dengan
+np.load(mmap_mode='r'), sehingga load hampir instan, scikit-learn tidak
+perlu di-import, dan beberapa worker process berbagi page memory yang sama.
+Training matrix KNN disimpan sebagai CSR (train_data / train_indices /
+train_indptr) yang sudah ter-normalisasi L2, sehingga ukurannya mengikuti
+jumlah n-gram yang terisi, bukan n_features x n_train. Jika model di-train
+dengan LatentProjector, components SVD ikut disimpan dan training matrix
+KNN berisi vektor laten. Manifest mencatat SHA-1
+pickle sumber, sehingga bundle yang tidak cocok lagi dengan pickle
+(model di-train ulang) dikenali tanpa bergantung pada mtime file.
+
+Konversi pickle yang sudah ada: python -m models.model_bundle
+"""
+import json
+import os
+
+import numpy as np
+
+from .text_vectorizer import TextVectorizer
+from .knn_classifier import KNNClassifier
+from .latent_projector import LatentProjector
+from .training_cache import file_sha1
+
+
+BUNDLE_FORMAT = 'unklab-chatbot-bundle'
+BUNDLE_VERSION = 2
+MANIFEST_FILE = 'manifest.json'
+
+VECTORIZER_ARRAYS = ('vocabulary', 'idf')
+HASHING_VECTORIZER_ARRAYS = ('idf',)
+KNN_ARRAYS = ('train_data', 'train_indices', 'train_indptr', 'neighbor_classes', 'class_labels')
+LATENT_ARRAYS = ('latent_components',)
+
+
+def manifest_path(bundle_dir):
+    return os.path.join(bundle_dir, MANIFEST_FILE)
+
+
+def source_hashes(source_files):
+    """Dict nama file -> SHA-1 isi file (None jika file tidak ada)"""
+    return {os.path.basename(source): file_sha1(source) for source in source_files}
+
+
+def save_bundle(bundle_dir, vectorizer, knn, projector=None, source_files=()):
+    """
+    Simpan vectorizer dan KNN (hasil fit/load) sebagai model bundle
+
+    Args:
+        bundle_dir: Folder tujuan (dibuat jika belum ada)
+        vectorizer: TextVectorizer yang sudah di-fit
+        knn: KNNClassifier yang sudah di-fit (metric cosine)
+        projector: LatentProjector jika KNN di-train pada vektor laten
+        source_files: Pickle asal model ini (sudah disimpan); SHA-1-nya
+            dicatat di manifest untuk bundle_is_current()
+    """
+    if knn.metric != 'cosine':
+        raise ValueError("Model bundle hanya mendukung KNN dengan metric 'cosine'")
+
+    vec_arrays, vec_params, feature_order = vectorizer.to_arrays()
+
+    # Samakan urutan feature dengan vocabulary terurut: baris components SVD
+    # jika ada projector, selain itu baris training matrix KNN
+    latent_arrays, latent_params = {}, None
+    if projector is not None:
+        latent_arrays, latent_params = projector.to_arrays()
+        latent_arrays = {
+            name: np.ascontiguousarray(array[feature_order])
+            for name, array in latent_arrays.items()
+        }
+        knn_arrays, knn_params = knn.to_arrays()
+    else:
+        knn_arrays, knn_params = knn.to_arrays(feature_order)
+
+    os.makedirs(bundle_dir, exist_ok=True)
+    arrays = list(vec_arrays.items()) + list(knn_arrays.items()) + list(latent_arrays.items())
+    for name, array in arrays:
+        np.save(os.path.join(bundle_dir, name + '.npy'), array, allow_pickle=False)
+
+    manifest = {
+        'format': BUNDLE_FORMAT,
+        'version': BUNDLE_VERSION,
+        'vectorizer': vec_params,
+        'knn': knn_params,
+        'latent': latent_params,
+        'n_features': knn_params['n_features'],
+        'n_train': knn_params['n_train'],
+        'n_classes': int(len(knn_arrays['class_labels'])),
+        'sources': source_hashes(source_files),
+    }
+
+    # Manifest ditulis terakhir: bundle dianggap lengkap hanya jika manifest ada
+    tmp_path = manifest_path(bundle_dir) + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, manifest_path(bundle_dir))
+
+    print(f"Model bundle disimpan ke {bundle_dir}")
+    return manifest
+
+
+def load_bundle(bundle_dir, mmap_mode='r'):
+    """
+    Load model bundle
+
+    Args:
+        bundle_dir: Folder bundle
+        mmap_mode: Diteruskan ke np.load ('r' = read-only memory map,
+            None = baca penuh ke memory)
+
+    Returns:
+        Tuple (vectorizer, knn, projector); KNN memakai backend 'dense',
+        projector None jika bundle tanpa proyeksi laten
+    """
+    with open(manifest_path(bundle_dir), 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+
+    if manifest.get('format') != BUNDLE_FORMAT:
+        raise ValueError(f"Bukan model bundle: {bundle_dir}")
+    if manifest.get('version') != BUNDLE_VERSION:
+        raise ValueError(
+            f"Versi model bundle {manifest.get('version')} tidak didukung "
+            f"(harus {BUNDLE_VERSION}), jalankan ulang train.py"
+        )
+
+    def load_arrays(names):
+        return {
+            name: np.load(os.path.join(bundle_dir, name + '.npy'),
+                          mmap_mode=mmap_mode, allow_pickle=False)
+            for name in names
+        }
+
+    vec_params = manifest['vectorizer']
+    vec_names = HASHING_VECTORIZER_ARRAYS if vec_params.get('mode') == 'hashing' else VECTORIZER_ARRAYS
+    vectorizer = TextVectorizer.from_arrays(load_arrays(vec_names), vec_params)
+    knn = KNNClassifier.from_arrays(load_arrays(KNN_ARRAYS), manifest['knn'])
+
+    projector = None
+    if manifest.get('latent'):
+        projector = LatentProjector.from_arrays(load_arrays(LATENT_ARRAYS), manifest['latent'])
+
+    print(f"Model bundle loaded dari {bundle_dir}")
+    return vectorizer, knn, projector
+
+
+def bundle_is_current(bundle_dir, source_files):
+    """
+    True jika bundle ada dan SHA-1 file pickle sumbernya sama dengan yang
+    tercatat di manifest (pickle berbeda berarti model sudah di-train ulang)
+    """
+    path = manifest_path(bundle_dir)
+    if not os.path.exists(path):
+        return False
+
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            recorded = json.load(f).get('sources')
+    except (OSError, ValueError):
+        return False
+
+    return recorded == source_hashes(source_files)
+
+
+# Konversi pickle -> bundle
+if __name__ == "__main__":
+    from config import MODEL_FILE, VECTORIZER_FILE, LABEL_ENCODER_FILE, MODEL_BUNDLE_DIR, LATENT_FILE
+
+    vectorizer = TextVectorizer().load(VECTORIZER_FILE)
+    knn = KNNClassifier().load(MODEL_FILE, LABEL_ENCODER_FILE)
+    projector = LatentProjector().load(LATENT_FILE) if os.path.exists(LATENT_FILE) else None
+    save_bundle(MODEL_BUNDLE_DIR, vectorizer, knn, projector,
+                source_files=(MODEL_FILE, VECTORIZER_FILE, LABEL_ENCODER_FILE, LATENT_FILE))
+
+    def features(vectorizer, projector, texts):
+        X = vectorizer.transform(texts)
+        return projector.transform(X) if projector is not None else X
+
+    # Verifikasi: prediksi bundle harus sama dengan pickle
+    bundle_vectorizer, bundle_knn, bundle_projector = load_bundle(MODEL_BUNDLE_DIR)
+    texts = ["berapa biaya kuliah", "jadwal ujian semester", "how to register"]
+    expected, _ = knn.predict_with_confidence(features(vectorizer, projector, texts))
+    actual, _ = bundle_knn.predict_with_confidence(features(bundle_vectorizer, bundle_projector, texts))
+    print("Prediksi sama:", list(expected) == list(actual))
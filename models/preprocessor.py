@@ -1,134 +1,215 @@
 """
 Text Preprocessor untuk Bahasa Indonesia dan Inggris
 """
+import importlib.util
+import json
+import os
 import re
-import string
-from typing import List
-from sklearn.feature_extraction.text import TfidfVectorizer
-try:
-    import nltk
-    from nltk.corpus import stopwords
-    from nltk.tokenize import word_tokenize
-except ImportError:
-    print("ERROR: NLTK tidak terinstall!")
-    print("Install: pip install nltk")
-    raise
-
-# Download NLTK data
-try:
-    nltk.data.find('tokenizers/punkt')
-except LookupError:
-    print("Downloading NLTK punkt...")
-    nltk.download('punkt')
-
-try:
-    nltk.data.find('corpora/stopwords')
-except LookupError:
-    print("Downloading NLTK stopwords...")
-    nltk.download('stopwords')
-
-# Sastrawi (optional)
-try:
+from typing import List, Tuple
+
+from config import SLANG_FILE
+from .cache import LRUCache
+from .slang_normalizer import SlangNormalizer
+
+# NLTK dan Sastrawi di-load secara lazy (saat pertama kali dibutuhkan) supaya
+# import modul ini dan pembuatan TextPreprocessor tetap cepat. Data NLTK tidak
+# pernah di-download otomatis; gunakan download_nltk_data() secara eksplisit.
+SASTRAWI_AVAILABLE = importlib.util.find_spec('Sastrawi') is not None
+
+NLTK_STOPWORDS_LANGUAGES = {'id': 'indonesian', 'en': 'english'}
+
+
+def download_nltk_data():
+    """Download data NLTK yang dibutuhkan (stopwords) jika belum ada"""
+    try:
+        import nltk
+    except ImportError:
+        print("ERROR: NLTK tidak terinstall!")
+        print("Install: pip install nltk")
+        raise
+
+    try:
+        nltk.data.find('corpora/stopwords')
+    except LookupError:
+        print("Downloading NLTK stopwords...")
+        nltk.download('stopwords')
+
+
+def load_stopwords(language):
+    """Load stopwords NLTK untuk 'id' atau 'en' (set kosong jika tidak tersedia)"""
+    name = NLTK_STOPWORDS_LANGUAGES.get(language, 'english')
+
+    try:
+        from nltk.corpus import stopwords
+        return set(stopwords.words(name))
+    except Exception:
+        label = 'Indonesian' if language == 'id' else 'English'
+        print(f"Warning: {label} stopwords not available")
+        return set()
+
+
+def create_sastrawi_stemmer():
+    """Buat stemmer Sastrawi (None jika Sastrawi tidak terinstall)"""
+    if not SASTRAWI_AVAILABLE:
+        print("Warning: Sastrawi tidak terinstall. Stemming Indonesia disabled.")
+        print("Install (optional): pip install Sastrawi")
+        return None
+
     from Sastrawi.Stemmer.StemmerFactory import StemmerFactory
-    SASTRAWI_AVAILABLE = True
-except ImportError:
-    SASTRAWI_AVAILABLE = False
-    print("Warning: Sastrawi tidak terinstall. Stemming Indonesia disabled.")
-    print("Install (optional): pip install Sastrawi")
+
+    # Pakai stemmer tanpa ArrayCache bawaan Sastrawi (cache tidak terbatas);
+    # caching per kata ditangani TextPreprocessor.stem_cache
+    stemmer = StemmerFactory().create_stemmer()
+    return getattr(stemmer, 'delegatedStemmer', stemmer)
+
+
+# Pola cleaning dikompilasi sekali di level modul
+URL_PATTERN = re.compile(r'http\S+|www\S+|https\S+')
+EMAIL_PATTERN = re.compile(r'\S+@\S+')
+MENTION_PATTERN = re.compile(r'@\w+|#\w+')
+PUNCTUATION_PATTERN = re.compile(r'[^\w\s]')
+
+# Satu regex gabungan untuk URL/email/mention. Tiga substitusi di atas tetap
+# dijalankan berurutan (hapus URL dulu bisa mengubah match email, mis.
+# "foo@http://x"), jadi pola gabungan ini dipakai sebagai gerbang: jika tidak
+# match, ketiga substitusi dipastikan tidak mengubah apa pun dan dilewati.
+SPECIAL_TOKEN_PATTERN = re.compile(r'http|www|[@#]')
+
+# Tabel str.translate untuk text ASCII: karakter non-word & non-space -> spasi,
+# identik dengan PUNCTUATION_PATTERN.sub(' ', text)
+ASCII_PUNCTUATION_TABLE = str.maketrans({
+    chr(c): ' ' for c in range(128) if PUNCTUATION_PATTERN.match(chr(c))
+})
+
+# Kata umum untuk deteksi bahasa
+ID_COMMON_WORDS = frozenset({'yang', 'dan', 'di', 'dari', 'ke', 'untuk', 'pada', 'dengan',
+                             'adalah', 'ini', 'itu', 'saya', 'kamu', 'apa', 'tidak'})
+EN_COMMON_WORDS = frozenset({'the', 'is', 'are', 'was', 'were', 'and', 'or', 'but',
+                             'in', 'on', 'at', 'to', 'for', 'of', 'with', 'a', 'an'})
 
 
 class TextPreprocessor:
     """Preprocessor untuk text Bahasa Indonesia dan Inggris"""
     
     
-    def __init__(self, language='id'):
+    def __init__(self, language='id', stem_cache_size=50000, slang_file=SLANG_FILE):
         """
         Initialize preprocessor
         
         Args:
             language: 'id' untuk Indonesia, 'en' untuk English
+            stem_cache_size: Jumlah kata maksimal di cache stemming
+            slang_file: File JSON dictionary slang (frasa -> pengganti)
         """
         self.language = language
+        self.stem_cache = LRUCache(max_size=stem_cache_size)
         
-        # Load stopwords
-        try:
-            self.stopwords_id = set(stopwords.words('indonesian'))
-        except:
-            self.stopwords_id = set()
-            print("Warning: Indonesian stopwords not available")
-        
-        try:
-            self.stopwords_en = set(stopwords.words('english'))
-        except:
-            self.stopwords_en = set()
-            print("Warning: English stopwords not available")
-        
-        # Initialize Sastrawi stemmer
-        if SASTRAWI_AVAILABLE:
-            factory = StemmerFactory()
-            self.stemmer_id = factory.create_stemmer()
+        # Stopwords & stemmer di-load saat pertama kali dipakai
+        self._stopwords = {}
+        self._stemmer_id = None
+        self._stemmer_loaded = False
+
+        # Slang dictionary (termasuk frasa multi-kata) dari file data
+        if slang_file and os.path.exists(slang_file):
+            self.slang_normalizer = SlangNormalizer.from_file(slang_file)
         else:
-            self.stemmer_id = None
-        self.slang_dict = {
-        "unklap": "unklab",
-        "unclab": "unklab",
-        "un club": "unklab",
-        "adven": "advent",
-        "mks": "terima kasih",
-        "makasih": "terima kasih",
-        "gk": "tidak",
-        "ga": "tidak",
-        "asmet": "asrama",
-        "chapel": "ibadah",
-        "pesiar": "izin keluar"
-    }
+            self.slang_normalizer = SlangNormalizer()
+            print(f"Warning: Slang dictionary tidak ditemukan: {slang_file}")
+    
+    @property
+    def stopwords_id(self):
+        """Stopwords Indonesia (lazy)"""
+        if 'id' not in self._stopwords:
+            self._stopwords['id'] = load_stopwords('id')
+        return self._stopwords['id']
+
+    @stopwords_id.setter
+    def stopwords_id(self, value):
+        self._stopwords['id'] = set(value)
+
+    @property
+    def stopwords_en(self):
+        """Stopwords English (lazy)"""
+        if 'en' not in self._stopwords:
+            self._stopwords['en'] = load_stopwords('en')
+        return self._stopwords['en']
+
+    @stopwords_en.setter
+    def stopwords_en(self, value):
+        self._stopwords['en'] = set(value)
+
+    @property
+    def stemmer_id(self):
+        """Stemmer Sastrawi (lazy, None jika tidak tersedia)"""
+        if not self._stemmer_loaded:
+            self._stemmer_id = create_sastrawi_stemmer()
+            self._stemmer_loaded = True
+        return self._stemmer_id
+
+    def warmup(self):
+        """Load semua resource lazy sekarang (mis. di background thread)"""
+        self.stopwords_id
+        self.stopwords_en
+        self.stemmer_id
+        return self
+
+    @property
+    def slang_dict(self):
+        """Dictionary frasa slang -> pengganti"""
+        return self.slang_normalizer.slang_dict
 
     def normalize_slang(self, text):
-        words = text.split()
-        return " ".join([self.slang_dict.get(w, w) for w in words])
-    
+        return " ".join(self.normalize_slang_tokens(text.split()))
+
+    def normalize_slang_tokens(self, tokens: List[str]) -> List[str]:
+        """Normalisasi slang (frasa terpanjang) pada list token"""
+        return self.slang_normalizer.normalize_tokens(tokens)
+
     def clean_text(self, text: str) -> str:
         """
         Bersihkan text dari karakter yang tidak diinginkan
         """
+        return ' '.join(self.clean_tokens(text))
+
+    def clean_tokens(self, text: str) -> List[str]:
+        """
+        Sama dengan clean_text, tapi mengembalikan list token
+        """
         text = text.lower()
-        
+
         # 1. Hapus URL, Email, Mentions
-        text = re.sub(r'http\S+|www\S+|https\S+', '', text, flags=re.MULTILINE)
-        text = re.sub(r'\S+@\S+', '', text)
-        text = re.sub(r'@\w+|#\w+', '', text)
-        
+        if SPECIAL_TOKEN_PATTERN.search(text):
+            text = URL_PATTERN.sub('', text)
+            text = EMAIL_PATTERN.sub('', text)
+            text = MENTION_PATTERN.sub('', text)
+
         # 2. JANGAN HAPUS ANGKA (Penting untuk 'Pasal 49' atau fitur Kalkulator)
         # Kita hanya hapus simbol yang tidak perlu, tapi biarkan angka tetap ada
-        # text = re.sub(r'\d+', '', text) <--- BARIS INI DIHAPUS/DIKOMENTAR
-        
+
         # 3. Hapus Punctuation kecuali angka dan huruf
-        # Gunakan regex agar lebih bersih
-        text = re.sub(r'[^\w\s]', ' ', text)
-        
-        # 4. Remove extra whitespace
-        text = ' '.join(text.split())
-        
-        return text
+        # ASCII lewat str.translate, selain itu regex (definisi \w Unicode)
+        if text.isascii():
+            text = text.translate(ASCII_PUNCTUATION_TABLE)
+        else:
+            text = PUNCTUATION_PATTERN.sub(' ', text)
+
+        # 4. Tokenisasi (sekaligus remove extra whitespace)
+        return text.split()
 
-    
-    
     def remove_stopwords(self, text: str, language: str = None) -> str:
         """
         Hapus stopwords dari text
         """
+        return ' '.join(self.remove_stopwords_tokens(text.split(), language))
+
+    def remove_stopwords_tokens(self, tokens: List[str], language: str = None) -> List[str]:
+        """Hapus stopwords dari list token"""
         if language is None:
             language = self.language
-        
-        words = text.split()
-        
-        if language == 'id':
-            filtered_words = [w for w in words if w not in self.stopwords_id]
-        else:
-            filtered_words = [w for w in words if w not in self.stopwords_en]
-        
-        return ' '.join(filtered_words)
-    
+
+        stopwords_set = self.stopwords_id if language == 'id' else self.stopwords_en
+        return [w for w in tokens if w not in stopwords_set]
+
     def stem_text(self, text: str, language: str = None) -> str:
         """
         Stemming text (hanya untuk Bahasa Indonesia)
@@ -137,57 +218,147 @@ class TextPreprocessor:
             language = self.language
         
         if language == 'id' and self.stemmer_id:
-            return self.stemmer_id.stem(text)
+            return self._stem_words(text)
         
         return text
     
-    def preprocess(self, text: str, 
-                   remove_stopwords: bool = False, # UBAH JADI FALSE SECARA DEFAULT
-                   apply_stemming: bool = False,   # UBAH JADI FALSE UNTUK KNN N-GRAM
-                   language: str = None) -> str:
+    def _stem_words(self, text: str) -> str:
+        """
+        Stemming per kata dengan cache; hasil sama dengan stemmer.stem(text)
+        karena Sastrawi juga memproses kalimat kata per kata
+        """
+        return ' '.join(self._stem_tokens(text.split()))
+
+    def _stem_tokens(self, tokens: List[str]) -> List[str]:
+        """Stemming list token lewat stem_cache"""
+        stems = []
+
+        for word in tokens:
+            stem = self.stem_cache.get(word)
+            if stem is None:
+                stem = self.stemmer_id.stem(word)
+                self.stem_cache.put(word, stem)
+            if stem:
+                stems.append(stem)
+
+        return stems
+
+    def load_stem_cache(self, filepath):
+        """Load tabel kata -> stem dari file JSON (jika ada)"""
+        if not os.path.exists(filepath):
+            return 0
         
-        # 1. Langkah Pertama: Lowercase & Clean (Hapus simbol tapi jaga angka)
-        text = self.clean_text(text)
+        with open(filepath, 'r', encoding='utf-8') as f:
+            table = json.load(f)
+        
+        for word, stem in table.items():
+            self.stem_cache.put(word, stem)
+        
+        print(f"Stem cache loaded dari {filepath} ({len(table)} kata)")
+        return len(table)
+    
+    def save_stem_cache(self, filepath):
+        """
+        Simpan tabel kata -> stem ke file JSON secara atomic (tulis ke file
+        sementara lalu os.replace), sehingga pembaca tidak pernah melihat
+        file setengah jadi. File sementara per process karena beberapa
+        worker bisa menyimpan bersamaan.
+        """
+        table = dict(self.stem_cache.items())
+        
+        tmp_path = f'{filepath}.{os.getpid()}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(table, f, ensure_ascii=False)
+        os.replace(tmp_path, filepath)
         
+        print(f"Stem cache disimpan ke {filepath} ({len(table)} kata)")
+    
+    def normalize(self, text: str) -> str:
+        """
+        clean_text + normalize_slang (dipakai juga sebagai key cache jawaban)
+        """
+        return ' '.join(self.normalize_tokens(text))
+
+    def normalize_tokens(self, text: str) -> List[str]:
+        """normalize() dalam bentuk list token"""
+        # 1. Langkah Pertama: Lowercase & Clean (Hapus simbol tapi jaga angka)
+        tokens = self.clean_tokens(text)
+
         # 2. Langkah Kedua: Normalisasi Slang
         # Dilakukan SETELAH clean_text supaya tanda tanya/titik sudah hilang
-        text = self.normalize_slang(text)
-        
+        return self.normalize_slang_tokens(tokens)
+
+    def preprocess(self, text: str,
+                   remove_stopwords: bool = False, # UBAH JADI FALSE SECARA DEFAULT
+                   apply_stemming: bool = False,   # UBAH JADI FALSE UNTUK KNN N-GRAM
+                   language: str = None,
+                   normalized: bool = False) -> str:
+
+        # 1-2. Clean & normalisasi slang (lewati jika text sudah hasil normalize())
+        # Semua tahap bekerja pada list token; join hanya sekali di akhir
+        if normalized:
+            tokens = text.split()
+        else:
+            tokens = self.normalize_tokens(text)
+
         # 3. Langkah Ketiga: Deteksi bahasa
         if language is None:
-            language = self.detect_language(text)
-        
+            language = self.detect_language_tokens(tokens)
+
         # 4. Remove Stopwords (Opsional)
-        # Untuk KNN, kata tanya seperti 'apa', 'dimana' sangat penting. 
+        # Untuk KNN, kata tanya seperti 'apa', 'dimana' sangat penting.
         # Lebih baik biarkan saja (False) agar bot tahu beda 'apa asrama' dan 'asrama'
         if remove_stopwords:
-            text = self.remove_stopwords(text, language)
-        
+            tokens = self.remove_stopwords_tokens(tokens, language)
+
         # 5. Stemming (Opsional)
         # Jika Anda pakai N-Gram di Vectorizer, Stemming seringkali tidak diperlukan
         # dan justru memperlambat proses training.
-        if apply_stemming and language == 'id':
-            text = self.stem_text(text, language)
-        
-        return text.strip()
-    
+        if apply_stemming and language == 'id' and self.stemmer_id:
+            tokens = self._stem_tokens(tokens)
+
+        return ' '.join(tokens)
+
+    def preprocess_for_model(self, text: str, normalized: bool = False) -> Tuple[str, str]:
+        """
+        Preprocess pattern training (train.py) dan pertanyaan user
+        (ChatEngine) dengan langkah yang sama, supaya key exact-match dan
+        fitur TF-IDF identik: normalize, deteksi bahasa dari hasil
+        normalize, hapus stopwords, stemming hanya untuk bahasa Indonesia
+
+        Args:
+            text: Text mentah, atau hasil normalize() jika normalized=True
+            normalized: True jika text sudah hasil normalize()
+
+        Returns:
+            Tuple (processed_text, language)
+        """
+        if not normalized:
+            text = self.normalize(text)
+
+        language = self.detect_language(text)
+        processed = self.preprocess(
+            text,
+            remove_stopwords=True,
+            apply_stemming=(language == 'id'),
+            language=language,
+            normalized=True
+        )
+        return processed, language
+
     def detect_language(self, text: str) -> str:
         """
         Deteksi bahasa dari text (sederhana)
         """
-        # Daftar kata umum Indonesia
-        id_words = {'yang', 'dan', 'di', 'dari', 'ke', 'untuk', 'pada', 'dengan',
-                    'adalah', 'ini', 'itu', 'saya', 'kamu', 'apa', 'tidak'}
-        
-        # Daftar kata umum English
-        en_words = {'the', 'is', 'are', 'was', 'were', 'and', 'or', 'but',
-                    'in', 'on', 'at', 'to', 'for', 'of', 'with', 'a', 'an'}
-        
-        words = set(text.lower().split())
-        
-        id_count = len(words & id_words)
-        en_count = len(words & en_words)
-        
+        return self.detect_language_tokens(text.lower().split())
+
+    def detect_language_tokens(self, tokens: List[str]) -> str:
+        """Deteksi bahasa dari list token (huruf kecil)"""
+        words = set(tokens)
+
+        id_count = len(words & ID_COMMON_WORDS)
+        en_count = len(words & EN_COMMON_WORDS)
+
         return 'id' if id_count >= en_count else 'en'
 
 
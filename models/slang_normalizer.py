@@ -0,0 +1,103 @@
+"""
+Normalisasi slang multi-kata menggunakan trie token
+"""
+import json
+from typing import Dict, List
+
+
+# Key penanda akhir frasa di node trie (token selalu string, jadi tidak bentrok)
+_END = None
+
+
+class SlangNormalizer:
+    """
+    Ganti frasa slang (satu atau beberapa kata) dengan bentuk bakunya
+
+    Dictionary dikompilasi sekali menjadi trie per token, sehingga semua
+    frasa diganti dalam satu kali jalan dari kiri ke kanan (longest match).
+    """
+
+    def __init__(self, slang_dict: Dict[str, str] = None):
+        """
+        Initialize normalizer
+
+        Args:
+            slang_dict: Dictionary frasa slang -> pengganti
+        """
+        self.slang_dict = {}
+        self._trie = {}
+        self.max_phrase_length = 0
+
+        for phrase, replacement in (slang_dict or {}).items():
+            self.add(phrase, replacement)
+
+    @classmethod
+    def from_file(cls, filepath):
+        """Load dictionary slang dari file JSON"""
+        with open(filepath, 'r', encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    def add(self, phrase: str, replacement: str):
+        """Tambah satu frasa slang ke trie"""
+        tokens = phrase.lower().split()
+        if not tokens:
+            return
+
+        node = self._trie
+        for token in tokens:
+            node = node.setdefault(token, {})
+        node[_END] = replacement.split()
+
+        self.slang_dict[' '.join(tokens)] = replacement
+        self.max_phrase_length = max(self.max_phrase_length, len(tokens))
+
+    def normalize_tokens(self, tokens: List[str]) -> List[str]:
+        """Normalisasi list token (hasil tetap satu kata per token)"""
+        trie = self._trie
+        normalized = []
+        i = 0
+        n = len(tokens)
+
+        while i < n:
+            node = trie.get(tokens[i])
+            if node is None:
+                normalized.append(tokens[i])
+                i += 1
+                continue
+
+            # Cari frasa terpanjang yang dimulai di posisi i
+            match, match_end = node.get(_END), i + 1
+            j = i + 1
+            while j < n:
+                node = node.get(tokens[j])
+                if node is None:
+                    break
+                j += 1
+                if _END in node:
+                    match, match_end = node[_END], j
+
+            if match is None:
+                normalized.append(tokens[i])
+                i += 1
+            else:
+                normalized.extend(match)
+                i = match_end
+
+        return normalized
+
+    def normalize(self, text: str) -> str:
+        """Normalisasi text (dipisah per spasi)"""
+        return ' '.join(self.normalize_tokens(text.split()))
+
+    def __len__(self):
+        return len(self.slang_dict)
+
+
+# Test
+if __name__ == "__main__":
+    normalizer = SlangNormalizer({
+        "un club": "unklab",
+        "mks": "terima kasih",
+        "gk": "tidak",
+    })
+    print(normalizer.normalize("mks info un club nya gk jelas"))
@@ -1,65 +1,320 @@
 """
 Text Vectorizer menggunakan TF-IDF
+
+Dua mode:
+    vocabulary  TfidfVectorizer char_wb (vocabulary max_features n-gram)
+    hashing     feature hashing n-gram char_wb ke n_features kolom; model
+                hanya berupa array idf (tanpa dict vocabulary, tanpa sklearn)
 """
+from .dependencies import import_sklearn, report_missing
+
 try:
-    from sklearn.feature_extraction.text import TfidfVectorizer
     import joblib
-except ImportError:
-    print("ERROR: Scikit-learn tidak terinstall!")
-    print("Install: pip install scikit-learn joblib")
+    import numpy as np
+except ImportError as e:
+    report_missing(e)
     raise
 
+from .char_ngrams import (
+    char_wb_ngrams, tfidf_matrix, build_ngram_trie, trie_ngram_counts,
+    hashed_ngram_counts, sum_word_counts, hashing_document_frequency
+)
+
+
+VECTORIZER_MODES = ('vocabulary', 'hashing')
+HASHING_FORMAT = 'unklab-hashing-tfidf'
+
 
 class TextVectorizer:
     """Vectorizer untuk convert text ke numerical features"""
     
-    def __init__(self, max_features=2500, ngram_range=(1, 7),stop_words=None ):
+    def __init__(self, max_features=2500, ngram_range=(1, 7),stop_words=None, use_trie=True,
+                 mode='vocabulary', n_features=4096):
         """
         Initialize vectorizer
         
         Args:
             max_features: Maksimal jumlah features
             ngram_range: Range untuk n-grams
+            use_trie: Transform lewat prefix trie vocabulary (hasil sama
+                dengan sklearn, hanya n-gram yang ada di vocabulary dibuat)
+            mode: 'vocabulary' (TfidfVectorizer) atau 'hashing'
+            n_features: Jumlah kolom hash untuk mode 'hashing'
         """
-        self.vectorizer = TfidfVectorizer(
-            max_features=max_features,
-            ngram_range=ngram_range,
-            min_df=1,
-            max_df=0.8,
-            stop_words=stop_words, 
-            lowercase=True,
-            analyzer='char_wb',
-            sublinear_tf=True
-        )
+        if mode not in VECTORIZER_MODES:
+            raise ValueError(f"Mode vectorizer tidak dikenal: {mode} (pilih: {VECTORIZER_MODES})")
+        
+        self.mode = mode
         self.is_fitted = False
+        
+        # State transform native (tanpa sklearn), diisi oleh from_arrays()
+        self.params = None
+        self.vocabulary_terms = None
+        self.vocabulary = None
+        self.idf = None
+        
+        if mode == 'hashing':
+            # Parameter sama dengan mode vocabulary, tanpa batas max_features
+            self.vectorizer = None
+            self.params = {
+                'mode': 'hashing',
+                'ngram_range': tuple(ngram_range),
+                'lowercase': True,
+                'sublinear_tf': True,
+                'norm': 'l2',
+                'n_features': int(n_features),
+                'max_df': 0.8,
+            }
+        else:
+            TfidfVectorizer = import_sklearn('feature_extraction.text', 'TfidfVectorizer')
+            self.vectorizer = TfidfVectorizer(
+                max_features=max_features,
+                ngram_range=ngram_range,
+                min_df=1,
+                max_df=0.8,
+                stop_words=stop_words,
+                lowercase=True,
+                analyzer='char_wb',
+                sublinear_tf=True
+            )
+        
+        # Prefix trie vocabulary, diisi setelah fit / load / from_arrays
+        self.use_trie = use_trie
+        self.trie = None
+        self.word_cache = {}
     
     def fit(self, texts):
         """Fit vectorizer pada texts"""
+        if self.mode == 'hashing':
+            return self._fit_hashing(texts)
+        
         self.vectorizer.fit(texts)
         self.is_fitted = True
+        self._build_trie()
+        return self
+    
+    def _fit_hashing(self, texts):
+        """Hitung idf per kolom hash (rumus smooth idf TfidfVectorizer)"""
+        rows = self._hashing_rows(texts)
+        n_documents = len(rows)
+        df = hashing_document_frequency(rows, self.params['n_features'])
+        
+        idf = np.log((1 + n_documents) / (1 + df)) + 1.0
+        # Kolom yang tidak pernah muncul atau muncul di > max_df dokumen diberi
+        # bobot 0, setara dengan n-gram yang dibuang dari vocabulary
+        idf[(df == 0) | (df > self.params['max_df'] * n_documents)] = 0.0
+        
+        self.idf = idf.astype(np.float32)
+        self.is_fitted = True
         return self
     
+    def _hashing_rows(self, texts):
+        ngram_range = self.params['ngram_range']
+        n_features = self.params['n_features']
+        lowercase = self.params['lowercase']
+        word_cache = self.word_cache
+        
+        def count_word(word):
+            return hashed_ngram_counts(word, ngram_range, n_features)
+        
+        return [
+            sum_word_counts(text.lower() if lowercase else text, count_word, word_cache)
+            for text in texts
+        ]
+    
+    def _hashing_transform(self, texts):
+        """TF-IDF dari kolom hash; kolom berbobot 0 tidak disimpan"""
+        X = tfidf_matrix(
+            self._hashing_rows(texts), self.idf,
+            sublinear_tf=self.params['sublinear_tf'],
+            norm=self.params['norm']
+        )
+        X.eliminate_zeros()
+        return X
+    
+    def _build_trie(self):
+        """
+        Siapkan transform trie dari TfidfVectorizer (index feature asli sklearn);
+        konfigurasi yang tidak didukung tetap memakai transform sklearn
+        """
+        self.trie = None
+        vectorizer = self.vectorizer
+        if (not self.use_trie or vectorizer.analyzer != 'char_wb' or vectorizer.binary
+                or not vectorizer.use_idf or vectorizer.strip_accents is not None
+                or vectorizer.preprocessor is not None):
+            return
+        
+        self.params = {
+            'ngram_range': tuple(vectorizer.ngram_range),
+            'lowercase': bool(vectorizer.lowercase),
+            'sublinear_tf': bool(vectorizer.sublinear_tf),
+            'norm': vectorizer.norm,
+        }
+        self.idf = np.asarray(vectorizer.idf_, dtype=np.float64)
+        self.trie = build_ngram_trie(vectorizer.vocabulary_.items())
+        self.word_cache = {}
+    
     def transform(self, texts):
         """Transform texts ke numerical features"""
         if not self.is_fitted:
             raise ValueError("Vectorizer belum di-fit! Jalankan fit() terlebih dahulu.")
         
+        if self.mode == 'hashing':
+            return self._hashing_transform(texts)
+        
+        if self.trie is not None:
+            return self._trie_transform(texts)
+        
+        if self.vectorizer is None:
+            return self._native_transform(texts)
+        
         return self.vectorizer.transform(texts)
     
+    def _trie_transform(self, texts):
+        """
+        TF-IDF char_wb lewat prefix trie vocabulary (hasil sama dengan sklearn);
+        hitungan n-gram per kata di-cache di self.word_cache
+        """
+        ngram_range = self.params['ngram_range']
+        lowercase = self.params['lowercase']
+        trie = self.trie
+        word_cache = self.word_cache
+        
+        rows = [
+            trie_ngram_counts(text.lower() if lowercase else text, trie, ngram_range, word_cache)
+            for text in texts
+        ]
+        
+        return tfidf_matrix(
+            rows, self.idf,
+            sublinear_tf=self.params['sublinear_tf'],
+            norm=self.params['norm']
+        )
+    
+    def _native_transform(self, texts):
+        """TF-IDF char_wb dari vocabulary + idf array (hasil sama dengan sklearn)"""
+        ngram_range = self.params['ngram_range']
+        lowercase = self.params['lowercase']
+        vocabulary = self.vocabulary
+        
+        rows = []
+        for text in texts:
+            if lowercase:
+                text = text.lower()
+            counts = {}
+            for gram in char_wb_ngrams(text, ngram_range):
+                index = vocabulary.get(gram)
+                if index is not None:
+                    counts[index] = counts.get(index, 0) + 1
+            rows.append(counts)
+        
+        return tfidf_matrix(
+            rows, self.idf,
+            sublinear_tf=self.params['sublinear_tf'],
+            norm=self.params['norm']
+        )
+    
     def fit_transform(self, texts):
         """Fit dan transform sekaligus"""
         self.fit(texts)
         return self.transform(texts)
     
+    def to_arrays(self):
+        """
+        Export vocabulary (terurut) dan idf sebagai array NumPy untuk model bundle
+        
+        Returns:
+            Tuple (arrays, params, feature_order) dengan feature_order berisi
+            index feature asli untuk setiap term terurut
+        """
+        if not self.is_fitted:
+            raise ValueError("Vectorizer belum di-fit! Jalankan fit() terlebih dahulu.")
+        
+        if self.mode == 'hashing':
+            params = dict(self.params, ngram_range=list(self.params['ngram_range']))
+            return {'idf': self.idf}, params, np.arange(self.params['n_features'])
+        
+        if self.vectorizer is None:
+            feature_order = np.arange(len(self.vocabulary_terms))
+            return {'vocabulary': self.vocabulary_terms, 'idf': self.idf}, self.params, feature_order
+        
+        vectorizer = self.vectorizer
+        if vectorizer.analyzer != 'char_wb' or vectorizer.binary or not vectorizer.use_idf:
+            raise ValueError("Hanya vectorizer TF-IDF char_wb yang bisa di-export")
+        
+        terms = sorted(vectorizer.vocabulary_)
+        feature_order = np.array([vectorizer.vocabulary_[term] for term in terms], dtype=np.int64)
+        
+        arrays = {
+            'vocabulary': np.array(terms),
+            'idf': np.asarray(vectorizer.idf_, dtype=np.float64)[feature_order],
+        }
+        params = {
+            'ngram_range': list(vectorizer.ngram_range),
+            'lowercase': bool(vectorizer.lowercase),
+            'sublinear_tf': bool(vectorizer.sublinear_tf),
+            'norm': vectorizer.norm,
+        }
+        return arrays, params, feature_order
+    
+    @classmethod
+    def from_arrays(cls, arrays, params, use_trie=True):
+        """Buat TextVectorizer dari hasil to_arrays() (transform tanpa sklearn)"""
+        vectorizer = cls.__new__(cls)
+        vectorizer.vectorizer = None
+        vectorizer.params = dict(params, ngram_range=tuple(params['ngram_range']))
+        vectorizer.mode = params.get('mode', 'vocabulary')
+        vectorizer.idf = arrays['idf']
+        vectorizer.word_cache = {}
+        vectorizer.is_fitted = True
+        
+        if vectorizer.mode == 'hashing':
+            vectorizer.vocabulary_terms = None
+            vectorizer.vocabulary = None
+            vectorizer.use_trie = False
+            vectorizer.trie = None
+            return vectorizer
+        
+        vectorizer.vocabulary_terms = arrays['vocabulary']
+        vectorizer.vocabulary = {
+            term: index for index, term in enumerate(arrays['vocabulary'].tolist())
+        }
+        vectorizer.use_trie = use_trie
+        vectorizer.trie = build_ngram_trie(vectorizer.vocabulary.items()) if use_trie else None
+        return vectorizer
+    
     def save(self, filepath):
         """Simpan vectorizer ke file"""
-        joblib.dump(self.vectorizer, filepath)
+        if self.mode == 'hashing':
+            state = {'format': HASHING_FORMAT, 'params': self.params, 'idf': self.idf}
+            joblib.dump(state, filepath)
+        else:
+            joblib.dump(self.vectorizer, filepath)
         print(f"Vectorizer disimpan ke {filepath}")
     
-    def load(self, filepath):
-        """Load vectorizer dari file"""
-        self.vectorizer = joblib.load(filepath)
+    def load(self, filepath, mmap_mode=None):
+        """
+        Load vectorizer dari file
+        
+        Args:
+            filepath: Path pickle joblib
+            mmap_mode: Diteruskan ke joblib.load (mis. 'r' untuk memory-map
+                array NumPy di dalam pickle)
+        """
+        state = joblib.load(filepath, mmap_mode=mmap_mode)
         self.is_fitted = True
+        self.word_cache = {}
+        
+        if isinstance(state, dict) and state.get('format') == HASHING_FORMAT:
+            self.mode = 'hashing'
+            self.vectorizer = None
+            self.params = dict(state['params'])
+            self.idf = state['idf']
+            self.trie = None
+        else:
+            self.mode = 'vocabulary'
+            self.vectorizer = state
+            self._build_trie()
         print(f"Vectorizer loaded dari {filepath}")
         return self
 
@@ -76,4 +331,15 @@ if __name__ == "__main__":
     X = vectorizer.fit_transform(texts)
     
     print("Feature matrix shape:", X.shape)
-    print("Feature matrix:\n", X.toarray())
\ No newline at end of file
+    print("Feature matrix:\n", X.toarray())
+    
+    # Transform trie harus identik dengan transform sklearn
+    X_sklearn = vectorizer.vectorizer.transform(texts)
+    print("Trie == sklearn:", abs(X - X_sklearn).max() == 0)
+    
+    # Mode hashing: tanpa vocabulary, hasil from_arrays harus sama
+    hashing = TextVectorizer(mode='hashing', n_features=256)
+    X_hash = hashing.fit_transform(texts)
+    restored = TextVectorizer.from_arrays(*hashing.to_arrays()[:2])
+    print("Hashing matrix shape:", X_hash.shape)
+    print("Hashing from_arrays sama:", abs(X_hash - restored.transform(texts)).max() == 0)
@@ -0,0 +1,110 @@
+"""
+Cache training inkremental - hasil preprocess per pattern
+
+Setiap pattern diberi fingerprint (SHA-1 dari teks mentah). Cache
+menyimpan fingerprint -> hasil preprocess beserta signature preprocessing
+di patterns.json.
+
+train.py --incremental hanya mem-preprocess pattern baru/berubah. Baris
+TF-IDF sengaja tidak di-cache: setiap perubahan data training mengubah idf
+sehingga semua baris harus di-transform ulang, dan fit_transform pada
+hasil preprocess jauh lebih murah daripada preprocess itu sendiri.
+Perubahan slang dict, stopwords atau kode preprocessor / slang normalizer
+mengubah signature sehingga semua hasil preprocess dihitung ulang.
+"""
+import hashlib
+import inspect
+import json
+import os
+
+
+CACHE_VERSION = 2
+PATTERNS_FILE = 'patterns.json'
+
+
+def pattern_fingerprint(text):
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+
+def file_sha1(filepath):
+    """SHA-1 isi file, None jika file tidak ada"""
+    if not os.path.exists(filepath):
+        return None
+
+    digest = hashlib.sha1()
+    with open(filepath, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def preprocess_signature(preprocessor):
+    """
+    Signature semua input yang mempengaruhi hasil preprocess: slang dict,
+    stopwords dan source code modul preprocessor serta slang normalizer
+    """
+    digest = hashlib.sha1()
+    digest.update(json.dumps(preprocessor.slang_dict, sort_keys=True).encode('utf-8'))
+    digest.update(json.dumps(sorted(preprocessor.stopwords_id)).encode('utf-8'))
+    digest.update(json.dumps(sorted(preprocessor.stopwords_en)).encode('utf-8'))
+
+    for source in (type(preprocessor), type(preprocessor.slang_normalizer)):
+        with open(inspect.getsourcefile(source), 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+class TrainingCache:
+    """Cache hasil preprocess per fingerprint pattern"""
+
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+        self.signature = None
+        self.processed = {}
+
+    @property
+    def patterns_path(self):
+        return os.path.join(self.cache_dir, PATTERNS_FILE)
+
+    def load(self):
+        """Load cache dari disk; cache rusak / versi lain dianggap kosong"""
+        if not os.path.exists(self.patterns_path):
+            return False
+
+        try:
+            with open(self.patterns_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') != CACHE_VERSION:
+                return False
+            signature, processed = data['preprocess_signature'], data['processed']
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Warning: Cache training tidak bisa dibaca, diabaikan: {e}")
+            return False
+
+        self.signature = signature
+        self.processed = processed
+        return True
+
+    def save(self, signature, processed):
+        """
+        Simpan cache untuk hasil training terbaru
+
+        Args:
+            signature: preprocess_signature() saat training
+            processed: Dict fingerprint -> hasil preprocess (pattern aktif saja)
+        """
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+        data = {
+            'version': CACHE_VERSION,
+            'preprocess_signature': signature,
+            'processed': processed,
+        }
+        # Tulis ke file sementara dulu supaya cache tidak setengah jadi
+        tmp_path = self.patterns_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, self.patterns_path)
+
+        self.signature = signature
+        self.processed = dict(processed)
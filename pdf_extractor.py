@@ -6,7 +6,9 @@ import re
 try:
     import PyPDF2
 except ImportError:
-    print("Install PyPDF2: pip install PyPDF2")
+    # Hanya dibutuhkan untuk extract_text_from_pdf; load_knowledge_base dan
+    # search_in_handbook tetap bisa dipakai tanpa PyPDF2
+    PyPDF2 = None
 
 from config import DOCS_DIR
 
@@ -20,6 +22,10 @@ def extract_text_from_pdf(pdf_path):
     Returns:
         String berisi semua text dari PDF
     """
+    if PyPDF2 is None:
+        print("Install PyPDF2: pip install PyPDF2")
+        return ""
+    
     try:
         with open(pdf_path, 'rb') as file:
             pdf_reader = PyPDF2.PdfReader(file)
@@ -134,41 +140,104 @@ def create_knowledge_base(pdf_path):
     
     return knowledge_base
 
-def search_in_handbook(query, knowledge_base):
+def split_passages(text, max_words=80):
+    """
+    Potong text menjadi passage ~max_words kata di batas kalimat
+    
+    clean_text() menggabungkan semua whitespace, sehingga tanpa ini seluruh
+    buku panduan menjadi satu paragraf.
+    """
+    # Hapus titik-titik daftar isi ("Sejarah ........ 1")
+    text = re.sub(r'(?:\.\s?){4,}\s*\d*', ' ', text)
+    sentences = re.split(r'(?<=[.!?])\s+', text)
+    
+    passages = []
+    current = []
+    length = 0
+    for sentence in sentences:
+        words = sentence.split()
+        # "Kalimat" tanpa titik (mis. daftar isi) dipotong per max_words kata
+        for start in range(0, len(words), max_words):
+            piece = words[start:start + max_words]
+            current.append(' '.join(piece))
+            length += len(piece)
+            if length >= max_words:
+                passages.append(' '.join(current))
+                current = []
+                length = 0
+    
+    if current:
+        passages.append(' '.join(current))
+    return passages
+
+def load_knowledge_base(text_file, max_words=80):
+    """
+    Knowledge base dari text hasil create_knowledge_base() tanpa parse PDF ulang
+    
+    Args:
+        text_file: File text hasil ekstraksi (buku_panduan_extracted.txt)
+        max_words: Panjang passage untuk search_in_handbook
+    
+    Returns:
+        Dictionary seperti create_knowledge_base(), cleaned_text berisi
+        passage yang dipisah baris kosong; None jika file tidak ada
+    """
+    if not os.path.exists(text_file):
+        return None
+    
+    with open(text_file, 'r', encoding='utf-8') as f:
+        text = f.read()
+    
+    passages = split_passages(text, max_words)
+    cleaned_text = '\n\n'.join(passages)
+    
+    return {
+        'raw_text': text,
+        'cleaned_text': cleaned_text,
+        'paragraphs': [passage.lower() for passage in passages],
+        'sections': extract_sections(text),
+        'total_chars': len(cleaned_text),
+        'total_words': len(cleaned_text.split())
+    }
+
+def search_in_handbook(query, knowledge_base, top_k=3, min_score=1):
     """
     Search informasi dalam buku panduan
     
     Args:
         query: Pertanyaan user
-        knowledge_base: Dictionary dari create_knowledge_base()
-        
+        knowledge_base: Dictionary dari create_knowledge_base() atau load_knowledge_base()
+        top_k: Jumlah paragraf yang dikembalikan
+        min_score: Minimal jumlah keyword yang harus ada di paragraf
+    
     Returns:
         Relevant text snippet
     """
     if not knowledge_base:
         return None
     
-    text = knowledge_base['cleaned_text'].lower()
     query_lower = query.lower()
     
     # Simple keyword search
     keywords = query_lower.split()
     
-    # Find paragraphs containing keywords
-    paragraphs = text.split('\n\n')
+    # Find paragraphs containing keywords (sudah huruf kecil jika dari load_knowledge_base)
+    paragraphs = knowledge_base.get('paragraphs')
+    if paragraphs is None:
+        paragraphs = knowledge_base['cleaned_text'].lower().split('\n\n')
     relevant = []
     
     for para in paragraphs:
         score = sum(1 for kw in keywords if kw in para)
-        if score > 0:
+        if score >= min_score and score > 0:
             relevant.append((score, para))
     
     # Sort by relevance
     relevant.sort(reverse=True, key=lambda x: x[0])
     
-    # Return top 3 paragraphs
+    # Return top paragraphs
     if relevant:
-        top_results = [para for _, para in relevant[:3]]
+        top_results = [para for _, para in relevant[:top_k]]
         return '\n\n'.join(top_results)
     
     return None
@@ -188,4 +257,4 @@ if __name__ == "__main__":
                 print(result[:500])
     else:
         print(f"PDF tidak ditemukan: {pdf_file}")
-        print("Letakkan buku panduan PDF di folder 'docs/'")
\ No newline at end of file
+        print("Letakkan buku panduan PDF di folder 'Docs/'")
\ No newline at end of file
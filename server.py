@@ -0,0 +1,75 @@
+"""
+UNKLAB Chatbot - HTTP API Server
+
+Endpoint:
+    POST /chat        {"message": "berapa biaya kuliah?"}
+    POST /chat/batch  {"messages": ["halo", "jadwal ujian"]}
+    GET  /health
+    GET  /metrics     (dengan --metrics)
+
+Contoh:
+    python server.py --port 8000
+    python server.py --prefork 4      # 4 worker process, model di-load sekali
+    python server.py --metrics        # histogram durasi per tahap di /metrics
+    curl -X POST localhost:8000/chat -d '{"message": "halo"}'
+"""
+import sys
+import os
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from config import (
+    SERVER_HOST, SERVER_PORT, SERVER_EXECUTOR, SERVER_WORKERS,
+    SERVER_COALESCE_MAX_WAIT_MS, SERVER_COALESCE_MAX_BATCH, SERVER_PREFORK_PROCESSES,
+    INSTRUMENTATION_ENABLED
+)
+from serving.http_server import run_server, EXECUTORS
+from serving.prefork import run_prefork
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="UNKLAB Chatbot HTTP API")
+    parser.add_argument('--host', default=SERVER_HOST, help='Alamat bind')
+    parser.add_argument('--port', type=int, default=SERVER_PORT, help='Port TCP')
+    parser.add_argument('--executor', choices=EXECUTORS, default=SERVER_EXECUTOR,
+                        help='Pool untuk inference (thread atau process)')
+    parser.add_argument('--workers', type=int, default=SERVER_WORKERS,
+                        help='Jumlah thread/process inference')
+    parser.add_argument('--coalesce-ms', type=float, default=SERVER_COALESCE_MAX_WAIT_MS,
+                        help='Jendela micro-batching /chat dalam ms (0 = nonaktif)')
+    parser.add_argument('--coalesce-batch', type=int, default=SERVER_COALESCE_MAX_BATCH,
+                        help='Maksimal pertanyaan per batch gabungan')
+    parser.add_argument('--prefork', type=int, default=SERVER_PREFORK_PROCESSES, metavar='N',
+                        help='Fork N worker process yang berbagi model dan socket '
+                             '(0 = satu process; reload otomatis saat file model berubah)')
+    parser.add_argument('--metrics', action='store_true', default=INSTRUMENTATION_ENABLED,
+                        help='Catat durasi per tahap pipeline dan per endpoint (GET /metrics)')
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+
+    print("\n" + "="*60)
+    print("🎓 UNKLAB CHATBOT - HTTP API")
+    print("="*60 + "\n")
+
+    server_kwargs = {
+        'coalesce_max_wait_ms': args.coalesce_ms,
+        'coalesce_max_batch': args.coalesce_batch,
+        'metrics': args.metrics,
+    }
+
+    try:
+        if args.prefork > 0:
+            run_prefork(host=args.host, port=args.port, processes=args.prefork,
+                        engine_kwargs={'instrumentation': args.metrics},
+                        server_kwargs=server_kwargs)
+        else:
+            run_server(host=args.host, port=args.port,
+                       executor=args.executor, workers=args.workers, **server_kwargs)
+    except Exception as e:
+        print(f"\n❌ Error: {e}")
+        print("\nPastikan sudah menjalankan: python train.py")
+        sys.exit(1)
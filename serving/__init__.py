@@ -0,0 +1,9 @@
+"""
+Serving package - HTTP API untuk UNKLAB Chatbot
+"""
+
+from .http_server import ChatServer, run_server
+from .coalescer import RequestCoalescer
+from .prefork import PreforkServer, run_prefork
+
+__all__ = ['ChatServer', 'run_server', 'RequestCoalescer', 'PreforkServer', 'run_prefork']
@@ -0,0 +1,95 @@
+"""
+Request coalescer (micro-batching) untuk traffic chat konkuren
+
+Pertanyaan yang datang hampir bersamaan dikumpulkan selama max_wait
+(atau sampai max_batch_size), lalu dijalankan sebagai satu batch lewat
+ChatEngine.respond_batch: satu vectorizer.transform + satu query KNN
+untuk semua pertanyaan, lalu buku panduan untuk hasil yang kurang
+yakin. Pada executor 'thread' server sudah menjawab tier exact / cache
+sebelum submit(), sehingga yang masuk batch hanya pertanyaan untuk KNN.
+Hasilnya dikembalikan ke masing-masing pemanggil lewat asyncio.Future.
+"""
+import asyncio
+
+
+class RequestCoalescer:
+    """Kumpulkan request tunggal menjadi batch untuk satu run_batch()"""
+
+    def __init__(self, run_batch, max_wait=0.002, max_batch_size=64):
+        """
+        Initialize coalescer (dipakai di dalam event loop asyncio)
+
+        Args:
+            run_batch: Coroutine function (messages) -> list hasil dengan
+                urutan sama dengan input
+            max_wait: Detik maksimal request pertama menunggu batch terisi
+            max_batch_size: Batch langsung dijalankan jika sudah sebanyak ini
+        """
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size minimal 1")
+
+        self.run_batch = run_batch
+        self.max_wait = max_wait
+        self.max_batch_size = max_batch_size
+
+        self._pending = []
+        self._flush_handle = None
+        self._running = set()
+
+        self.batch_count = 0
+        self.item_count = 0
+        self.max_seen_batch = 0
+
+    async def submit(self, message):
+        """Masukkan satu pertanyaan, tunggu hasilnya dari batch"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((message, future))
+
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.max_wait, self._flush)
+
+        return await future
+
+    def _flush(self):
+        """Jalankan semua request yang menunggu sebagai satu batch"""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+
+        # Batch berikutnya boleh mulai dikumpulkan selagi batch ini berjalan
+        task = asyncio.ensure_future(self._run(batch))
+        self._running.add(task)
+        task.add_done_callback(self._running.discard)
+
+    async def _run(self, batch):
+        self.batch_count += 1
+        self.item_count += len(batch)
+        self.max_seen_batch = max(self.max_seen_batch, len(batch))
+
+        try:
+            results = await self.run_batch([message for message, _ in batch])
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        # Future yang sudah dibatalkan (client putus) dilewati
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+    def stats(self):
+        return {
+            'batches': self.batch_count,
+            'items': self.item_count,
+            'mean_batch_size': self.item_count / self.batch_count if self.batch_count else 0.0,
+            'max_batch_size': self.max_seen_batch,
+        }
@@ -0,0 +1,478 @@
+"""
+HTTP API server (asyncio) untuk UNKLAB Chatbot
+
+Endpoint:
+    POST /chat        {"message": "..."}
+    POST /chat/batch  {"messages": ["...", ...]}
+    GET  /health
+    GET  /metrics     (format text Prometheus)
+
+Parsing HTTP dan I/O berjalan di event loop asyncio; preprocessing,
+vectorizer dan KNN (CPU) dijalankan di thread pool atau process pool
+supaya event loop tetap responsif. Koneksi HTTP/1.1 keep-alive dipakai
+ulang sampai client menutup atau idle melewati timeout.
+"""
+import asyncio
+import json
+import multiprocessing
+import os
+import signal
+import time
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from functools import partial
+
+from config import (
+    SERVER_HOST, SERVER_PORT, SERVER_EXECUTOR, SERVER_WORKERS,
+    SERVER_KEEP_ALIVE_TIMEOUT, SERVER_MAX_BODY_SIZE, SERVER_MAX_BATCH_SIZE,
+    SERVER_COALESCE_MAX_WAIT_MS, SERVER_COALESCE_MAX_BATCH, SERVER_SHUTDOWN_TIMEOUT,
+    INSTRUMENTATION_ENABLED
+)
+from models.chat_engine import ChatEngine
+from models.instrumentation import Instrumentation
+from .coalescer import RequestCoalescer
+
+
+EXECUTORS = ('thread', 'process')
+
+STATUS_REASONS = {
+    200: 'OK',
+    400: 'Bad Request',
+    404: 'Not Found',
+    405: 'Method Not Allowed',
+    408: 'Request Timeout',
+    411: 'Length Required',
+    413: 'Payload Too Large',
+    431: 'Request Header Fields Too Large',
+    500: 'Internal Server Error',
+    501: 'Not Implemented',
+}
+
+
+class HTTPError(Exception):
+    """Error yang dikirim ke client sebagai response JSON"""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+def answer_dict(answer):
+    """(response, tag, confidence, language) -> dict response JSON"""
+    response, tag, confidence, language = answer
+    return {
+        'response': response,
+        'tag': tag,
+        'confidence': confidence,
+        'language': language,
+    }
+
+
+def answer_messages(engine, messages, cache_checked=False):
+    """
+    Jawab list pertanyaan lewat cascade ChatEngine (satu query KNN)
+
+    Args:
+        cache_checked: True jika cache jawaban sudah dicek lewat
+            ChatEngine.respond_cached
+
+    Returns:
+        List dict {response, tag, confidence, language}
+    """
+    return [answer_dict(answer) for answer in engine.respond_batch(messages, cache_checked)]
+
+
+# Engine per process untuk executor 'process' (diisi oleh initializer)
+_process_engine = None
+
+
+def _init_process_worker(engine_kwargs):
+    global _process_engine
+    _process_engine = ChatEngine(**engine_kwargs).load().warmup()
+
+
+def _process_answer_messages(messages, cache_checked=False):
+    return answer_messages(_process_engine, messages, cache_checked)
+
+
+async def read_request(reader, max_body_size=SERVER_MAX_BODY_SIZE):
+    """
+    Baca satu HTTP request dari stream
+
+    Returns:
+        Tuple (method, path, version, headers, body), atau None jika
+        client menutup koneksi sebelum mengirim request baru
+    """
+    try:
+        head = await reader.readuntil(b'\r\n\r\n')
+    except asyncio.IncompleteReadError as e:
+        if not e.partial.strip():
+            return None
+        raise HTTPError(400, "Request tidak lengkap")
+    except asyncio.LimitOverrunError:
+        raise HTTPError(431, "Header terlalu besar")
+
+    lines = head.decode('latin-1').split('\r\n')
+    try:
+        method, target, version = lines[0].split(' ')
+    except ValueError:
+        raise HTTPError(400, "Request line tidak valid")
+
+    headers = {}
+    for line in lines[1:]:
+        if not line:
+            continue
+        name, _, value = line.partition(':')
+        headers[name.strip().lower()] = value.strip()
+
+    if 'chunked' in headers.get('transfer-encoding', '').lower():
+        raise HTTPError(501, "Transfer-Encoding chunked tidak didukung")
+
+    body = b''
+    if method in ('POST', 'PUT'):
+        if 'content-length' not in headers:
+            raise HTTPError(411, "Header Content-Length wajib diisi")
+        try:
+            length = int(headers['content-length'])
+        except ValueError:
+            raise HTTPError(400, "Content-Length tidak valid")
+        if length < 0:
+            raise HTTPError(400, "Content-Length tidak valid")
+        if length > max_body_size:
+            raise HTTPError(413, f"Body maksimal {max_body_size} byte")
+        try:
+            body = await reader.readexactly(length)
+        except asyncio.IncompleteReadError:
+            raise HTTPError(400, "Body tidak lengkap")
+
+    path = target.split('?', 1)[0]
+    return method, path, version, headers, body
+
+
+def wants_keep_alive(version, headers):
+    """HTTP/1.1 keep-alive secara default, HTTP/1.0 hanya jika diminta"""
+    connection = headers.get('connection', '').lower()
+    if version == 'HTTP/1.1':
+        return connection != 'close'
+    return connection == 'keep-alive'
+
+
+def build_response(status, payload, keep_alive):
+    """Serialisasi response lengkap dengan header (dict -> JSON, str -> text)"""
+    if isinstance(payload, str):
+        body = payload.encode('utf-8')
+        content_type = 'text/plain; version=0.0.4; charset=utf-8'
+    else:
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        content_type = 'application/json; charset=utf-8'
+    head = (
+        f"HTTP/1.1 {status} {STATUS_REASONS.get(status, '')}\r\n"
+        f"Content-Type: {content_type}\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+        f"\r\n"
+    )
+    return head.encode('latin-1') + body
+
+
+def parse_json(body):
+    try:
+        payload = json.loads(body.decode('utf-8'))
+    except (UnicodeDecodeError, json.JSONDecodeError):
+        raise HTTPError(400, "Body harus JSON yang valid")
+    if not isinstance(payload, dict):
+        raise HTTPError(400, "Body harus JSON object")
+    return payload
+
+
+class ChatServer:
+    """HTTP server asyncio dengan inference di thread/process pool"""
+
+    def __init__(self, host=SERVER_HOST, port=SERVER_PORT, executor=SERVER_EXECUTOR,
+                 workers=SERVER_WORKERS, keep_alive_timeout=SERVER_KEEP_ALIVE_TIMEOUT,
+                 max_batch_size=SERVER_MAX_BATCH_SIZE,
+                 coalesce_max_wait_ms=SERVER_COALESCE_MAX_WAIT_MS,
+                 coalesce_max_batch=SERVER_COALESCE_MAX_BATCH, engine_kwargs=None,
+                 engine=None, sock=None, metrics=INSTRUMENTATION_ENABLED):
+        """
+        Initialize server (belum listen, panggil start() / serve_forever())
+
+        Args:
+            host: Alamat bind
+            port: Port TCP (0 = pilih port kosong)
+            executor: 'thread' (satu engine dipakai bersama) atau 'process'
+                (satu engine per process, tidak terbatas GIL)
+            workers: Jumlah thread/process inference
+            keep_alive_timeout: Detik idle sebelum koneksi keep-alive ditutup
+            max_batch_size: Maksimal pesan per request /chat/batch
+            coalesce_max_wait_ms: Request /chat yang datang dalam jendela ini
+                digabung jadi satu batch inference (0 = nonaktif)
+            coalesce_max_batch: Maksimal pertanyaan per batch gabungan
+            engine_kwargs: Argumen tambahan untuk ChatEngine
+            engine: ChatEngine yang sudah di-load (executor 'thread'),
+                mis. milik parent pada mode prefork
+            sock: Listening socket yang sudah ada (host/port diabaikan)
+            metrics: Catat histogram durasi request per endpoint dan
+                aktifkan instrumentasi ChatEngine (ditampilkan di /metrics)
+        """
+        if executor not in EXECUTORS:
+            raise ValueError(f"Executor tidak dikenal: {executor} (pilih dari {EXECUTORS})")
+
+        self.host = host
+        self.port = port
+        self.executor_type = executor
+        self.workers = workers
+        self.keep_alive_timeout = keep_alive_timeout
+        self.max_batch_size = max_batch_size
+        self.coalesce_max_wait_ms = coalesce_max_wait_ms
+        self.coalesce_max_batch = coalesce_max_batch
+        self.engine_kwargs = dict(engine_kwargs or {})
+        self.engine_kwargs.setdefault('instrumentation', metrics)
+        self.metrics = (
+            Instrumentation('unklab_chatbot_http_request_duration_seconds', label='path')
+            if metrics else None
+        )
+
+        self.engine = engine
+        self.sock = sock
+        self.executor = None
+        self._answer = None
+        self.coalescer = None
+        self.server = None
+        self.started_at = None
+        self.request_count = 0
+        self.active_requests = 0
+
+    async def start(self):
+        """Load model, buat executor dan mulai listen"""
+        loop = asyncio.get_running_loop()
+
+        if self.executor_type == 'thread':
+            if self.engine is None:
+                self.engine = ChatEngine(**self.engine_kwargs).load().warmup()
+            self.executor = ThreadPoolExecutor(
+                max_workers=self.workers, thread_name_prefix='chat-inference'
+            )
+            self._answer = partial(answer_messages, self.engine)
+        else:
+            self.executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_init_process_worker,
+                initargs=(self.engine_kwargs,)
+            )
+            self._answer = _process_answer_messages
+            # Pastikan semua worker sudah load model sebelum menerima request
+            await asyncio.gather(*[
+                loop.run_in_executor(self.executor, self._answer, ['halo'])
+                for _ in range(self.workers)
+            ])
+
+        if self.coalesce_max_wait_ms > 0:
+            # Executor 'thread': cache jawaban sudah dicek handle_chat di
+            # event loop, yang masuk coalescer hanya cache miss
+            self.coalescer = RequestCoalescer(
+                partial(self.run_inference, cache_checked=self.executor_type == 'thread'),
+                max_wait=self.coalesce_max_wait_ms / 1000,
+                max_batch_size=self.coalesce_max_batch
+            )
+
+        if self.sock is not None:
+            self.server = await asyncio.start_server(self.handle_connection, sock=self.sock)
+        else:
+            self.server = await asyncio.start_server(self.handle_connection, self.host, self.port)
+        self.host, self.port = self.server.sockets[0].getsockname()[:2]
+        self.started_at = time.time()
+        return self
+
+    async def serve_forever(self):
+        if self.server is None:
+            await self.start()
+        print(f"Server berjalan di http://{self.host}:{self.port} "
+              f"({self.executor_type} x {self.workers})")
+
+        # SIGTERM (mis. dari process manager) dihentikan rapi seperti Ctrl+C
+        loop = asyncio.get_running_loop()
+        serving = asyncio.ensure_future(self.server.serve_forever())
+        try:
+            loop.add_signal_handler(signal.SIGTERM, serving.cancel)
+        except (NotImplementedError, AttributeError):
+            pass
+
+        try:
+            await serving
+        except asyncio.CancelledError:
+            pass
+        finally:
+            # Berhenti menerima koneksi baru, selesaikan request yang sedang jalan
+            self.server.close()
+            await self.wait_for_active_requests(SERVER_SHUTDOWN_TIMEOUT)
+            self.close()
+
+    async def wait_for_active_requests(self, timeout):
+        deadline = time.time() + timeout
+        while self.active_requests and time.time() < deadline:
+            await asyncio.sleep(0.05)
+
+    def close(self):
+        """
+        Berhenti listen dan matikan executor (worker process ikut berhenti),
+        lalu simpan cache stemming engine
+        """
+        if self.server is not None:
+            self.server.close()
+        if self.executor is not None:
+            self.executor.shutdown(wait=True, cancel_futures=True)
+            self.executor = None
+        if self.engine is not None:
+            self.engine.close()
+
+    async def handle_connection(self, reader, writer):
+        """Layani request berurutan pada satu koneksi (keep-alive)"""
+        try:
+            while True:
+                try:
+                    request = await asyncio.wait_for(
+                        read_request(reader), timeout=self.keep_alive_timeout
+                    )
+                except asyncio.TimeoutError:
+                    break
+                except HTTPError as e:
+                    writer.write(build_response(e.status, {'error': e.message}, False))
+                    await writer.drain()
+                    break
+
+                if request is None:
+                    break
+
+                method, path, version, headers, body = request
+                keep_alive = wants_keep_alive(version, headers)
+
+                self.active_requests += 1
+                try:
+                    status, payload = await self.dispatch(method, path, body)
+                    writer.write(build_response(status, payload, keep_alive))
+                    await writer.drain()
+                finally:
+                    self.active_requests -= 1
+
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def dispatch(self, method, path, body):
+        """Routing request ke handler, error dikonversi ke response JSON"""
+        self.request_count += 1
+        routes = {
+            '/chat': ('POST', self.handle_chat),
+            '/chat/batch': ('POST', self.handle_chat_batch),
+            '/health': ('GET', self.handle_health),
+            '/metrics': ('GET', self.handle_metrics),
+        }
+        start = time.perf_counter() if self.metrics is not None else None
+
+        try:
+            if path not in routes:
+                raise HTTPError(404, f"Endpoint tidak ditemukan: {path}")
+            allowed_method, handler = routes[path]
+            if method != allowed_method:
+                raise HTTPError(405, f"Gunakan {allowed_method} untuk {path}")
+            return 200, await handler(body)
+        except HTTPError as e:
+            return e.status, {'error': e.message}
+        except Exception as e:
+            print(f"ERROR: Request {method} {path} gagal: {e}")
+            return 500, {'error': "Terjadi kesalahan pada server"}
+        finally:
+            if start is not None:
+                # Path tidak dikenal digabung supaya label tidak tumbuh tanpa batas
+                self.metrics.record(path if path in routes else 'other',
+                                    time.perf_counter() - start)
+
+    async def run_inference(self, messages, cache_checked=False):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, self._answer, messages, cache_checked)
+
+    async def handle_chat(self, body):
+        """
+        Executor 'thread': cache hit dijawab langsung di event loop (tanpa
+        menunggu jendela coalescer); tier exact (butuh preprocess) dan KNN
+        dijalankan di executor
+        """
+        message = parse_json(body).get('message')
+        if not isinstance(message, str) or not message.strip():
+            raise HTTPError(400, "Field 'message' wajib berupa string tidak kosong")
+
+        cache_checked = False
+        if self.executor_type == 'thread':
+            answer = self.engine.respond_cached(message)
+            if answer is not None:
+                return answer_dict(answer)
+            cache_checked = True
+
+        if self.coalescer is not None:
+            return await self.coalescer.submit(message)
+
+        results = await self.run_inference([message], cache_checked)
+        return results[0]
+
+    async def handle_chat_batch(self, body):
+        messages = parse_json(body).get('messages')
+        if not isinstance(messages, list) or not messages or not all(
+                isinstance(m, str) and m.strip() for m in messages):
+            raise HTTPError(400, "Field 'messages' wajib berupa list string tidak kosong")
+        if len(messages) > self.max_batch_size:
+            raise HTTPError(413, f"Maksimal {self.max_batch_size} pesan per batch")
+
+        return {'results': await self.run_inference(messages)}
+
+    async def handle_metrics(self, body):
+        """
+        Metric format Prometheus. Metric tier cascade dan histogram tahap
+        ChatEngine hanya tersedia untuk executor 'thread' (engine ada di
+        process ini); pada mode prefork setiap worker melaporkan metric-nya
+        sendiri.
+        """
+        lines = [
+            "# TYPE unklab_chatbot_http_requests_total counter",
+            f"unklab_chatbot_http_requests_total {self.request_count}",
+            "# TYPE unklab_chatbot_uptime_seconds gauge",
+            f"unklab_chatbot_uptime_seconds {time.time() - self.started_at:.3f}",
+        ]
+        text = '\n'.join(lines) + '\n'
+
+        if self.metrics is not None:
+            text += self.metrics.prometheus_text()
+        if self.engine is not None:
+            text += self.engine.cascade.prometheus_text()
+            if self.engine.instrumentation is not None:
+                text += self.engine.instrumentation.prometheus_text()
+        return text
+
+    async def handle_health(self, body):
+        return {
+            'status': 'ok',
+            'pid': os.getpid(),
+            'executor': self.executor_type,
+            'workers': self.workers,
+            'uptime': round(time.time() - self.started_at, 3),
+            'requests': self.request_count,
+            'coalescer': self.coalescer.stats() if self.coalescer is not None else None,
+        }
+
+
+def run_server(host=SERVER_HOST, port=SERVER_PORT, executor=SERVER_EXECUTOR,
+               workers=SERVER_WORKERS, **kwargs):
+    """Jalankan ChatServer sampai dihentikan (Ctrl+C)"""
+    server = ChatServer(host=host, port=port, executor=executor, workers=workers, **kwargs)
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        print("\nServer dihentikan")
@@ -0,0 +1,233 @@
+"""
+Pre-fork serving: model di-load sekali, worker process berbagi memory
+
+Parent me-load ChatEngine (vectorizer + KNN lewat model bundle atau
+TextVectorizer.load / KNNClassifier.load, stopwords dan stemmer), membuka
+satu listening socket, lalu fork N worker. Worker mewarisi engine secara
+copy-on-write dan masing-masing menjalankan ChatServer sendiri di socket
+yang sama, sehingga preprocessing dan TF-IDF tidak lagi dibatasi satu GIL.
+
+Parent memantau file model; jika berubah (mis. setelah train.py), engine
+baru di-load, generasi worker baru di-fork, lalu worker lama dihentikan
+dengan SIGTERM setelah menyelesaikan request yang sedang berjalan.
+SIGHUP memaksa reload, SIGTERM / Ctrl+C menghentikan semua worker.
+
+Hanya POSIX (butuh os.fork).
+"""
+import asyncio
+import os
+import signal
+import socket
+import time
+import traceback
+
+from config import (
+    MODEL_FILE, VECTORIZER_FILE, LABEL_ENCODER_FILE, MODEL_BUNDLE_DIR,
+    SERVER_HOST, SERVER_PORT, SERVER_PREFORK_PROCESSES, SERVER_RELOAD_INTERVAL,
+    SERVER_SHUTDOWN_TIMEOUT
+)
+from models.chat_engine import ChatEngine
+from models.model_bundle import manifest_path
+from .http_server import ChatServer
+
+
+DEFAULT_WATCH_FILES = (
+    MODEL_FILE, VECTORIZER_FILE, LABEL_ENCODER_FILE, manifest_path(MODEL_BUNDLE_DIR)
+)
+
+
+def model_fingerprint(paths):
+    """Tuple (path, mtime) file model; file yang tidak ada bernilai None"""
+    fingerprint = []
+    for path in paths:
+        try:
+            fingerprint.append((path, os.stat(path).st_mtime_ns))
+        except FileNotFoundError:
+            fingerprint.append((path, None))
+    return tuple(fingerprint)
+
+
+class PreforkServer:
+    """Parent process: load model, fork worker, reload saat model berubah"""
+
+    def __init__(self, host=SERVER_HOST, port=SERVER_PORT, processes=SERVER_PREFORK_PROCESSES,
+                 reload_interval=SERVER_RELOAD_INTERVAL, watch_files=DEFAULT_WATCH_FILES,
+                 engine_kwargs=None, server_kwargs=None):
+        """
+        Initialize prefork server
+
+        Args:
+            host: Alamat bind
+            port: Port TCP
+            processes: Jumlah worker process
+            reload_interval: Detik antar pengecekan perubahan file model
+            watch_files: File model yang dipantau untuk reload
+            engine_kwargs: Argumen tambahan untuk ChatEngine
+            server_kwargs: Argumen tambahan untuk ChatServer di setiap worker
+        """
+        if processes < 1:
+            raise ValueError("processes minimal 1")
+
+        self.host = host
+        self.port = port
+        self.processes = processes
+        self.reload_interval = reload_interval
+        self.watch_files = tuple(watch_files)
+        self.engine_kwargs = engine_kwargs or {}
+        self.server_kwargs = server_kwargs or {}
+
+        self.sock = None
+        self.engine = None
+        self.generation = 0
+        self.workers = {}  # pid -> generation
+        self.stopping = False
+        self.reload_requested = False
+
+    def load_engine(self):
+        return ChatEngine(**self.engine_kwargs).load().warmup()
+
+    def run(self):
+        """Jalankan parent loop sampai SIGTERM / Ctrl+C"""
+        if not hasattr(os, 'fork'):
+            raise RuntimeError("Mode prefork butuh os.fork (Linux/macOS)")
+
+        self.engine = self.load_engine()
+        fingerprint = model_fingerprint(self.watch_files)
+
+        self.sock = socket.create_server((self.host, self.port), backlog=1024)
+        self.port = self.sock.getsockname()[1]
+
+        signal.signal(signal.SIGTERM, self._handle_stop)
+        signal.signal(signal.SIGINT, self._handle_stop)
+        signal.signal(signal.SIGHUP, self._handle_reload)
+
+        print(f"Prefork server di http://{self.host}:{self.port} "
+              f"({self.processes} worker, parent pid {os.getpid()})")
+        self.spawn_generation()
+
+        pending_fingerprint = None
+        try:
+            while not self.stopping:
+                self.sleep(self.reload_interval)
+                self.reap_workers()
+
+                current = model_fingerprint(self.watch_files)
+                if self.reload_requested:
+                    self.reload_requested = False
+                    fingerprint = current
+                    self.reload()
+                elif current != fingerprint:
+                    # Tunggu satu interval tanpa perubahan (train.py mungkin masih menulis)
+                    if current == pending_fingerprint:
+                        fingerprint = current
+                        pending_fingerprint = None
+                        print("File model berubah, reload...")
+                        self.reload()
+                    else:
+                        pending_fingerprint = current
+        finally:
+            self.stop_workers(list(self.workers))
+            self.sock.close()
+
+    def sleep(self, seconds):
+        """Sleep yang segera berhenti saat ada sinyal stop/reload"""
+        deadline = time.time() + seconds
+        while time.time() < deadline and not (self.stopping or self.reload_requested):
+            time.sleep(0.1)
+
+    def _handle_stop(self, signum, frame):
+        self.stopping = True
+
+    def _handle_reload(self, signum, frame):
+        self.reload_requested = True
+
+    def spawn_generation(self):
+        self.generation += 1
+        for _ in range(self.processes):
+            self.spawn_worker()
+
+    def spawn_worker(self):
+        pid = os.fork()
+        if pid:
+            self.workers[pid] = self.generation
+            return pid
+
+        # Child: parent yang mengatur shutdown lewat SIGTERM
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+        signal.signal(signal.SIGHUP, signal.SIG_IGN)
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+
+        exit_code = 0
+        try:
+            server = ChatServer(
+                executor='thread', workers=1, engine=self.engine, sock=self.sock,
+                **self.server_kwargs
+            )
+            asyncio.run(server.serve_forever())
+        except BaseException:
+            traceback.print_exc()
+            exit_code = 1
+        finally:
+            os._exit(exit_code)
+
+    def reload(self):
+        """Load engine baru, fork generasi baru, hentikan generasi lama"""
+        try:
+            engine = self.load_engine()
+        except Exception as e:
+            print(f"ERROR: Reload model gagal, worker lama tetap dipakai: {e}")
+            return
+
+        old_workers = list(self.workers)
+        self.engine = engine
+        self.spawn_generation()
+        self.stop_workers(old_workers, wait=False)
+        print(f"Reload selesai (generasi {self.generation})")
+
+    def reap_workers(self):
+        """Bersihkan worker yang sudah exit, ganti worker generasi aktif yang mati"""
+        while self.workers:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if pid == 0:
+                return
+
+            generation = self.workers.pop(pid, None)
+            if generation == self.generation and not self.stopping:
+                print(f"Warning: Worker {pid} berhenti (status {status}), menjalankan pengganti")
+                self.spawn_worker()
+
+    def stop_workers(self, pids, wait=True):
+        """Kirim SIGTERM; jika wait, tunggu (lalu SIGKILL setelah timeout)"""
+        for pid in pids:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                self.workers.pop(pid, None)
+
+        if not wait:
+            return
+
+        deadline = time.time() + SERVER_SHUTDOWN_TIMEOUT + 1
+        remaining = [pid for pid in pids if pid in self.workers]
+        while remaining and time.time() < deadline:
+            for pid in list(remaining):
+                try:
+                    done, _ = os.waitpid(pid, os.WNOHANG)
+                except ChildProcessError:
+                    done = pid
+                if done:
+                    remaining.remove(pid)
+                    self.workers.pop(pid, None)
+            time.sleep(0.05)
+
+        for pid in remaining:
+            os.kill(pid, signal.SIGKILL)
+            os.waitpid(pid, 0)
+            self.workers.pop(pid, None)
+
+
+def run_prefork(host=SERVER_HOST, port=SERVER_PORT, processes=SERVER_PREFORK_PROCESSES, **kwargs):
+    PreforkServer(host=host, port=port, processes=processes, **kwargs).run()
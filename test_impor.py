@@ -36,12 +36,26 @@ except Exception as e:
     print(f"   ✗ KNNClassifier ERROR: {e}")
 
 try:
-    print("\n5. Testing utils.accuracy_calculator...")
+    print("\n5. Testing models.chat_engine...")
+    from models.chat_engine import ChatEngine
+    print("   ✓ ChatEngine OK")
+except Exception as e:
+    print(f"   ✗ ChatEngine ERROR: {e}")
+
+try:
+    print("\n6. Testing utils.accuracy_calculator...")
     from utils.accuracy_calculator import AccuracyCalculator
     print("   ✓ AccuracyCalculator OK")
 except Exception as e:
     print(f"   ✗ AccuracyCalculator ERROR: {e}")
 
+try:
+    print("\n7. Testing serving.http_server...")
+    from serving.http_server import ChatServer
+    print("   ✓ ChatServer OK")
+except Exception as e:
+    print(f"   ✗ ChatServer ERROR: {e}")
+
 print("\n" + "="*60)
 print("Import test completed!")
 print("="*60)
\ No newline at end of file
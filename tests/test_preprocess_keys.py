@@ -0,0 +1,55 @@
+"""
+Key preprocess saat training (train.py) harus identik dengan saat serving
+(ChatEngine), supaya tier exact-match dan fitur TF-IDF cocok
+
+Jalankan: python -m pytest tests
+"""
+import sys
+import os
+import json
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import INTENTS_FILE
+from models.chat_engine import ChatEngine
+from models.preprocessor import TextPreprocessor
+from train import preprocess_pattern
+
+
+# Bahasa hasil deteksi pada text mentah berbeda dengan setelah normalize()
+# (slang 'gk' -> 'tidak', tanda baca menempel pada 'apa?'), sehingga
+# stemming hanya jalan jika bahasa dideteksi dari hasil normalize()
+MIXED_QUESTIONS = [
+    "gk bisa mendaftar to portal",
+    "Apa? What is pendaftaran",
+    "Makasih, where is the library?",
+]
+
+
+@pytest.fixture(scope='module')
+def engine():
+    return ChatEngine(cascade_tiers=('knn',)).load()
+
+
+def training_patterns():
+    with open(INTENTS_FILE, 'r', encoding='utf-8') as f:
+        intents = json.load(f)['intents']
+    return [pattern for intent in intents for pattern in intent['patterns']]
+
+
+def test_mixed_questions_change_language_after_normalize():
+    preprocessor = TextPreprocessor()
+    changed = [
+        text for text in MIXED_QUESTIONS
+        if preprocessor.detect_language(text) != preprocessor.preprocess_for_model(text)[1]
+    ]
+    assert changed
+
+
+def test_train_and_serve_keys_identical(engine):
+    # Preprocessor engine dipakai juga untuk sisi training supaya cache
+    # stemming terisi sekali (hasil stemming tidak bergantung cache)
+    for text in training_patterns() + MIXED_QUESTIONS:
+        assert preprocess_pattern(engine.preprocessor, text) == engine.preprocess(text)[0], text
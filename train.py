@@ -1,18 +1,40 @@
 """
 Script training model UNKLAB Chatbot
+
+Jalankan: python train.py [--jobs N] [--incremental]
+
+Mode --incremental memakai cache di TRAIN_CACHE_DIR: hanya pattern
+baru/berubah yang di-preprocess. Vectorizer selalu di-fit dan transform
+ulang pada semua hasil preprocess (idf berubah setiap data berubah).
+
+Jika LATENT_DIM > 0, TruncatedSVD (LatentProjector) di-fit pada matrix
+TF-IDF dan KNN di-train pada vektor laten.
 """
+import argparse
 import json
+import math
 import os
+import time
+from concurrent.futures import ProcessPoolExecutor
 from sklearn.model_selection import train_test_split
 
 from config import (
     INTENTS_FILE, MODEL_FILE, VECTORIZER_FILE, 
     LABEL_ENCODER_FILE, KNN_NEIGHBORS, KNN_METRIC,
-    VECTORIZER_MAX_FEATURES, TEST_SIZE, RANDOM_STATE,STOP_WORDS
+    VECTORIZER_MAX_FEATURES, TEST_SIZE, RANDOM_STATE,STOP_WORDS,
+    VECTORIZER_MODE, VECTORIZER_HASH_FEATURES, LATENT_DIM, LATENT_FILE,
+    STEM_CACHE_FILE, STEM_CACHE_MAX_SIZE, MODEL_BUNDLE_DIR, TRAIN_JOBS,
+    TRAIN_CACHE_DIR, EXACT_MATCH_FILE
 )
-from models.preprocessor import TextPreprocessor
+from models.preprocessor import TextPreprocessor, download_nltk_data
 from models.text_vectorizer import TextVectorizer
 from models.knn_classifier import KNNClassifier
+from models.latent_projector import LatentProjector
+from models.model_bundle import save_bundle
+from models.exact_match import ExactMatchIndex
+from models.training_cache import (
+    TrainingCache, pattern_fingerprint, preprocess_signature, file_sha1
+)
 from utils.accuracy_calculator import AccuracyCalculator
 
 def load_intents(filepath):
@@ -44,7 +66,86 @@ def prepare_training_data(intents_data):
     
     return X, y
 
-def train_model():
+# Preprocessor milik worker process (dibuat sekali oleh _init_preprocess_worker)
+_worker_preprocessor = None
+_worker_known_stems = set()
+
+def resolve_jobs(jobs):
+    """0 / None = semua core yang boleh dipakai process ini"""
+    if not jobs:
+        if hasattr(os, 'sched_getaffinity'):
+            return len(os.sched_getaffinity(0))
+        return os.cpu_count() or 1
+    return max(1, jobs)
+
+def preprocess_pattern(preprocessor, text):
+    """
+    Preprocessing satu pattern training, sama persis dengan pertanyaan user
+    di ChatEngine (bahasa dideteksi setelah normalisasi slang)
+    """
+    return preprocessor.preprocess_for_model(text)[0]
+
+def _init_preprocess_worker(stem_table):
+    global _worker_preprocessor, _worker_known_stems
+    _worker_preprocessor = TextPreprocessor(stem_cache_size=STEM_CACHE_MAX_SIZE)
+    for word, stem in stem_table.items():
+        _worker_preprocessor.stem_cache.put(word, stem)
+    _worker_known_stems = set(stem_table)
+
+def _preprocess_chunk(texts):
+    """
+    Jalankan di worker: preprocess satu chunk
+    
+    Returns:
+        (hasil preprocess, stem baru [(kata, stem)], hits, misses) supaya
+        parent bisa menggabungkan cache stemming semua worker
+    """
+    preprocessor = _worker_preprocessor
+    cache = preprocessor.stem_cache
+    cache.hits = cache.misses = 0
+    
+    processed = [preprocess_pattern(preprocessor, text) for text in texts]
+    
+    new_stems = [(word, stem) for word, stem in cache.items() if word not in _worker_known_stems]
+    _worker_known_stems.update(word for word, _ in new_stems)
+    return processed, new_stems, cache.hits, cache.misses
+
+def preprocess_patterns(texts, preprocessor, jobs=1, chunk_size=None):
+    """
+    Preprocess semua pattern, paralel jika jobs > 1
+    
+    Setiap worker membuat TextPreprocessor (stopwords, stemmer Sastrawi)
+    sekali lalu memproses chunk teks; urutan hasil sama dengan input.
+    Stem baru dari worker digabung ke preprocessor.stem_cache.
+    
+    Args:
+        texts: List teks mentah
+        preprocessor: TextPreprocessor parent (sumber & tujuan cache stemming)
+        jobs: Jumlah worker process (1 = serial di process ini)
+        chunk_size: Teks per task (default: dibagi rata ~4 chunk per worker)
+    """
+    jobs = min(resolve_jobs(jobs), len(texts) or 1)
+    if jobs == 1:
+        return [preprocess_pattern(preprocessor, text) for text in texts]
+    
+    chunk_size = chunk_size or math.ceil(len(texts) / (jobs * 4))
+    chunks = [texts[i:i + chunk_size] for i in range(0, len(texts), chunk_size)]
+    stem_table = dict(preprocessor.stem_cache.items())
+    cache = preprocessor.stem_cache
+    
+    X_processed = []
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_preprocess_worker,
+                             initargs=(stem_table,)) as executor:
+        for processed, new_stems, hits, misses in executor.map(_preprocess_chunk, chunks):
+            X_processed.extend(processed)
+            for word, stem in new_stems:
+                cache.put(word, stem)
+            cache.hits += hits
+            cache.misses += misses
+    
+    return X_processed
+
+def train_model(jobs=TRAIN_JOBS, incremental=False):
     print("\n" + "="*60)
     print("TRAINING UNKLAB CHATBOT MODEL")
     print("="*60)
@@ -55,34 +156,59 @@ def train_model():
     # Prepare data
     X_raw, y = prepare_training_data(intents_data)
     
+    # Cache training (hanya dibaca pada mode incremental, selalu ditulis ulang)
+    cache = TrainingCache(TRAIN_CACHE_DIR)
+    if incremental and not cache.load():
+        print("\nCache training belum ada, training penuh")
+    
     # Preprocess
-    print("\n[1/5] Preprocessing text...")
-    preprocessor = TextPreprocessor()
-    X_processed = []
+    jobs = resolve_jobs(jobs)
+    print(f"\n[1/5] Preprocessing text ({jobs} process)...")
+    download_nltk_data()
+    preprocessor = TextPreprocessor(stem_cache_size=STEM_CACHE_MAX_SIZE)
+    preprocessor.load_stem_cache(STEM_CACHE_FILE)
+    
+    start = time.perf_counter()
+    signature = preprocess_signature(preprocessor)
+    known = cache.processed if cache.signature == signature else {}
+    fingerprints = [pattern_fingerprint(text) for text in X_raw]
+    
+    todo = {}
+    for fp, text in zip(fingerprints, X_raw):
+        if fp not in known:
+            todo.setdefault(fp, text)
     
-    for text in X_raw:
-        lang = preprocessor.detect_language(text)
-        processed = preprocessor.preprocess(
-            text, 
-            remove_stopwords=True,
-            apply_stemming=(lang == 'id'),
-            language=lang
-        )
-        X_processed.append(processed)
+    processed = {fp: known[fp] for fp in fingerprints if fp in known}
+    reused = len(processed)
+    processed.update(zip(todo, preprocess_patterns(list(todo.values()), preprocessor, jobs=jobs)))
+    X_processed = [processed[fp] for fp in fingerprints]
     
-    print(f"✓ Preprocessed {len(X_processed)} texts")
+    print(f"✓ Preprocessed {len(todo)} texts unik, {reused} dari cache "
+          f"({time.perf_counter() - start:.2f}s)")
+    print(f"✓ Stem cache hit rate: {preprocessor.stem_cache.hit_rate:.1%}")
+    preprocessor.save_stem_cache(STEM_CACHE_FILE)
     
     # Vectorize
     print("\n[2/5] Vectorizing text...")
-    vectorizer = TextVectorizer(max_features=VECTORIZER_MAX_FEATURES,stop_words=STOP_WORDS) 
+    vectorizer = TextVectorizer(max_features=VECTORIZER_MAX_FEATURES,stop_words=STOP_WORDS,
+                                mode=VECTORIZER_MODE, n_features=VECTORIZER_HASH_FEATURES)
     X_vectors = vectorizer.fit_transform(X_processed)
     
     print(f"✓ Feature matrix: {X_vectors.shape}")
     
+    # Proyeksi laten opsional: KNN di ruang TruncatedSVD dense float32
+    projector = None
+    X_features = X_vectors
+    if LATENT_DIM:
+        projector = LatentProjector(n_components=LATENT_DIM, random_state=RANDOM_STATE)
+        X_features = projector.fit_transform(X_vectors)
+        print(f"✓ Latent matrix: {X_features.shape} "
+              f"(explained variance {projector.explained_variance_ratio:.1%})")
+    
     # Split
     print("\n[3/5] Splitting data...")
     X_train, X_test, y_train, y_test = train_test_split(
-        X_vectors, y, 
+        X_features, y, 
         test_size=TEST_SIZE, 
         random_state=RANDOM_STATE,
         stratify=y
@@ -112,6 +238,24 @@ def train_model():
     print("Saving model...")
     vectorizer.save(VECTORIZER_FILE)
     knn.save(MODEL_FILE, LABEL_ENCODER_FILE)
+    # Projector, bundle dan index exact-match mencatat SHA-1 model supaya
+    # ChatEngine bisa mengenali file dari training lain; projector dari
+    # training sebelumnya dihapus jika LATENT_DIM dimatikan
+    model_sha1 = file_sha1(MODEL_FILE)
+    if projector is not None:
+        projector.save(LATENT_FILE, model_sha1=model_sha1)
+    elif os.path.exists(LATENT_FILE):
+        os.remove(LATENT_FILE)
+        print(f"Latent projector lama dihapus: {LATENT_FILE}")
+    save_bundle(MODEL_BUNDLE_DIR, vectorizer, knn, projector,
+                source_files=(MODEL_FILE, VECTORIZER_FILE, LABEL_ENCODER_FILE, LATENT_FILE))
+    
+    # Index exact-match dari semua pattern
+    exact_match = ExactMatchIndex.build(X_processed, y)
+    exact_match.save(EXACT_MATCH_FILE, model_sha1=model_sha1)
+    print(f"✓ Exact-match: {len(exact_match)} pattern unik, "
+          f"{exact_match.ambiguous} ambigu (diserahkan ke KNN)")
+    cache.save(signature, processed)
     
     print("\n" + "="*60)
     print("🎓 UNKLAB CHATBOT TRAINING COMPLETED!")
@@ -121,10 +265,22 @@ def train_model():
     print(f"  - {MODEL_FILE}")
     print(f"  - {VECTORIZER_FILE}")
     print(f"  - {LABEL_ENCODER_FILE}")
+    if projector is not None:
+        print(f"  - {LATENT_FILE}")
+    print(f"  - {MODEL_BUNDLE_DIR}")
+    print(f"  - {EXACT_MATCH_FILE}")
+    print(f"  - {TRAIN_CACHE_DIR}")
     print("\n🚀 Jalankan: python main.py")
     print("="*60 + "\n")
     
     return knn, vectorizer, metrics
 
 if __name__ == "__main__":
-    train_model()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Training model UNKLAB Chatbot")
+    parser.add_argument('--jobs', '-j', type=int, default=TRAIN_JOBS,
+                        help='Jumlah process untuk preprocessing (0 = semua core, 1 = serial)')
+    parser.add_argument('--incremental', '-i', action='store_true',
+                        help='Hanya proses pattern baru/berubah (pakai cache training)')
+    args = parser.parse_args()
+    
+    train_model(jobs=args.jobs, incremental=args.incremental)
\ No newline at end of file
@@ -3,21 +3,18 @@ UNKLAB Chatbot GUI - Enhanced Version
 """
 import tkinter as tk
 from tkinter import scrolledtext, messagebox
-import json
 import os
+import queue
 import threading
 from datetime import datetime
 
 from config import (
-    INTENTS_FILE, MODEL_FILE, VECTORIZER_FILE, 
-    LABEL_ENCODER_FILE, WINDOW_TITLE, WINDOW_SIZE,
+    WINDOW_TITLE, WINDOW_SIZE,
     CHAT_FONT, INPUT_FONT, STT_LANGUAGE_ID, STT_LANGUAGE_EN,
     TTS_LANGUAGE_ID, TTS_LANGUAGE_EN, HEADER_COLOR, ACCENT_COLOR,
     KAMPUS_NAME, KAMPUS_TAGLINE
 )
-from models.preprocessor import TextPreprocessor
-from models.text_vectorizer import TextVectorizer
-from models.knn_classifier import KNNClassifier
+from models.chat_engine import ChatEngine
 from utils.speech_recognition import SpeechRecognizer
 from utils.text_to_speech import TextToSpeech
 
@@ -34,9 +31,16 @@ class UnklabChatbotGUI:
         self.voice_enabled = True
         self.is_listening = False
         
+        # Inference berjalan di worker thread supaya event loop Tk tidak freeze
+        self.request_queue = queue.Queue()
+        self.latest_request_id = 0
+        self.typing_visible = False
+        
         self.load_models()
         self.init_voice_components()
         self.create_widgets()
+        self.start_inference_worker()
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
         
         # Welcome message
         welcome_msg = f"""
@@ -58,16 +62,7 @@ Tanyakan apa saja atau klik 🎤 untuk voice input!
         print("Loading UNKLAB Chatbot models...")
         
         try:
-            with open(INTENTS_FILE, 'r', encoding='utf-8') as f:
-                self.intents_data = json.load(f)
-            
-            self.vectorizer = TextVectorizer()
-            self.vectorizer.load(VECTORIZER_FILE)
-            
-            self.knn = KNNClassifier()
-            self.knn.load(MODEL_FILE, LABEL_ENCODER_FILE)
-            
-            self.preprocessor = TextPreprocessor()
+            self.engine = ChatEngine().load()
             
             print("✓ Models loaded successfully!")
             
@@ -200,6 +195,10 @@ Tanyakan apa saja atau klik 🎤 untuk voice input!
             foreground='#424242', 
             font=("Segoe UI", 10)
         )
+        self.chat_display.tag_config('typing', 
+            foreground='#9E9E9E', 
+            font=("Segoe UI", 9, "italic")
+        )
         
         # Input frame
         input_container = tk.Frame(self.root, bg='#f5f5f5')
@@ -323,6 +322,32 @@ Tanyakan apa saja atau klik 🎤 untuk voice input!
         finally:
             self.root.after(0, self.stop_listening)
     
+    def start_inference_worker(self):
+        thread = threading.Thread(target=self.inference_worker, daemon=True)
+        thread.start()
+    
+    def inference_worker(self):
+        # Warmup (stopwords, stemmer) di background, bukan di event loop Tk
+        try:
+            self.engine.warmup()
+        except Exception as e:
+            print(f"Warning: Warmup gagal: {e}")
+        
+        while True:
+            request_id, user_text = self.request_queue.get()
+            
+            # Lewati request lama jika user sudah mengirim pesan baru
+            if request_id != self.latest_request_id:
+                continue
+            
+            response, confidence = self.get_bot_response(user_text)
+            self.root.after(0, self.on_bot_response, request_id, response, confidence)
+
+    def on_close(self):
+        # Simpan stem baru dari sesi ini supaya start berikutnya tetap cepat
+        self.engine.close()
+        self.root.destroy()
+
     def send_message(self):
         user_text = self.user_input.get().strip()
         
@@ -330,11 +355,24 @@ Tanyakan apa saja atau klik 🎤 untuk voice input!
             return
         
         self.user_input.delete(0, tk.END)
+        
+        # Pesan baru membatalkan request sebelumnya yang belum dijawab
+        self.latest_request_id += 1
+        self.hide_typing_indicator()
         self.add_user_message(user_text)
+        self.show_typing_indicator()
         
-        # Get response
-        response, confidence = self.get_bot_response(user_text)
+        # Get response (di worker thread)
+        self.request_queue.put((self.latest_request_id, user_text))
+    
+    def on_bot_response(self, request_id, response, confidence):
+        # Jawaban untuk request yang sudah dibatalkan diabaikan
+        if request_id != self.latest_request_id:
+            return
+        
+        self.hide_typing_indicator()
         self.add_bot_message(response, confidence)
+        self.status_var.set("✓ Ready - UNKLAB Chatbot siap membantu!")
         
         # Speak response
         if self.voice_enabled:
@@ -343,43 +381,33 @@ Tanyakan apa saja atau klik 🎤 untuk voice input!
                 daemon=True
             ).start()
     
+    def show_typing_indicator(self):
+        if self.typing_visible:
+            return
+        
+        self.chat_display.config(state=tk.NORMAL)
+        self.chat_display.mark_set('typing_start', 'end-1c')
+        self.chat_display.mark_gravity('typing_start', tk.LEFT)
+        self.chat_display.insert(tk.END, "\n UNKLAB Bot sedang mengetik...\n", 'typing')
+        self.chat_display.config(state=tk.DISABLED)
+        self.chat_display.see(tk.END)
+        
+        self.typing_visible = True
+        self.status_var.set("💬 UNKLAB Bot sedang mengetik...")
+    
+    def hide_typing_indicator(self):
+        if not self.typing_visible:
+            return
+        
+        self.chat_display.config(state=tk.NORMAL)
+        self.chat_display.delete('typing_start', 'end-1c')
+        self.chat_display.config(state=tk.DISABLED)
+        
+        self.typing_visible = False
+    
     def get_bot_response(self, user_text):
         try:
-            # Detect language
-            detected_lang = self.preprocessor.detect_language(user_text)
-            
-            # Preprocess
-            processed_text = self.preprocessor.preprocess(
-                user_text,
-                remove_stopwords=True,
-                apply_stemming=(detected_lang == 'id'),
-                language=detected_lang
-            )
-            
-            # Vectorize
-            X = self.vectorizer.transform([processed_text])
-            
-            # Predict
-            predictions, confidences = self.knn.predict_with_confidence(X)
-            intent = predictions[0]
-            confidence = confidences[0]
-            
-            # Get response
-            for intent_data in self.intents_data['intents']:
-                if intent_data['tag'] == intent:
-                    responses = intent_data['responses']
-                    
-                    # Pilih response sesuai bahasa
-                    import random
-                    response = random.choice(responses)
-                    
-                    return response, confidence
-            
-            # Fallback
-            if detected_lang == 'id':
-                return "Maaf, saya belum memahami pertanyaan Anda. Bisa coba dengan kata lain?", confidence
-            else:
-                return "Sorry, I don't quite understand. Could you rephrase?", confidence
+            return self.engine.answer(user_text)
             
         except Exception as e:
             print(f"Error: {e}")